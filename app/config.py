@@ -7,11 +7,21 @@ class Settings(BaseSettings):
     # --- Azure ---
     azure_speech_key: str = ""
     azure_speech_region: str = "eastus"
+    speech_max_concurrent_per_region: int = 8  # recognitions in flight per Speech resource
+    speech_slot_timeout: float = 10.0  # seconds to wait for a slot before 503
 
     azure_translator_key: str = ""
     azure_translator_endpoint: str = ""
     azure_translator_region: str = "eastus"
     use_azure_translator: bool = False
+    translator_http2: bool = False  # needs the optional 'h2' package
+    translator_max_connections: int = 20
+    translator_max_keepalive: int = 10
+    translator_keepalive_expiry: float = 30.0
+    translator_timeout: float = 10.0
+    translator_connect_timeout: float = 3.0
+    translation_cache_size: int = 2048  # 0 disables the cache
+    translation_cache_ttl: float = 3600.0
 
     # --- Logging / DB ---
     log_captions_to_db: bool = False
@@ -20,6 +30,39 @@ class Settings(BaseSettings):
     db_name: str = ""
     db_user: str = ""
     db_password: str = ""
+    db_pool_size: int = 10
+    db_pool_timeout: float = 5.0
+    db_pool_max_idle: float = 300.0
+    db_pool_ping_after: float = 30.0
+    caption_write_behind: bool = False  # answer before the INSERT commits
+    write_behind_queue_size: int = 1000
+    write_behind_batch_size: int = 100
+    write_behind_flush_interval: float = 0.2  # seconds to wait for a batch to fill
+    write_behind_max_retries: int = 3
+
+    # --- Caption pipeline executors ---
+    pipeline_decode_workers: int = 2
+    pipeline_stt_workers: int = 4
+    pipeline_db_workers: int = 4
+    pipeline_hash_workers: int = 2  # bcrypt; keeps login bursts off the request threadpool
+    pipeline_queue_size: int = 16  # extra jobs admitted per stage before 503
+    pipeline_retry_after: int = 2  # seconds, sent as Retry-After when saturated
+    max_upload_bytes: int = 100 * 1024 * 1024  # POST /api/captions bodies; 0 = no limit
+    max_request_bytes: int = 4 * 1024 * 1024  # every other request body; 0 = no limit
+    stt_pcm_spool_bytes: int = 1024 * 1024  # decoded PCM kept in memory before spilling to disk
+
+    # --- Long-form transcription (split on silence, recognize in parallel) ---
+    stt_long_form_after_s: float = 15.0  # always segmented past this; recognize_once stops ~15 s
+    stt_long_form_concurrency: int = 4  # segments recognized at once per request
+    stt_vad_energy_threshold: float = 300.0  # frame RMS (s16) counted as speech
+    stt_vad_min_silence_ms: int = 400  # pause that ends a segment
+    stt_vad_max_segment_ms: int = 14000  # forced cut, kept under the recognize_once limit
+    stt_vad_min_speech_ms: int = 200  # shorter blips are dropped
+
+    # --- Readiness monitor ---
+    health_check_interval: float = 15.0  # seconds between background check rounds
+    health_check_timeout: float = 3.0
+    health_failure_threshold: int = 2  # consecutive failures before a dependency is down
 
     # --- Sample transcripts ---
     sample_transcripts: dict = {
@@ -33,9 +76,21 @@ class Settings(BaseSettings):
     # --- JWT Settings ---
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
+    auth_token_cache_size: int = 1024  # verified tokens kept until their exp; 0 disables
+    bcrypt_rounds: int = 12  # existing hashes are upgraded on the next successful login
+    login_throttle_window: float = 60.0  # seconds
+    login_max_failures_per_user: int = 5  # failed logins per username per window
+    login_max_attempts_per_ip: int = 30  # login/register calls per client IP per window
+    # Comma-separated proxy IPs/CIDRs whose X-Forwarded-For is believed (client_ip)
+    trusted_proxies: str = ""
 
     # --- Application Insights ---
     app_insights_key: str = "8960853e-c193-4b8b-8290-0996aaf1a53d"  # <--- ADD THIS
+    telemetry_queue_size: int = 10000  # buffered log records before new ones are dropped
+    telemetry_flush_interval: float = 60.0  # seconds between aggregated metric flushes
+    telemetry_default_sample_rate: float = 1.0  # share of request logs kept per route
+    telemetry_sample_rates: dict = {"/health": 0.1, "/api/ready": 0.1, "/metrics": 0.0}
+    metrics_enabled: bool = True  # serve GET /metrics (Prometheus text format)
 
     class Config:
         env_file = ".env"
@@ -1,4 +1,7 @@
 import os
+import sqlite3
+import threading
+import uuid
 from datetime import datetime
 
 try:
@@ -7,11 +10,19 @@ except ImportError:  # pragma: no cover - handled via RUNNING_IN_CI fallback
     pyodbc = None
 
 from app.config import settings
+from app.db.memory_store import (
+    CAPTION_COLUMNS,
+    CAPTION_DETAIL_COLUMNS,
+    DuplicateClientId,
+    InMemoryCaptionStore,
+)
+from app.db.pool import ConnectionPool
 
 RUNNING_IN_CI = os.getenv("CI") == "true" or pyodbc is None
 
 
 def get_connection():
+    """Open a brand-new connection. Used as the pool factory; prefer pooled_connection()."""
     if RUNNING_IN_CI:
         return None
     if settings.azure_sql_connection_string:
@@ -19,69 +30,96 @@ def get_connection():
     raise RuntimeError("No Azure SQL connection string provided")
 
 
-_FAKE_CAPTIONS = {}
-_FAKE_USERS = {}
-_NEXT_ID = 1
+_POOL = None
+_POOL_LOCK = threading.Lock()
+# SQL flavour of the pooled connections: "mssql" (Azure SQL) or "sqlite" (local stand-in)
+_DIALECT = "mssql"
 
 
-def _fake_get_user_by_username(username):
-    return _FAKE_USERS.get(username)
+def _new_pool(factory=None, **kwargs):
+    return ConnectionPool(
+        factory or get_connection,
+        max_size=kwargs.get("max_size", settings.db_pool_size),
+        timeout=kwargs.get("timeout", settings.db_pool_timeout),
+        max_idle=kwargs.get("max_idle", settings.db_pool_max_idle),
+        ping_after=kwargs.get("ping_after", settings.db_pool_ping_after),
+    )
 
 
-def _fake_create_user(username, hashed_password):
-    _FAKE_USERS[username] = {"Username": username, "HashedPassword": hashed_password}
+def configure_pool(factory=None, dialect="mssql", **kwargs):
+    """
+    (Re)create the shared pool. ``factory`` defaults to get_connection; tests
+    pass e.g. a sqlite3 factory with dialect="sqlite" to exercise the real
+    SQL path locally.
+    """
+    global _POOL, _DIALECT
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+        _POOL = _new_pool(factory, **kwargs)
+        _DIALECT = dialect
+        return _POOL
 
 
-def _fake_insert_caption_entry(
-    transcript,
-    translated_text,
-    from_lang,
-    to_lang,
-    processing_ms,
-    session_id=None,
-    user_id=None,
-    created_at=None,
-):
-    global _NEXT_ID
-    cid = _NEXT_ID
-    _NEXT_ID += 1
-    _FAKE_CAPTIONS[cid] = {
-        "Id": cid,
-        "Transcript": transcript,
-        "TranslatedText": translated_text,
-        "FromLang": from_lang,
-        "ToLang": to_lang,
-        "ProcessingMs": processing_ms,
-        "SessionId": session_id,
-        "UserId": user_id,
-        "CreatedAt": created_at or datetime.utcnow(),
-    }
-    return cid
+def get_pool():
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = _new_pool()
+    return _POOL
+
+
+def pooled_connection():
+    return get_pool().connection()
+
+
+def pooled_transaction():
+    """Pooled connection whose statements commit together (autocommit off)."""
+    return get_pool().connection(transaction=True)
+
 
+def close_pool():
+    global _POOL, _DIALECT
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
+        _DIALECT = "mssql"
 
-def _fake_fetch_captions(user_id=None):
-    return list(_FAKE_CAPTIONS.values())
 
+def pool_stats():
+    return _POOL.stats() if _POOL is not None else None
 
-def _fake_delete_caption_entry(caption_id, user_id=None):
-    return _FAKE_CAPTIONS.pop(caption_id, None) is not None
 
+def _select(columns, tail, limit=None):
+    """SELECT with an optional row limit in the active dialect."""
+    cols = ", ".join(columns)
+    if limit is None:
+        return f"SELECT {cols} {tail}"
+    if _DIALECT == "sqlite":
+        return f"SELECT {cols} {tail} LIMIT {int(limit)}"
+    return f"SELECT TOP ({int(limit)}) {cols} {tail}"
 
-def _fake_fetch_recent_captions():
-    return list(_FAKE_CAPTIONS.values())
 
+def _insert_returning(table, columns, returning=("Id",), rows=1):
+    """Multi-row INSERT that yields ``returning`` columns of each new row."""
+    cols = ", ".join(columns)
+    marks = ", ".join("(" + ", ".join("?" for _ in columns) + ")" for _ in range(rows))
+    if _DIALECT == "sqlite":
+        return f"INSERT INTO {table} ({cols}) VALUES {marks} RETURNING {', '.join(returning)}"
+    output = ", ".join(f"INSERTED.{c}" for c in returning)
+    return f"INSERT INTO {table} ({cols}) OUTPUT {output} VALUES {marks}"
 
-def _fake_update_caption_entry(caption_id, new_text, user_id=None):
-    if caption_id in _FAKE_CAPTIONS:
-        _FAKE_CAPTIONS[caption_id]["TranslatedText"] = new_text
-        return True
-    return False
+
+# Single in-memory implementation used whenever Azure SQL is unavailable.
+memory_store = InMemoryCaptionStore()
 
 
 def _real_get_user_by_username(username):
-    with get_connection() as conn:
+    with pooled_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT Username, HashedPassword FROM Users WHERE Username = ?", username)
+        cursor.execute("SELECT Username, HashedPassword FROM Users WHERE Username = ?", (username,))
         row = cursor.fetchone()
         if not row:
             return None
@@ -89,13 +127,38 @@ def _real_get_user_by_username(username):
 
 
 def _real_create_user(username, hashed_password):
-    with get_connection() as conn:
+    with pooled_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "INSERT INTO Users (Username, HashedPassword) VALUES (?, ?)", username, hashed_password
+            "INSERT INTO Users (Username, HashedPassword) VALUES (?, ?)",
+            (username, hashed_password),
         )
 
 
+def _real_update_user_password(username, hashed_password):
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE Users SET HashedPassword = ? WHERE Username = ?",
+            (hashed_password, username),
+        )
+        return cursor.rowcount > 0
+
+
+_INSERT_COLUMNS = (
+    "Transcript",
+    "TranslatedText",
+    "FromLang",
+    "ToLang",
+    "ProcessingMs",
+    "SessionId",
+    "UserId",
+    "CreatedAt",
+    "ClientId",
+    "Segments",
+)
+
+
 def _real_insert_caption_entry(
     transcript,
     translated_text,
@@ -105,73 +168,259 @@ def _real_insert_caption_entry(
     session_id=None,
     user_id=None,
     created_at=None,
+    client_id=None,
+    segments=None,
 ):
-    with get_connection() as conn:
+    with pooled_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            """
-            INSERT INTO Captions (Transcript, TranslatedText, FromLang, ToLang,
-                ProcessingMs, SessionId, UserId, CreatedAt)
-            OUTPUT INSERTED.Id
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            transcript,
-            translated_text,
-            from_lang,
-            to_lang,
-            processing_ms,
-            session_id,
-            user_id,
-            created_at or datetime.utcnow(),
+            _insert_returning("Captions", _INSERT_COLUMNS),
+            (
+                transcript,
+                translated_text,
+                from_lang,
+                to_lang,
+                processing_ms,
+                session_id,
+                user_id,
+                created_at or datetime.utcnow(),
+                client_id,
+                segments,
+            ),
         )
         row = cursor.fetchone()
         return row[0]
 
 
-def _real_fetch_captions(user_id=None):
-    with get_connection() as conn:
+# SQL Server accepts at most 2100 parameters per statement.
+_MAX_PARAMS = 2000
+
+
+def _real_insert_caption_entries(rows):
+    """
+    Insert many captions in one transaction using multi-row VALUES statements.
+    ``rows`` are dicts of insert_caption_entry keyword arguments. Returns the
+    new ids in input order, matched back through (UserId, ClientId), with a
+    ClientId generated when a row has none, because OUTPUT order is not
+    guaranteed.
+    """
+    per_statement = _MAX_PARAMS // len(_INSERT_COLUMNS)
+    client_ids = [r.get("client_id") or uuid.uuid4().hex for r in rows]
+    values = [
+        (
+            r["transcript"],
+            r["translated_text"],
+            r["from_lang"],
+            r["to_lang"],
+            r["processing_ms"],
+            r.get("session_id"),
+            r.get("user_id"),
+            r.get("created_at") or datetime.utcnow(),
+            client_id,
+            r.get("segments"),
+        )
+        for r, client_id in zip(rows, client_ids)
+    ]
+    ids = {}
+    with pooled_transaction() as conn:
+        cursor = conn.cursor()
+        for i in range(0, len(values), per_statement):
+            chunk = values[i : i + per_statement]
+            cursor.execute(
+                _insert_returning(
+                    "Captions",
+                    _INSERT_COLUMNS,
+                    returning=("Id", "UserId", "ClientId"),
+                    rows=len(chunk),
+                ),
+                tuple(v for row in chunk for v in row),
+            )
+            # CHAR(32) pads caller-chosen ids shorter than a uuid hex.
+            ids.update(
+                ((user, client_id.rstrip()), cid) for cid, user, client_id in cursor.fetchall()
+            )
+    return [ids[(r.get("user_id"), client_id)] for r, client_id in zip(rows, client_ids)]
+
+
+_INTEGRITY_ERRORS = tuple(
+    err
+    for err in (getattr(pyodbc, "IntegrityError", None), sqlite3.IntegrityError, DuplicateClientId)
+    if err
+)
+
+
+def is_duplicate_client_id(err: Exception) -> bool:
+    """True for a unique-key violation on Captions (UserId, ClientId)."""
+    return isinstance(err, _INTEGRITY_ERRORS) and "ClientId" in str(err)
+
+
+def _owned_ids(cursor, caption_ids, user_id):
+    """Subset of ``caption_ids`` owned by ``user_id`` (chunked IN lists)."""
+    unique = list(dict.fromkeys(caption_ids))
+    # Inside the caller's transaction, keep the rows locked until they are written.
+    _lock_hint = " WITH (UPDLOCK, ROWLOCK)" if _DIALECT == "mssql" else ""
+    owned = set()
+    for i in range(0, len(unique), _MAX_PARAMS):
+        chunk = unique[i : i + _MAX_PARAMS]
+        cursor.execute(
+            f"SELECT Id FROM Captions{_lock_hint} "
+            f"WHERE UserId = ? AND Id IN ({', '.join('?' for _ in chunk)})",
+            (user_id, *chunk),
+        )
+        owned.update(row[0] for row in cursor.fetchall())
+    return owned
+
+
+def _executemany(cursor, sql, params):
+    if not params:
+        return
+    if hasattr(cursor, "fast_executemany"):
+        # pyodbc: send all parameter sets in one round trip
+        cursor.fast_executemany = True
+    cursor.executemany(sql, params)
+
+
+def _real_update_caption_entries(updates, user_id=None):
+    """
+    Apply ``(caption_id, new_text)`` pairs in one transaction. Returns one
+    bool per pair: False when the caption is missing or not owned by the user.
+    """
+    with pooled_transaction() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM Captions WHERE UserId = ? ORDER BY CreatedAt DESC", user_id)
+        owned = _owned_ids(cursor, [cid for cid, _ in updates], user_id)
+        results = [cid in owned for cid, _ in updates]
+        _executemany(
+            cursor,
+            "UPDATE Captions SET TranslatedText = ? WHERE Id = ? AND UserId = ?",
+            [(text, cid, user_id) for (cid, text), ok in zip(updates, results) if ok],
+        )
+        return results
+
+
+def _real_delete_caption_entries(caption_ids, user_id=None):
+    """
+    Delete many captions in one transaction. Returns one bool per id; a
+    repeated id only counts as deleted the first time, as with single deletes.
+    """
+    with pooled_transaction() as conn:
+        cursor = conn.cursor()
+        owned = _owned_ids(cursor, caption_ids, user_id)
+        results = []
+        for cid in caption_ids:
+            results.append(cid in owned)
+            owned.discard(cid)
+        _executemany(
+            cursor,
+            "DELETE FROM Captions WHERE Id = ? AND UserId = ?",
+            [(cid, user_id) for cid, ok in zip(caption_ids, results) if ok],
+        )
+        return results
+
+
+def _real_fetch_captions(
+    user_id=None,
+    limit=None,
+    before=None,
+    from_lang=None,
+    to_lang=None,
+    since=None,
+    until=None,
+):
+    """
+    Newest-first caption history for one user. ``before`` is a keyset cursor
+    ``(CreatedAt, Id)``: only rows strictly older than it are returned, which
+    lets IX_Captions_User_CreatedAt_Id seek instead of scanning with OFFSET.
+    """
+    clauses = ["UserId = ?"]
+    params = [user_id]
+    if from_lang is not None:
+        clauses.append("FromLang = ?")
+        params.append(from_lang)
+    if to_lang is not None:
+        clauses.append("ToLang = ?")
+        params.append(to_lang)
+    if since is not None:
+        clauses.append("CreatedAt >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("CreatedAt < ?")
+        params.append(until)
+    if before is not None:
+        clauses.append("(CreatedAt < ? OR (CreatedAt = ? AND Id < ?))")
+        params.extend([before[0], before[0], before[1]])
+
+    sql = _select(
+        CAPTION_COLUMNS,
+        f"FROM Captions WHERE {' AND '.join(clauses)} ORDER BY CreatedAt DESC, Id DESC",
+        limit,
+    )
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, tuple(params))
         rows = cursor.fetchall()
         return [dict(zip([col[0] for col in cursor.description], row)) for row in rows]
 
 
+def _real_get_caption(caption_id, user_id=None):
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            _select(CAPTION_DETAIL_COLUMNS, "FROM Captions WHERE Id = ? AND UserId = ?"),
+            (caption_id, user_id),
+        )
+        row = cursor.fetchone()
+        return dict(zip([col[0] for col in cursor.description], row)) if row else None
+
+
 def _real_delete_caption_entry(caption_id, user_id=None):
-    with get_connection() as conn:
+    with pooled_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM Captions WHERE Id = ? AND UserId = ?", caption_id, user_id)
+        cursor.execute("DELETE FROM Captions WHERE Id = ? AND UserId = ?", (caption_id, user_id))
         return cursor.rowcount > 0
 
 
 def _real_update_caption_entry(caption_id, new_text, user_id=None):
-    with get_connection() as conn:
+    with pooled_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "UPDATE Captions SET TranslatedText = ? WHERE Id = ? AND UserId = ?",
-            new_text,
-            caption_id,
-            user_id,
+            (new_text, caption_id, user_id),
         )
         return cursor.rowcount > 0
 
 
 def _real_fetch_recent_captions():
-    with get_connection() as conn:
+    with pooled_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM Captions ORDER BY CreatedAt DESC OFFSET 0 ROWS FETCH NEXT 10 ROWS ONLY"
-        )
+        cursor.execute(_select(("*",), "FROM Captions ORDER BY CreatedAt DESC, Id DESC", 10))
         rows = cursor.fetchall()
         return [dict(zip([col[0] for col in cursor.description], row)) for row in rows]
 
 
 # Export
-get_user_by_username = _fake_get_user_by_username if RUNNING_IN_CI else _real_get_user_by_username
-create_user = _fake_create_user if RUNNING_IN_CI else _real_create_user
-insert_caption_entry = _fake_insert_caption_entry if RUNNING_IN_CI else _real_insert_caption_entry
-fetch_captions = _fake_fetch_captions if RUNNING_IN_CI else _real_fetch_captions
-delete_caption_entry = _fake_delete_caption_entry if RUNNING_IN_CI else _real_delete_caption_entry
-fetch_recent_captions = (
-    _fake_fetch_recent_captions if RUNNING_IN_CI else _real_fetch_recent_captions
-)
-update_caption_entry = _fake_update_caption_entry if RUNNING_IN_CI else _real_update_caption_entry
+if RUNNING_IN_CI:
+    get_user_by_username = memory_store.get_user_by_username
+    create_user = memory_store.create_user
+    update_user_password = memory_store.update_user_password
+    insert_caption_entry = memory_store.insert_caption_entry
+    insert_caption_entries = memory_store.insert_caption_entries
+    update_caption_entries = memory_store.update_caption_entries
+    delete_caption_entries = memory_store.delete_caption_entries
+    fetch_captions = memory_store.fetch_captions
+    get_caption = memory_store.get_caption
+    delete_caption_entry = memory_store.delete_caption_entry
+    fetch_recent_captions = memory_store.fetch_recent_captions
+    update_caption_entry = memory_store.update_caption_entry
+else:
+    get_user_by_username = _real_get_user_by_username
+    create_user = _real_create_user
+    update_user_password = _real_update_user_password
+    insert_caption_entry = _real_insert_caption_entry
+    insert_caption_entries = _real_insert_caption_entries
+    update_caption_entries = _real_update_caption_entries
+    delete_caption_entries = _real_delete_caption_entries
+    fetch_captions = _real_fetch_captions
+    get_caption = _real_get_caption
+    delete_caption_entry = _real_delete_caption_entry
+    fetch_recent_captions = _real_fetch_recent_captions
+    update_caption_entry = _real_update_caption_entry
@@ -1,82 +1,21 @@
 """
-Stateful DB Stub used ONLY for CI.
-Simulates the Azure SQL DB fully in memory so tests behave consistently.
-"""
-
-# In-memory fake DB
-_FAKE_CAPTIONS = {}
-_FAKE_USERS = {
-    "testuser": {
-        "username": "testuser",
-        "hashed_password": "$2b$12$FakeHashedPasswordForTestsOnly",
-    }
-}
-
-# Auto-increment counter for captions
-_NEXT_ID = 1
-
-
-# ---------------------------
-# USER FUNCTIONS (auth.py)
-# ---------------------------
-def get_user_by_username(username: str):
-    return _FAKE_USERS.get(username)
-
-
-def create_user(username: str, hashed_password: str):
-    _FAKE_USERS[username] = {
-        "username": username,
-        "hashed_password": hashed_password,
-    }
-    return True
+Backwards-compatible alias for the in-memory repository.
 
+Everything here is bound to the same store instance app.db.db uses when
+Azure SQL is unavailable, so the two modules can no longer drift apart.
+"""
 
-# ---------------------------
-# CAPTION FUNCTIONS
-# ---------------------------
-def insert_caption_entry(
-    transcript,
-    translated_text,
-    from_lang,
-    to_lang,
-    processing_ms,
-    session_id=None,
-    user_id=None,
-    created_at=None,  # <-- needed for tests
-):
-    global _NEXT_ID
-    cid = _NEXT_ID
-    _NEXT_ID += 1
-
-    _FAKE_CAPTIONS[cid] = {
-        "Id": cid,
-        "Transcript": transcript,
-        "TranslatedText": translated_text,
-        "FromLang": from_lang,
-        "ToLang": to_lang,
-        "ProcessingMs": processing_ms,
-        "SessionId": session_id,
-        "UserId": user_id,
-        "CreatedAt": created_at,
-    }
-    return cid
-
-
-def fetch_captions():
-    return list(_FAKE_CAPTIONS.values())
-
-
-def fetch_recent_captions():
-    return fetch_captions()
-
+from app.db.db import memory_store
 
-def delete_caption_entry(caption_id, user_id=None):  # <-- FIX ADDED HERE
-    """Return True if deleted, False if not found."""
-    return _FAKE_CAPTIONS.pop(caption_id, None) is not None
+get_user_by_username = memory_store.get_user_by_username
+create_user = memory_store.create_user
+insert_caption_entry = memory_store.insert_caption_entry
+fetch_captions = memory_store.fetch_captions
+fetch_recent_captions = memory_store.fetch_recent_captions
+update_caption_entry = memory_store.update_caption_entry
+delete_caption_entry = memory_store.delete_caption_entry
 
 
-# ---------------------------
-# CONNECTION (never used)
-# ---------------------------
 def get_connection():
+    # Never used: the in-memory store needs no connection.
     return None
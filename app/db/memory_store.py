@@ -0,0 +1,211 @@
+"""
+In-memory caption/user repository used when Azure SQL is unavailable
+(CI, local dev, demos).
+
+It mirrors the SQL backend in app/db/db.py function-for-function: same row
+keys, same ownership rules, same newest-first (CreatedAt, Id) ordering and
+keyset semantics. Per-user time-ordered indexes keep history reads at
+O(log n + page) and ownership checks at O(1).
+"""
+
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from uuid import uuid4
+
+CAPTION_COLUMNS = (
+    "Id",
+    "Transcript",
+    "TranslatedText",
+    "FromLang",
+    "ToLang",
+    "ProcessingMs",
+    "SessionId",
+    "ClientId",
+    "CreatedAt",
+)
+# Single-caption reads (subtitles) also return the compact segment timing.
+CAPTION_DETAIL_COLUMNS = (*CAPTION_COLUMNS, "Segments")
+
+
+class DuplicateClientId(ValueError):
+    """Same outcome as the unique index on Captions (UserId, ClientId)."""
+
+    def __init__(self, client_id):
+        super().__init__(f"Duplicate ClientId {client_id!r}")
+        self.client_id = client_id
+
+
+class InMemoryCaptionStore:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._users = {}
+            self._captions = {}  # Id -> row
+            self._by_user = {}  # UserId -> sorted [(CreatedAt, Id)]
+            self._by_time = []  # sorted [(CreatedAt, Id)] across all users
+            self._by_client_id = {}  # (UserId, ClientId) -> Id
+            self._next_id = 1
+
+    # ---------------------------
+    # USERS
+    # ---------------------------
+    def get_user_by_username(self, username):
+        with self._lock:
+            user = self._users.get(username)
+            return dict(user) if user else None
+
+    def create_user(self, username, hashed_password):
+        with self._lock:
+            if username in self._users:
+                # Same outcome as the UNIQUE constraint on Users.Username
+                raise ValueError(f"User {username!r} already exists")
+            self._users[username] = {"Username": username, "HashedPassword": hashed_password}
+
+    def update_user_password(self, username, hashed_password):
+        with self._lock:
+            user = self._users.get(username)
+            if user is None:
+                return False
+            user["HashedPassword"] = hashed_password
+            return True
+
+    # ---------------------------
+    # CAPTIONS
+    # ---------------------------
+    def insert_caption_entry(
+        self,
+        transcript,
+        translated_text,
+        from_lang,
+        to_lang,
+        processing_ms,
+        session_id=None,
+        user_id=None,
+        created_at=None,
+        client_id=None,
+        segments=None,
+    ):
+        with self._lock:
+            self._check_client_ids([(user_id, client_id)])
+            cid = self._next_id
+            self._next_id += 1
+            row = {
+                "Id": cid,
+                "Transcript": transcript,
+                "TranslatedText": translated_text,
+                "FromLang": from_lang,
+                "ToLang": to_lang,
+                "ProcessingMs": processing_ms,
+                "SessionId": session_id,
+                "UserId": user_id,
+                "ClientId": client_id,
+                "CreatedAt": created_at or datetime.utcnow(),
+                "Segments": segments,
+            }
+            self._captions[cid] = row
+            if client_id is not None:
+                self._by_client_id[(user_id, client_id)] = cid
+            key = (row["CreatedAt"], cid)
+            insort(self._by_user.setdefault(user_id, []), key)
+            insort(self._by_time, key)
+            return cid
+
+    def insert_caption_entries(self, rows):
+        """Insert many rows (insert_caption_entry kwargs) atomically; returns their ids."""
+        rows = [{**row, "client_id": row.get("client_id") or uuid4().hex} for row in rows]
+        with self._lock:
+            # Checked up front so a duplicate leaves nothing behind.
+            self._check_client_ids([(row.get("user_id"), row["client_id"]) for row in rows])
+            return [self.insert_caption_entry(**row) for row in rows]
+
+    def _check_client_ids(self, keys):
+        """Raise DuplicateClientId for a (UserId, ClientId) already stored or repeated."""
+        seen = set()
+        for key in keys:
+            if key[1] is None:
+                continue
+            if key in self._by_client_id or key in seen:
+                raise DuplicateClientId(key[1])
+            seen.add(key)
+
+    def fetch_captions(
+        self,
+        user_id=None,
+        limit=None,
+        before=None,
+        from_lang=None,
+        to_lang=None,
+        since=None,
+        until=None,
+    ):
+        with self._lock:
+            index = self._by_user.get(user_id, [])
+            # Walk the user's index newest-first between the time bounds.
+            hi = len(index)
+            if before is not None:
+                hi = bisect_left(index, tuple(before))
+            if until is not None:
+                hi = min(hi, bisect_left(index, (until,)))
+            lo = bisect_left(index, (since,)) if since is not None else 0
+
+            out = []
+            for pos in range(hi - 1, lo - 1, -1):
+                if limit is not None and len(out) >= limit:
+                    break
+                row = self._captions[index[pos][1]]
+                if from_lang is not None and row["FromLang"] != from_lang:
+                    continue
+                if to_lang is not None and row["ToLang"] != to_lang:
+                    continue
+                out.append({col: row[col] for col in CAPTION_COLUMNS})
+            return out
+
+    def get_caption(self, caption_id, user_id=None):
+        with self._lock:
+            row = self._owned(caption_id, user_id)
+            return {col: row[col] for col in CAPTION_DETAIL_COLUMNS} if row else None
+
+    def fetch_recent_captions(self, limit=10):
+        with self._lock:
+            return [dict(self._captions[cid]) for _, cid in reversed(self._by_time[-limit:])]
+
+    def _owned(self, caption_id, user_id):
+        row = self._captions.get(caption_id)
+        # SQL compares UserId = ?, which never matches a NULL owner either.
+        if row is None or user_id is None or row["UserId"] != user_id:
+            return None
+        return row
+
+    def update_caption_entry(self, caption_id, new_text, user_id=None):
+        with self._lock:
+            row = self._owned(caption_id, user_id)
+            if row is None:
+                return False
+            row["TranslatedText"] = new_text
+            return True
+
+    def update_caption_entries(self, updates, user_id=None):
+        """Apply ``(caption_id, new_text)`` pairs atomically; one bool per pair."""
+        with self._lock:
+            return [self.update_caption_entry(cid, text, user_id) for cid, text in updates]
+
+    def delete_caption_entries(self, caption_ids, user_id=None):
+        """Delete many captions atomically; one bool per id."""
+        with self._lock:
+            return [self.delete_caption_entry(cid, user_id) for cid in caption_ids]
+
+    def delete_caption_entry(self, caption_id, user_id=None):
+        with self._lock:
+            row = self._owned(caption_id, user_id)
+            if row is None:
+                return False
+            del self._captions[caption_id]
+            self._by_client_id.pop((user_id, row["ClientId"]), None)
+            key = (row["CreatedAt"], caption_id)
+            for index in (self._by_user[user_id], self._by_time):
+                del index[bisect_left(index, key)]
+            return True
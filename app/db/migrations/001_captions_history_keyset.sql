@@ -0,0 +1,25 @@
+----- Caption history: keyset pagination -----
+-- GET /api/captions pages with
+--   WHERE UserId = ? [AND FromLang/ToLang/CreatedAt filters]
+--     AND (CreatedAt < @c OR (CreatedAt = @c AND Id < @id))
+--   ORDER BY CreatedAt DESC, Id DESC
+-- This index serves that as a single range seek per page. FromLang/ToLang are
+-- included so the language-pair filter is evaluated without key lookups.
+IF NOT EXISTS (
+    SELECT * FROM sys.indexes
+    WHERE name = 'IX_Captions_User_CreatedAt_Id' AND object_id = OBJECT_ID('dbo.Captions')
+)
+BEGIN
+    CREATE INDEX IX_Captions_User_CreatedAt_Id
+        ON dbo.Captions (UserId, CreatedAt DESC, Id DESC)
+        INCLUDE (FromLang, ToLang);
+END
+
+-- The single-column UserId index is a prefix of the one above.
+IF EXISTS (
+    SELECT * FROM sys.indexes
+    WHERE name = 'IX_Captions_UserId' AND object_id = OBJECT_ID('dbo.Captions')
+)
+BEGIN
+    DROP INDEX IX_Captions_UserId ON dbo.Captions;
+END
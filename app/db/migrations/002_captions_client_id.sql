@@ -0,0 +1,20 @@
+----- Caption write-behind: client-generated ids -----
+-- With CAPTION_WRITE_BEHIND enabled the API answers before the row exists, so
+-- it hands out a ClientId (uuid4 hex) instead of the IDENTITY Id. The unique
+-- filtered index lets clients look a row up by it and rejects a batch that
+-- is replayed after an ambiguous commit instead of duplicating it.
+IF COL_LENGTH('dbo.Captions', 'ClientId') IS NULL
+BEGIN
+    ALTER TABLE dbo.Captions ADD ClientId CHAR(32) NULL;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT * FROM sys.indexes
+    WHERE name = 'UX_Captions_ClientId' AND object_id = OBJECT_ID('dbo.Captions')
+)
+BEGIN
+    CREATE UNIQUE INDEX UX_Captions_ClientId
+        ON dbo.Captions (ClientId)
+        WHERE ClientId IS NOT NULL;
+END
@@ -0,0 +1,11 @@
+----- Caption segment timing for subtitle export -----
+-- Long recordings are transcribed as timed segments. Segments keeps their
+-- timing as a flat JSON list of integers, four per segment:
+--   [gap_ms, duration_ms, transcript_chars, translation_chars, ...]
+-- The texts themselves are not duplicated; they are cut back out of
+-- Transcript/TranslatedText (see app/services/subtitles.py). Digits only,
+-- so VARCHAR rather than NVARCHAR.
+IF COL_LENGTH('dbo.Captions', 'Segments') IS NULL
+BEGIN
+    ALTER TABLE dbo.Captions ADD Segments VARCHAR(MAX) NULL;
+END
@@ -0,0 +1,23 @@
+----- Caption client ids: unique per user -----
+-- Bulk create lets callers pick their own ClientId. A table-wide unique index
+-- made one user's ids collide with another's (and let a caller probe for
+-- them), so uniqueness is scoped to the owner. Write-behind ids are uuid4
+-- hex and unaffected.
+IF NOT EXISTS (
+    SELECT * FROM sys.indexes
+    WHERE name = 'UX_Captions_User_ClientId' AND object_id = OBJECT_ID('dbo.Captions')
+)
+BEGIN
+    CREATE UNIQUE INDEX UX_Captions_User_ClientId
+        ON dbo.Captions (UserId, ClientId)
+        WHERE ClientId IS NOT NULL;
+END
+GO
+
+IF EXISTS (
+    SELECT * FROM sys.indexes
+    WHERE name = 'UX_Captions_ClientId' AND object_id = OBJECT_ID('dbo.Captions')
+)
+BEGIN
+    DROP INDEX UX_Captions_ClientId ON dbo.Captions;
+END
@@ -0,0 +1,227 @@
+"""
+Bounded connection pool for the Azure SQL backend.
+
+Connections are created lazily through a factory (``pyodbc.connect`` in
+production, ``sqlite3.connect`` in tests) and evicted once they have sat
+idle for longer than ``max_idle``. A checkout only health-checks a
+connection that idled for more than ``ping_after`` seconds, so busy
+connections do not pay a ``SELECT 1`` round trip per query.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("polyglot.db.pool")
+
+
+class PoolTimeout(RuntimeError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class PoolClosed(RuntimeError):
+    """Raised when checking out from a pool that has been closed."""
+
+
+def _ping(conn) -> bool:
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        return True
+    except Exception:
+        return False
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        logger.debug("Ignoring error while closing pooled connection", exc_info=True)
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        factory,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        max_idle: float = 300.0,
+        health_check=_ping,
+        ping_after: float = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._factory = factory
+        self._max_size = max_size
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._health_check = health_check
+        self._ping_after = ping_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, released_at) pairs, most recently used on the right
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._recycled = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Checkout / release
+    # ------------------------------------------------------------------
+    def acquire(self, timeout: float | None = None):
+        timeout = self._timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        expired = []
+        idle_for = 0.0
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosed("Connection pool is closed")
+
+                    conn, idle_for = self._pop_idle(expired)
+                    if conn is not None:
+                        self._in_use += 1
+                        break
+
+                    if self._in_use < self._max_size:
+                        # Reserve the slot before connecting so we never overshoot max_size.
+                        self._in_use += 1
+                        conn = None
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"Timed out after {timeout:.2f}s waiting for a database connection"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+        finally:
+            for stale in expired:
+                _close_quietly(stale)
+
+        if conn is not None:
+            if idle_for <= self._ping_after or self._health_check(conn):
+                return conn
+            # Stale connection: drop it and open a fresh one in the same slot.
+            _close_quietly(conn)
+            with self._cond:
+                self._recycled += 1
+
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def release(self, conn, discard: bool = False):
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._recycled += 1
+                keep = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                keep = True
+            self._cond.notify()
+        if not keep:
+            _close_quietly(conn)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None, transaction: bool = False):
+        """
+        Check out a connection for the duration of a ``with`` block.
+        Commits on success, rolls back on error; a connection that cannot
+        even roll back is considered broken and is not returned to the pool.
+
+        Production connections run in autocommit mode, where commit() and
+        rollback() have nothing to act on. ``transaction=True`` switches
+        autocommit off for the block, so its statements commit or roll back
+        together, and restores the setting before the connection is reused.
+        """
+        conn = self.acquire(timeout)
+        restore = None
+        if transaction and getattr(conn, "autocommit", False):
+            try:
+                conn.autocommit = False
+            except Exception:
+                self.release(conn, discard=True)
+                raise
+            restore = True
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+                broken = False
+            except Exception:
+                broken = True
+            self._release_restored(conn, restore, broken)
+            raise
+        else:
+            try:
+                conn.commit()
+            except Exception:
+                self.release(conn, discard=True)
+                raise
+            self._release_restored(conn, restore)
+
+    def _release_restored(self, conn, autocommit, broken: bool = False):
+        if autocommit is not None and not broken:
+            try:
+                conn.autocommit = autocommit
+            except Exception:
+                broken = True
+        self.release(conn, discard=broken)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def _pop_idle(self, expired: list):
+        """
+        Return the freshest idle connection and how long it idled, or
+        (None, 0.0). Connections that idled past ``max_idle`` are moved to
+        ``expired`` so the caller can close them outside the lock.
+        """
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self._max_idle:
+            expired.append(self._idle.popleft()[0])
+            self._recycled += 1
+        if self._idle:
+            conn, released_at = self._idle.pop()
+            return conn, now - released_at
+        return None, 0.0
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "max_size": self._max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "created": self._created,
+                "recycled": self._recycled,
+            }
@@ -10,12 +10,19 @@ BEGIN
         ProcessingMs INT NOT NULL,
         SessionId NVARCHAR(50) NULL,
         UserId NVARCHAR(255) NOT NULL,   
-        CreatedAt DATETIME2 NOT NULL DEFAULT GETUTCDATE()
+        CreatedAt DATETIME2 NOT NULL DEFAULT GETUTCDATE(),
+        ClientId CHAR(32) NULL,
+        Segments VARCHAR(MAX) NULL  -- subtitle timing (see migrations/003_captions_segments.sql)
     );
 
     CREATE INDEX IX_Captions_CreatedAt ON dbo.Captions (CreatedAt DESC);
     CREATE INDEX IX_Captions_SessionId ON dbo.Captions (SessionId);
-    CREATE INDEX IX_Captions_UserId ON dbo.Captions (UserId); 
+    -- History paging (see migrations/001_captions_history_keyset.sql)
+    CREATE INDEX IX_Captions_User_CreatedAt_Id ON dbo.Captions (UserId, CreatedAt DESC, Id DESC)
+        INCLUDE (FromLang, ToLang);
+    -- Client-chosen ids, unique per user (see migrations/002 and 004)
+    CREATE UNIQUE INDEX UX_Captions_User_ClientId ON dbo.Captions (UserId, ClientId)
+        WHERE ClientId IS NOT NULL;
 END
 
 
@@ -0,0 +1,216 @@
+# app/db/write_behind.py
+
+"""
+Optional write-behind persistence for captions (CAPTION_WRITE_BEHIND=true).
+
+Endpoints hand the row to submit() and answer immediately with a
+client-generated id (uuid4 hex, stored in Captions.ClientId). A single
+background thread drains the bounded queue and writes rows in multi-row
+batches through insert_caption_entries (one transaction per batch),
+retrying failed batches with backoff. A batch that still fails is split in
+half until the rows that cannot be written are isolated, so one bad row
+does not take its neighbours down with it. A row whose ClientId is already
+stored (a batch replayed after an ambiguous commit) counts as written. A
+full queue raises StageSaturated (503 + Retry-After) rather than blocking
+the request. close() drains everything still queued on shutdown.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from app.config import settings
+from app.db import db
+from app.utils.executors import StageSaturated
+from app.utils.metrics import metric_write_behind_batch
+
+logger = logging.getLogger("polyglot.db.write_behind")
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        writer=None,
+        max_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.2,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        retry_after: int = 1,
+    ):
+        # Resolved lazily so tests can swap db.insert_caption_entries.
+        self._writer = writer or (lambda rows: db.insert_caption_entries(rows))
+        self._queue: queue.Queue = queue.Queue(max_size)
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._written = 0
+        self._batches = 0
+        self._retries = 0
+        self._failed = 0
+        self._rejected = 0
+        self._last_lag_ms = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="polyglot-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: dict) -> str:
+        """Queue one caption (insert_caption_entry kwargs); returns its ClientId."""
+        if self._closed:
+            raise RuntimeError("Write-behind queue is closed")
+        client_id = row.get("client_id") or uuid.uuid4().hex
+        item = (time.monotonic(), {**row, "client_id": client_id})
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise StageSaturated("write_behind", self.retry_after) from None
+        with self._lock:
+            self._enqueued += 1
+        return client_id
+
+    def _next_batch(self):
+        """Block for the first row, then gather more until full or flush_interval passes."""
+        first = self._queue.get()
+        if first is _STOP:
+            return None, True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, batch):
+        rows = [row for _, row in batch]
+        written = self._write_rows(rows, self.max_retries)
+        if not written:
+            return
+
+        lag_ms = int((time.monotonic() - batch[0][0]) * 1000)
+        with self._lock:
+            self._written += written
+            self._batches += 1
+            self._last_lag_ms = lag_ms
+        metric_write_behind_batch(written, self._queue.qsize(), lag_ms)
+
+    def _write_rows(self, rows, retries: int) -> int:
+        """Write ``rows``, bisecting on persistent failure; returns how many are stored."""
+        for attempt in range(retries + 1):
+            try:
+                self._writer(rows)
+                return len(rows)
+            except Exception as err:
+                error = err
+                duplicate = db.is_duplicate_client_id(err)
+                if duplicate and len(rows) == 1:
+                    return 1  # already stored by an earlier attempt
+                if duplicate or attempt == retries:
+                    break  # retrying the same rows cannot succeed
+                with self._lock:
+                    self._retries += 1
+                time.sleep(self.retry_backoff * (2**attempt))
+
+        if len(rows) > 1:
+            mid = len(rows) // 2
+            return self._write_rows(rows[:mid], 0) + self._write_rows(rows[mid:], 0)
+        logger.error(
+            "Dropping caption %s after %d retries",
+            rows[0].get("client_id"),
+            retries,
+            exc_info=error,
+        )
+        with self._lock:
+            self._failed += 1
+        return 0
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                for _ in range(len(batch or ()) + (1 if stopping else 0)):
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every row queued so far has been written (or dropped)."""
+        self._queue.join()
+
+    def close(self, timeout: float = 30.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "capacity": self.max_size,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "batches": self._batches,
+                "retries": self._retries,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "last_lag_ms": self._last_lag_ms,
+            }
+
+
+_QUEUE = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def write_behind_enabled() -> bool:
+    return settings.caption_write_behind
+
+
+def get_write_behind() -> WriteBehindQueue:
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = WriteBehindQueue(
+                    max_size=settings.write_behind_queue_size,
+                    batch_size=settings.write_behind_batch_size,
+                    flush_interval=settings.write_behind_flush_interval,
+                    max_retries=settings.write_behind_max_retries,
+                    retry_after=settings.pipeline_retry_after,
+                )
+    return _QUEUE
+
+
+def write_behind_stats():
+    return _QUEUE.stats() if _QUEUE is not None else None
+
+
+def close_write_behind():
+    """Flush and stop the worker; called from the app lifespan before the pool closes."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        pending, _QUEUE = _QUEUE, None
+    if pending is not None:
+        pending.close()
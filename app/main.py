@@ -1,23 +1,60 @@
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.config import settings
+from app.db.db import close_pool
+from app.db.write_behind import close_write_behind
 from app.routers.auth import router as auth_router
 from app.routers.caption import router as caption_router
 from app.routers.health import router as health_router
+from app.routers.live import router as live_router
 from app.routers.logs import router as logs_router
 from app.routers.manual import router as manual_router
-from app.utils.telemetry import setup_telemetry
+from app.routers.metrics import router as metrics_router
+from app.services.health import health_monitor
+from app.services.http_client import close_http_clients
+from app.services.stt_azure import warm_speech_backend
+from app.utils.executors import StageSaturated, shutdown_executors
+from app.utils.metrics import metric_request
+from app.utils.request_logging import RequestLoggingMiddleware
+from app.utils.telemetry import setup_telemetry, shutdown_telemetry
+from app.utils.upload_limit import UploadLimitMiddleware
+
 
 # ============================================================================
 #  FASTAPI APP INITIALIZATION
 # ============================================================================
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    health_monitor.start()
+    warm_speech_backend()
+    yield
+    await health_monitor.stop()
+    # Shutdown: release pooled resources so workers exit cleanly
+    await close_http_clients()
+    close_write_behind()  # drain queued captions while the pool is still open
+    close_pool()
+    shutdown_executors()
+    shutdown_telemetry()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+# Backpressure: a saturated pipeline stage fails fast instead of queueing forever
+@app.exception_handler(StageSaturated)
+async def stage_saturated_handler(request: Request, exc: StageSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy ({exc.stage}), please retry"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 # ============================================================================
 #  TELEMETRY (Application Insights)
@@ -29,25 +66,17 @@ if logger:
     logger.info("✅ PolyglotCaptions API started successfully — telemetry active.")
 
 
-# Middleware to log every incoming request (helps Application Insights visualize traffic)
-class LogAllRequestsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        if logger:
-            logger.info(
-                "Request received",
-                extra={
-                    "custom_dimensions": {
-                        "path": request.url.path,
-                        "method": request.method,
-                        "status_code": response.status_code,
-                    }
-                },
-            )
-        return response
-
+# Oversized bodies are cut off while streaming (413), before they fill memory or the
+# disk spool; only the audio upload route gets the large cap.
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_bytes=settings.max_request_bytes,
+    uploads={"/api/captions": settings.max_upload_bytes},
+)
 
-app.add_middleware(LogAllRequestsMiddleware)
+# Log every incoming request (helps Application Insights visualize traffic).
+# Raw ASGI, so streaming responses, WebSockets and StaticFiles pass through untouched.
+app.add_middleware(RequestLoggingMiddleware, logger=logger, on_complete=metric_request)
 
 # ============================================================================
 #  CORS (REQUIRED FOR FRONTEND)
@@ -100,6 +129,8 @@ app.include_router(manual_router)
 app.include_router(logs_router)
 app.include_router(auth_router)
 app.include_router(health_router)
+app.include_router(live_router)
+app.include_router(metrics_router)
 
 
 # ============================================================================
@@ -7,4 +7,5 @@ Routers are imported directly from:
    routers.health
    routers.caption
    routers.logs
+   routers.live
 """
@@ -1,15 +1,29 @@
 # app/routers/auth.py
 
+import logging
 from datetime import timedelta
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
 import app.services.passwords as pw
-from app.db.db import create_user, get_user_by_username
+from app.config import settings
+from app.db.db import create_user, get_user_by_username, update_user_password
 from app.utils.auth import create_access_token
+from app.utils.client_ip import client_ip
+from app.utils.executors import run_stage
+from app.utils.throttle import SlidingWindowLimiter, Throttled
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
+logger = logging.getLogger("polyglot")
+
+# Checked before any bcrypt work so floods are turned away cheaply.
+ip_attempts = SlidingWindowLimiter(
+    settings.login_max_attempts_per_ip, settings.login_throttle_window
+)
+user_failures = SlidingWindowLimiter(
+    settings.login_max_failures_per_user, settings.login_throttle_window
+)
 
 
 class RegisterRequest(BaseModel):
@@ -22,19 +36,53 @@ class LoginRequest(BaseModel):
     password: str
 
 
+def _throttle(*checks):
+    """Run (limiter, key) checks; any exhausted limiter answers 429."""
+    try:
+        for limiter, key in checks:
+            limiter.check(key)
+    except Throttled as err:
+        logger.warning("Auth throttled", extra={"key": err.key})
+        raise HTTPException(
+            status_code=429,
+            detail="Too many attempts, please retry later",
+            headers={"Retry-After": str(err.retry_after)},
+        ) from err
+
+
 @router.post("/register")
-def register(req: RegisterRequest):
-    if get_user_by_username(req.username):
+async def register(req: RegisterRequest, request: Request):
+    ip_key = f"ip:{client_ip(request)}"
+    _throttle((ip_attempts, ip_key))
+    ip_attempts.hit(ip_key)
+
+    if await run_stage("db", get_user_by_username, req.username):
         raise HTTPException(status_code=400, detail="Username already exists")
-    hashed = pw.hash_password(req.password)
-    create_user(req.username, hashed)
+    hashed = await run_stage("hash", pw.hash_password, req.password)
+    await run_stage("db", create_user, req.username, hashed)
     return {"status": "registered"}
 
 
 @router.post("/login")
-def login(req: LoginRequest):
-    user = get_user_by_username(req.username)
-    if not user or not pw.verify_password(req.password, user["HashedPassword"]):
+async def login(req: LoginRequest, request: Request):
+    ip_key, user_key = f"ip:{client_ip(request)}", f"user:{req.username}"
+    _throttle((ip_attempts, ip_key), (user_failures, user_key))
+    ip_attempts.hit(ip_key)
+    # Count the attempt as a failure before bcrypt runs, so a parallel burst
+    # cannot all pass the check above; a successful login clears it again.
+    user_failures.hit(user_key)
+
+    user = await run_stage("db", get_user_by_username, req.username)
+    if not user or not await run_stage(
+        "hash", pw.verify_password, req.password, user["HashedPassword"]
+    ):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    user_failures.reset(user_key)
+
+    # Work factor changed since this hash was made: upgrade it while we have the password.
+    if pw.needs_rehash(user["HashedPassword"]):
+        hashed = await run_stage("hash", pw.hash_password, req.password)
+        await run_stage("db", update_user_password, req.username, hashed)
+
     token = create_access_token({"sub": req.username}, expires_delta=timedelta(hours=1))
     return {"access_token": token, "token_type": "bearer"}
@@ -1,39 +1,71 @@
 import logging
+import uuid
 from datetime import datetime
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 
 from app.db.db import (
+    delete_caption_entries,
     delete_caption_entry,
     fetch_captions,
+    get_caption,
+    insert_caption_entries,
     insert_caption_entry,
+    is_duplicate_client_id,
+    update_caption_entries,
     update_caption_entry,
 )
-from app.services.stt_azure import azure_transcribe
-from app.services.translator_azure import azure_translate_async
-from app.utils.auth import get_current_user_from_token
-from app.utils.metrics import metric_caption_processed, metric_processing_time
+from app.db.write_behind import get_write_behind, write_behind_enabled
+from app.services.stt_azure import azure_transcribe, decode_audio, looks_like_audio
+from app.services.stt_longform import (
+    find_speech_segments,
+    is_long_form,
+    join_segments,
+    pcm_duration_ms,
+    transcribe_long_form,
+)
+from app.services.subtitles import MEDIA_TYPES, decode_segments, encode_segments, render_subtitles
+from app.services.translator_azure import (
+    azure_translate_async,
+    azure_translate_batch,
+    normalize_lang,
+)
+from app.utils.auth import get_current_user
+from app.utils.executors import run_stage
+from app.utils.metrics import (
+    metric_caption_processed,
+    metric_processing_time,
+    metric_stage_time,
+)
+from app.utils.pagination import decode_cursor, encode_cursor, to_naive_utc
+from app.utils.tracing import span, start_trace
+from app.utils.upload_limit import (
+    GENERIC_UPLOAD_TYPES,
+    UnsupportedUpload,
+    declared_non_audio,
+    media_type,
+)
 
 router = APIRouter(prefix="/api/captions", tags=["captions"])
 logger = logging.getLogger("polyglot")
 
-
-# --- AUTH HELPERS ---
-async def get_current_user(request: Request) -> str:
-    auth = request.headers.get("Authorization")
-    if not auth or not auth.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-
-    token = auth.split(" ")[1]
-    return get_current_user_from_token(token)
+# Same cap as the batch translation endpoint's to_langs.
+MAX_TARGETS = 10
 
 
 # --- CREATE CAPTION ---
 @router.post("")
 async def create_caption(
+    response: Response,
     audio: UploadFile,
+    # Same codes as from_lang; repeat the field (or comma-separate) for several targets.
+    to_lang: Annotated[list[str], Form()],
     from_lang: str = Form(...),  # e.g. "en", "es", "fr", "de", "it"
-    to_lang: str = Form(...),  # same codes as in manual translation
+    bypass_cache: bool = Form(False),  # skip the translation cache lookup
+    timing: bool = Form(False),  # add Server-Timing and a per-stage breakdown
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -41,67 +73,430 @@ async def create_caption(
     1. Transcribes audio from `from_lang` (no auto-detect).
     2. Translates transcript into `to_lang`.
     3. Logs + stores both transcript and translation.
-    """
-    start_time = datetime.utcnow()
-    audio_bytes = await audio.read()
-
-    if not audio_bytes:
-        raise HTTPException(status_code=400, detail="Empty audio file")
 
-    # 1) Transcribe (Azure Speech to Text)
-    transcript = azure_transcribe(audio_bytes, from_lang)
+    `to_lang` may name several languages (repeated fields or "es,fr,de").
+    The audio is then transcribed once, all targets come from one Translator
+    call, and one row per target is stored, linked by a shared SessionId.
+    The response describes the first target as usual and lists every
+    target under ``translations``.
 
-    # Guard: if STT returns nothing, don't blow up the UI
-    if not transcript:
-        raise HTTPException(status_code=500, detail="Transcription failed")
-
-    # 2) Translate into selected language (Azure Translator)
-    translated = await azure_translate_async(transcript, from_lang, to_lang)
-
-    processing_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+    Every blocking step runs on its own bounded executor (see
+    app.utils.executors); a saturated stage answers 503 + Retry-After.
+    Each step is a tracing span (app.utils.tracing); with ``timing`` set the
+    spans come back as a Server-Timing header and a ``stages`` breakdown.
+    """
+    targets = _parse_targets(to_lang)
+    # One label value for fan-out requests keeps the metric series bounded.
+    to_label = targets[0] if len(targets) == 1 else "multi"
+    with start_trace("create_caption", from_lang=from_lang, to_lang=",".join(targets)) as trace:
+        result = await _caption_pipeline(trace, audio, from_lang, targets, bypass_cache, user_id)
 
-    # 3) Store result in DB
-    caption_id = insert_caption_entry(
-        transcript=transcript,
-        translated_text=translated,
-        from_lang=from_lang,
-        to_lang=to_lang,
-        processing_ms=processing_ms,
-        session_id=None,
-        user_id=user_id,
-        created_at=datetime.utcnow(),
-    )
+    # Metrics
+    for _ in targets:
+        metric_caption_processed()
+    metric_processing_time(result["processing_ms"])
+    for s in trace.spans:
+        metric_stage_time(s.name, s.duration_ms, from_lang, to_label)
 
     logger.info(
         "Caption created",
         extra={
-            "caption_id": caption_id,
+            "caption_id": result["id"],
+            "client_id": result.get("client_id"),
             "user": user_id,
             "from": from_lang,
-            "to": to_lang,
-            "transcript": transcript,
-            "translated": translated,
-            "processing_ms": processing_ms,
+            "to": ",".join(targets),
+            "session_id": result.get("session_id"),
+            "transcript": result["transcript"],
+            "translated": result["translated"],
+            "processing_ms": result["processing_ms"],
+            "stages": trace.breakdown(),
         },
     )
 
-    # Metrics
-    metric_caption_processed()
-    metric_processing_time(processing_ms)
+    if timing:
+        response.headers["Server-Timing"] = trace.server_timing()
+        result["stages"] = trace.breakdown()
+    return result
 
-    return {
-        "id": caption_id,
+
+def _upload_size(audio: UploadFile) -> int:
+    if audio.size is not None:
+        return audio.size
+    size = audio.file.seek(0, 2)
+    audio.file.seek(0)
+    return size
+
+
+def _reject_non_audio(audio: UploadFile):
+    """
+    415 for uploads that are plainly not audio. Declared non-audio types are
+    normally turned away by UploadLimitMiddleware before the file spools;
+    generic types can only be judged by their first bytes, here.
+    """
+    if declared_non_audio(audio.content_type):
+        raise UnsupportedUpload()
+    if media_type(audio.content_type) in GENERIC_UPLOAD_TYPES:
+        head = audio.file.read(16)
+        audio.file.seek(0)
+        if not looks_like_audio(head):
+            raise UnsupportedUpload()
+
+
+async def _caption_pipeline(trace, audio, from_lang, targets, bypass_cache, user_id) -> dict:
+    # The upload is already spooled (memory, then disk) and size-capped by
+    # UploadLimitMiddleware; it is only ever read in chunks from here on.
+    with span("upload_check") as check:
+        size = _upload_size(audio)
+        check.attributes["bytes"] = size
+        if not size:
+            raise HTTPException(status_code=400, detail="Empty audio file")
+        _reject_non_audio(audio)
+
+    # 1) Decode + transcribe (Azure Speech to Text)
+    with span("decode"):
+        pcm = await run_stage("decode", decode_audio, audio.file)
+    duration_ms = pcm_duration_ms(pcm) if pcm is not None else None
+
+    try:
+        with span("stt") as stt:
+            transcript, segments = await _transcribe(audio, pcm, from_lang)
+            if segments is not None:
+                stt.attributes["segments"] = len(segments)
+    finally:
+        if pcm is not None and not isinstance(pcm, bytes):
+            pcm.close()
+
+    # Guard: if STT returns nothing, don't blow up the UI
+    if not transcript:
+        raise HTTPException(status_code=500, detail="Transcription failed")
+
+    # 2) Translate into every selected language (Azure Translator)
+    with span("translate", targets=len(targets)):
+        translations = await _translate(transcript, segments, from_lang, targets, bypass_cache)
+    if segments is None and duration_ms:
+        # Single utterance: one cue spanning the recording, so subtitles still work.
+        segments = [_whole_recording(duration_ms, transcript, translations)]
+
+    processing_ms = int(trace.elapsed_ms())
+
+    # 3) Store one row per target (or hand them to the write-behind queue).
+    # Rows of a multi-target request are linked through a shared SessionId.
+    session_id = uuid.uuid4().hex if len(targets) > 1 else None
+    created_at = datetime.utcnow()
+    rows = [
+        {
+            "transcript": transcript,
+            "translated_text": translations[target],
+            "from_lang": from_lang,
+            "to_lang": target,
+            "processing_ms": processing_ms,
+            "session_id": session_id,
+            "user_id": user_id,
+            "created_at": created_at,
+            "segments": encode_segments(_target_segments(segments, target)),
+        }
+        for target in targets
+    ]
+    with span("db", write_behind=write_behind_enabled()):
+        ids, client_ids = await _store_rows(rows)
+
+    primary = targets[0]
+    result = {
+        "id": ids[0],
         "transcript": transcript,
-        "translated": translated,
+        "translated": translations[primary],
         "processing_ms": processing_ms,
     }
+    if segments is not None:
+        result["segments"] = _response_segments(segments, targets)
+    if client_ids[0] is not None:
+        # Id is assigned once the batch is written; ClientId finds the row later.
+        result.update(client_id=client_ids[0], queued=True)
+    if session_id is not None:
+        result["session_id"] = session_id
+        result["translations"] = [
+            _target_result(target, translations[target], cid, client_id)
+            for target, cid, client_id in zip(targets, ids, client_ids)
+        ]
+    return result
+
+
+async def _store_rows(rows: list[dict]):
+    """(ids, client_ids) per row: ids when written now, client ids when queued."""
+    if write_behind_enabled():
+        return [None] * len(rows), [get_write_behind().submit(row) for row in rows]
+    if len(rows) == 1:
+        return [await run_stage("db", insert_caption_entry, **rows[0])], [None]
+    # Linked rows go in together, in one transaction.
+    return await run_stage("db", insert_caption_entries, rows), [None] * len(rows)
+
+
+def _parse_targets(to_lang: list[str]) -> list[str]:
+    """Target languages from repeated and/or comma-separated to_lang fields, deduplicated."""
+    targets = list(dict.fromkeys(t.strip() for value in to_lang for t in value.split(",")))
+    targets = [t for t in targets if t]
+    if not targets:
+        raise HTTPException(status_code=400, detail="to_lang is required")
+    if len(targets) > MAX_TARGETS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_TARGETS} target languages per request"
+        )
+    return targets
+
+
+def _whole_recording(duration_ms: int, transcript: str, translations: dict[str, str]) -> dict:
+    return {
+        "index": 0,
+        "start_ms": 0,
+        "end_ms": duration_ms,
+        "text": transcript,
+        "translations": translations,
+    }
+
+
+def _target_segments(segments, target: str) -> list[dict] | None:
+    """Segments as stored for one target: timing, text and that target's translation."""
+    if segments is None:
+        return None
+    return [
+        {
+            "index": s["index"],
+            "start_ms": s["start_ms"],
+            "end_ms": s["end_ms"],
+            "text": s["text"],
+            "translated": s["translations"][target],
+        }
+        for s in segments
+    ]
+
+
+def _response_segments(segments, targets: list[str]) -> list[dict]:
+    """First target's segments; with several targets each also lists all translations."""
+    out = _target_segments(segments, targets[0])
+    if len(targets) > 1:
+        for seg, src in zip(out, segments):
+            seg["translations"] = src["translations"]
+    return out
+
+
+def _target_result(target, translated, caption_id, client_id) -> dict:
+    entry = {"to_lang": target, "id": caption_id, "translated": translated}
+    if client_id is not None:
+        entry["client_id"] = client_id
+    return entry
+
+
+async def _transcribe(audio: UploadFile, pcm, from_lang: str):
+    """(transcript, segments); segments is None unless the audio went long-form."""
+    if pcm is not None:
+        spans = await run_stage("decode", find_speech_segments, pcm)
+        if is_long_form(pcm, spans):
+            segments = await transcribe_long_form(pcm, from_lang, segments=spans)
+            return join_segments(segments), segments
+    transcript = await run_stage("stt", azure_transcribe, audio.file, from_lang, pcm=pcm)
+    return transcript, None
+
+
+async def _translate(transcript, segments, from_lang, targets, bypass_cache) -> dict[str, str]:
+    """
+    {to_lang: translation} for every target. Several targets (or segments)
+    go out as one batch, i.e. one Translator call with a `to` param per
+    target; segments get a ``translations`` dict of their own.
+    """
+    use_cache = not bypass_cache
+    if segments is None and len(targets) == 1:
+        translated = await azure_translate_async(
+            transcript, from_lang, targets[0], use_cache=use_cache
+        )
+        return {targets[0]: translated}
+
+    texts = [s["text"] for s in segments] if segments is not None else [transcript]
+    results = await azure_translate_batch(texts, from_lang, targets, use_cache=use_cache)
+    # Batch results are keyed by normalized code ("en-US" -> "en").
+    per_text = [{t: found.get(normalize_lang(t), "") for t in targets} for found in results]
+    if segments is None:
+        return per_text[0]
+    for segment, translations in zip(segments, per_text):
+        segment["translations"] = translations
+    return {
+        t: " ".join(s["translations"][t].strip() for s in segments if s["translations"][t].strip())
+        for t in targets
+    }
 
 
 # --- READ CAPTIONS ---
 @router.get("")
-def get_captions(user_id: str = Depends(get_current_user)):
-    """Fetch all captions for a user."""
-    return fetch_captions(user_id=user_id)
+def get_captions(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    from_lang: str | None = None,
+    to_lang: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Fetch a page of the user's captions, newest first.
+    When more rows exist, the cursor for the next page is returned in the
+    X-Next-Cursor header (and as a rel="next" Link).
+    """
+    before = None
+    if cursor:
+        try:
+            before = decode_cursor(cursor)
+        except ValueError as err:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from err
+
+    rows = fetch_captions(
+        user_id=user_id,
+        limit=limit + 1,  # one extra row tells us whether another page exists
+        before=before,
+        from_lang=from_lang,
+        to_lang=to_lang,
+        since=to_naive_utc(since),
+        until=to_naive_utc(until),
+    )
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["CreatedAt"], last["Id"])
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(limit=limit, cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return rows
+
+
+# --- BULK OPERATIONS ---
+# Declared before the /{caption_id} routes so "bulk" is not parsed as an id.
+MAX_BULK_ITEMS = 1000
+
+
+class BulkCaptionItem(BaseModel):
+    transcript: str
+    translated_text: str
+    from_lang: str
+    to_lang: str
+    processing_ms: int = 0
+    session_id: str | None = None
+    client_id: str | None = Field(None, max_length=32)
+
+
+class BulkCreateRequest(BaseModel):
+    items: list[BulkCaptionItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+    @field_validator("items")
+    @classmethod
+    def _unique_client_ids(cls, items):
+        client_ids = [item.client_id for item in items if item.client_id is not None]
+        if len(set(client_ids)) != len(client_ids):
+            raise ValueError("client_id values must be unique within a request")
+        return items
+
+
+class BulkUpdateItem(BaseModel):
+    id: int
+    translated_text: str = Field(..., min_length=1)
+
+
+class BulkUpdateRequest(BaseModel):
+    items: list[BulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+@router.post("/bulk")
+async def bulk_create_captions(req: BulkCreateRequest, user_id: str = Depends(get_current_user)):
+    """
+    Store many captions in one transaction; ids come back in input order.
+    A client_id the user already has fails the whole batch with 409.
+    """
+    now = datetime.utcnow()
+    rows = [{**item.model_dump(), "user_id": user_id, "created_at": now} for item in req.items]
+    try:
+        ids = await run_stage("db", insert_caption_entries, rows)
+    except Exception as err:
+        if not is_duplicate_client_id(err):
+            raise
+        raise HTTPException(status_code=409, detail="client_id already exists") from err
+
+    logger.info("Captions bulk created", extra={"count": len(ids), "user": user_id})
+    return {
+        "created": len(ids),
+        "results": [{"index": i, "id": cid, "status": "created"} for i, cid in enumerate(ids)],
+    }
+
+
+@router.put("/bulk")
+async def bulk_update_captions(req: BulkUpdateRequest, user_id: str = Depends(get_current_user)):
+    """Update many captions' translated text in one transaction."""
+    updates = [(item.id, item.translated_text) for item in req.items]
+    results = await run_stage("db", update_caption_entries, updates, user_id)
+
+    logger.info("Captions bulk updated", extra={"count": sum(results), "user": user_id})
+    return {
+        "updated": sum(results),
+        "results": [
+            {"id": item.id, "status": "updated" if ok else "not_found"}
+            for item, ok in zip(req.items, results)
+        ],
+    }
+
+
+@router.delete("/bulk")
+async def bulk_delete_captions(req: BulkDeleteRequest, user_id: str = Depends(get_current_user)):
+    """Delete many captions in one transaction; unknown or foreign ids are reported, not fatal."""
+    results = await run_stage("db", delete_caption_entries, req.ids, user_id)
+
+    logger.info("Captions bulk deleted", extra={"count": sum(results), "user": user_id})
+    return {
+        "deleted": sum(results),
+        "results": [
+            {"id": cid, "status": "deleted" if ok else "not_found"}
+            for cid, ok in zip(req.ids, results)
+        ],
+    }
+
+
+# --- SUBTITLES ---
+@router.get("/{caption_id}/subtitles")
+async def get_subtitles(
+    caption_id: int,
+    fmt: str = Query("srt", alias="format", pattern="^(srt|vtt)$"),
+    lang: str | None = None,  # the caption's from_lang or to_lang (default)
+    user_id: str = Depends(get_current_user),
+):
+    """
+    SRT or WebVTT for a stored caption, streamed cue by cue from its stored
+    segment timing; nothing is re-transcribed or re-translated.
+    """
+    row = await run_stage("db", get_caption, caption_id, user_id=user_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Caption not found or not owned by user")
+    if not row.get("Segments"):
+        raise HTTPException(status_code=404, detail="No segment timing stored for this caption")
+
+    if lang is None or lang == row["ToLang"]:
+        key = "translated"
+    elif lang == row["FromLang"]:
+        key = "text"
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Caption has {row['FromLang']} and {row['ToLang']} text, not {lang}",
+        )
+
+    segments = decode_segments(row["Segments"], row["Transcript"], row["TranslatedText"])
+    return StreamingResponse(
+        render_subtitles(segments, fmt, key),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="caption-{caption_id}.{fmt}"'},
+    )
 
 
 # --- UPDATE CAPTION ---
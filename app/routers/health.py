@@ -1,23 +1,25 @@
-import requests
+import time
+
 from fastapi import APIRouter
 
+from app.services.health import health_monitor
+
 router = APIRouter(prefix="/api", tags=["health"])
 
 
 @router.get("/ready")
-def readiness():
-    checks = {}
-
-    # Basic check: app is alive
-    checks["app"] = True
-
-    # Optional: Azure Speech API check
-    try:
-        test_url = "https://eastus.stt.speech.microsoft.com"
-        resp = requests.get(test_url, timeout=2)
-        checks["speech_api"] = resp.status_code < 500
-    except Exception:
-        checks["speech_api"] = False
-
-    ready = all(checks.values())
-    return {"ready": ready, "checks": checks}
+async def readiness():
+    """
+    Serve the health monitor's latest snapshot; no outbound calls are made
+    per probe unless the snapshot has gone stale.
+    """
+    snapshot = await health_monitor.current()
+    details = snapshot["checks"]
+    checks = {"app": True, **{name: result["ok"] for name, result in details.items()}}
+    return {
+        "ready": all(checks.values()),
+        "checks": checks,
+        "details": details,
+        "checked_at": snapshot["checked_at"],
+        "age_s": round(time.time() - snapshot["checked_at"], 3),
+    }
@@ -0,0 +1,197 @@
+# app/routers/live.py
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+
+from app.db.db import insert_caption_entry
+from app.services.stt_streaming import create_streaming_recognizer
+from app.services.translator_azure import azure_translate_async
+from app.utils.auth import get_current_user_from_token
+from app.utils.executors import StageSaturated, run_stage
+from app.utils.metrics import metric_caption_processed
+
+router = APIRouter(tags=["live"])
+logger = logging.getLogger("polyglot")
+
+
+def _is_stop(message: dict) -> bool:
+    text = message.get("text")
+    if not text:
+        return False
+    if text.strip() == "stop":
+        return True
+    try:
+        return json.loads(text).get("type") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+async def _safe_send(websocket: WebSocket, payload: dict) -> bool:
+    try:
+        await websocket.send_json(payload)
+        return True
+    except (WebSocketDisconnect, RuntimeError):
+        return False
+
+
+async def _deliver_results(websocket, events, from_lang, to_lang, user_id, session_id):
+    """
+    Translate recognizer events and push them to the client. Finals are
+    persisted even if the client already went away; stale partials are
+    dropped when a newer event is already queued.
+    """
+    segments = 0
+    while True:
+        kind, text = await events.get()
+        if kind == "end":
+            await _safe_send(websocket, {"type": "done", "segments": segments})
+            return
+
+        if kind == "partial":
+            if not events.empty() or not text:
+                continue
+            translated = await azure_translate_async(text, from_lang, to_lang)
+            await _safe_send(
+                websocket, {"type": "partial", "transcript": text, "translated": translated}
+            )
+            continue
+
+        start = time.perf_counter()
+        translated = await azure_translate_async(text, from_lang, to_lang)
+        processing_ms = int((time.perf_counter() - start) * 1000)
+        caption_id = await run_stage(
+            "db",
+            insert_caption_entry,
+            transcript=text,
+            translated_text=translated,
+            from_lang=from_lang,
+            to_lang=to_lang,
+            processing_ms=processing_ms,
+            session_id=session_id,
+            user_id=user_id,
+            created_at=datetime.utcnow(),
+        )
+        segments += 1
+        metric_caption_processed()
+        await _safe_send(
+            websocket,
+            {"type": "final", "id": caption_id, "transcript": text, "translated": translated},
+        )
+
+
+# Seconds a new connection has to send its {"type": "auth"} message.
+AUTH_TIMEOUT_S = 10
+
+
+async def _authenticate(websocket: WebSocket) -> str | None:
+    """
+    User id from the first message, {"type": "auth", "token": "<jwt>"}.
+    The token travels inside the socket rather than in the URL, so it does
+    not end up in proxy or access logs.
+    """
+    try:
+        message = await asyncio.wait_for(websocket.receive(), AUTH_TIMEOUT_S)
+        auth = json.loads(message.get("text") or "")
+        if auth.get("type") != "auth":
+            return None
+        return get_current_user_from_token(auth.get("token") or "")
+    except (asyncio.TimeoutError, ValueError, AttributeError, HTTPException):
+        return None
+
+
+async def _receive_audio(websocket: WebSocket, recognizer):
+    """Feed binary frames to the recognizer until the client stops or disconnects."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if message.get("bytes"):
+            # Same bounded stage as uploads: a saturated STT pool ends the session.
+            await run_stage("stt", recognizer.push, message["bytes"])
+        elif _is_stop(message):
+            return
+
+
+@router.websocket("/ws/captions")
+async def caption_stream(websocket: WebSocket, from_lang: str = "en", to_lang: str = "es"):
+    """
+    Live captioning. Query params: from_lang, to_lang. The first message must
+    be {"type": "auth", "token": "<jwt>"} (browsers cannot set headers on
+    WebSockets). Binary messages after that are audio chunks as
+    MediaRecorder emits them; a text "stop" (or {"type": "stop"}) ends the
+    stream. The server sends partial/final messages and a closing "done".
+
+    The socket is closed with 1013 when the STT stage or the region's speech
+    slots are saturated and with 1011 when results can no longer be
+    delivered or stored, or the recognizer fails to shut down.
+    """
+    await websocket.accept()
+    user_id = await _authenticate(websocket)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(kind, text=None):
+        # Called from Speech SDK / worker threads.
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, (kind, text))
+        except RuntimeError:
+            logger.debug("Dropping recognizer event after the stream ended")
+
+    session_id = uuid.uuid4().hex
+    recognizer = create_streaming_recognizer(from_lang, emit)
+    try:
+        await loop.run_in_executor(None, recognizer.start)
+    except StageSaturated:
+        # Every speech slot in the region is held by other sessions or uploads.
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    delivery = asyncio.create_task(
+        _deliver_results(websocket, events, from_lang, to_lang, user_id, session_id)
+    )
+    receiving = asyncio.create_task(_receive_audio(websocket, recognizer))
+
+    stopped = False
+    try:
+        # Delivery only returns after "end", so finishing first means it failed:
+        # stop taking audio whose results would be lost.
+        await asyncio.wait({receiving, delivery}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        receiving.cancel()  # no-op once it has finished
+        try:
+            await loop.run_in_executor(None, recognizer.stop)
+            stopped = True
+        except Exception:
+            logger.exception(
+                "Stopping the live recognizer failed", extra={"session_id": session_id}
+            )
+        finally:
+            emit("end")  # delivery waits for it, whatever happened to the recognizer
+
+    close_code = status.WS_1000_NORMAL_CLOSURE if stopped else status.WS_1011_INTERNAL_ERROR
+    try:
+        await delivery
+        await receiving
+    except StageSaturated:
+        close_code = status.WS_1013_TRY_AGAIN_LATER
+    except Exception:
+        logger.exception("Live caption session failed", extra={"session_id": session_id})
+        close_code = status.WS_1011_INTERNAL_ERROR
+
+    logger.info(
+        "Live caption session finished",
+        extra={"session_id": session_id, "user": user_id, "from": from_lang, "to": to_lang},
+    )
+    try:
+        await websocket.close(code=close_code)
+    except RuntimeError:
+        pass
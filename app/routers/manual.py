@@ -1,29 +1,37 @@
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Response
+from pydantic import BaseModel, Field
 
 from app.db.db import insert_caption_entry
-from app.services.translator_azure import azure_translate_async
-from app.utils.auth import get_current_user_from_token
-from app.utils.metrics import metric_caption_processed, metric_processing_time
+from app.db.write_behind import get_write_behind, write_behind_enabled
+from app.services.translator_azure import azure_translate_async, azure_translate_batch
+from app.utils.auth import get_current_user
+from app.utils.metrics import (
+    metric_caption_processed,
+    metric_processing_time,
+    metric_stage_time,
+)
+from app.utils.tracing import span, start_trace
 
 router = APIRouter(prefix="/api/manual", tags=["manual"])
 logger = logging.getLogger("polyglot")
 
 
-async def get_current_user(request: Request) -> str:
-    auth = request.headers.get("Authorization")
-    if not auth or not auth.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-    return get_current_user_from_token(auth.split(" ")[1])
-
-
 class ManualRequest(BaseModel):
     text: str
     from_lang: str
     to_lang: str
+    bypass_cache: bool = False
+    timing: bool = False  # add Server-Timing and a per-stage breakdown
+
+
+class BatchTranslateRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, max_length=1000)
+    from_lang: str
+    to_langs: list[str] = Field(..., min_length=1, max_length=10)
+    bypass_cache: bool = False
 
 
 class ManualSaveRequest(BaseModel):
@@ -34,33 +42,83 @@ class ManualSaveRequest(BaseModel):
 
 
 @router.post("/translate")
-async def manual_translate(req: ManualRequest, user_id: str = Depends(get_current_user)):
-    start_time = datetime.utcnow()
-    translated = await azure_translate_async(req.text, req.from_lang, req.to_lang)
-
-    ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+async def manual_translate(
+    req: ManualRequest, response: Response, user_id: str = Depends(get_current_user)
+):
+    with start_trace("manual_translate", from_lang=req.from_lang, to_lang=req.to_lang) as trace:
+        with span("translate"):
+            translated = await azure_translate_async(
+                req.text, req.from_lang, req.to_lang, use_cache=not req.bypass_cache
+            )
+
+    ms = int(trace.elapsed_ms())
     metric_processing_time(ms)
+    for s in trace.spans:
+        metric_stage_time(s.name, s.duration_ms, req.from_lang, req.to_lang)
 
     logger.info(
         "Manual translation",
         extra={"text": req.text, "translated": translated, "user": user_id, "processing_ms": ms},
     )
 
+    if req.timing:
+        response.headers["Server-Timing"] = trace.server_timing()
+        return {"translated_text": translated, "stages": trace.breakdown()}
     return {"translated_text": translated}
 
 
+@router.post("/translate/batch")
+async def manual_translate_batch(
+    req: BatchTranslateRequest, user_id: str = Depends(get_current_user)
+):
+    """
+    Translate many texts into one or more languages. Texts are packed into as
+    few Translator requests as the service limits allow; results keep input order.
+    """
+    start_time = datetime.utcnow()
+    results = await azure_translate_batch(
+        req.texts, req.from_lang, req.to_langs, use_cache=not req.bypass_cache
+    )
+
+    ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+    metric_processing_time(ms)
+
+    logger.info(
+        "Manual batch translation",
+        extra={
+            "count": len(req.texts),
+            "targets": req.to_langs,
+            "user": user_id,
+            "processing_ms": ms,
+        },
+    )
+
+    return {
+        "translations": [
+            {"text": text, "translations": translations}
+            for text, translations in zip(req.texts, results)
+        ]
+    }
+
+
 @router.post("/save")
 def manual_save(req: ManualSaveRequest, user_id: str = Depends(get_current_user)):
-    caption_id = insert_caption_entry(
-        transcript=req.transcript,
-        translated_text=req.translated_text,
-        from_lang=req.from_lang,
-        to_lang=req.to_lang,
-        processing_ms=0,
-        session_id=None,
-        user_id=user_id,
-        created_at=datetime.utcnow(),
-    )
+    row = {
+        "transcript": req.transcript,
+        "translated_text": req.translated_text,
+        "from_lang": req.from_lang,
+        "to_lang": req.to_lang,
+        "processing_ms": 0,
+        "session_id": None,
+        "user_id": user_id,
+        "created_at": datetime.utcnow(),
+    }
+    client_id = None
+    if write_behind_enabled():
+        caption_id = None
+        client_id = get_write_behind().submit(row)
+    else:
+        caption_id = insert_caption_entry(**row)
 
     metric_caption_processed()
 
@@ -68,6 +126,7 @@ def manual_save(req: ManualSaveRequest, user_id: str = Depends(get_current_user)
         "Manual caption saved",
         extra={
             "caption_id": caption_id,
+            "client_id": client_id,
             "transcript": req.transcript,
             "translated": req.translated_text,
             "from": req.from_lang,
@@ -76,4 +135,6 @@ def manual_save(req: ManualSaveRequest, user_id: str = Depends(get_current_user)
         },
     )
 
+    if client_id is not None:
+        return {"status": "queued", "id": None, "client_id": client_id}
     return {"status": "saved", "id": caption_id}
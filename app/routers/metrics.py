@@ -0,0 +1,125 @@
+# app/routers/metrics.py
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.db.db import pool_stats
+from app.db.write_behind import write_behind_stats
+from app.services.speech_pool import speech_backend_stats
+from app.services.translation_cache import get_translation_cache
+from app.services.translator_azure import translation_flights
+from app.utils import prometheus
+from app.utils.executors import executor_stats
+from app.utils.metrics import registry
+from app.utils.telemetry import telemetry_stats
+
+router = APIRouter(tags=["metrics"])
+
+
+def _collect_runtime():
+    """Point-in-time values owned by other components, read at scrape time."""
+    cache = get_translation_cache().stats()
+    lookups = cache["hits"] + cache["misses"]
+    yield "counter", "polyglot_translation_cache_hits_total", {}, cache["hits"], "Cache hits"
+    yield "counter", "polyglot_translation_cache_misses_total", {}, cache["misses"], "Cache misses"
+    yield "gauge", "polyglot_translation_cache_entries", {}, cache["size"], "Cached translations"
+    yield (
+        "gauge",
+        "polyglot_translation_cache_hit_ratio",
+        {},
+        round(cache["hits"] / lookups, 4) if lookups else 0,
+        "Hit ratio since start",
+    )
+
+    flights = translation_flights.stats()
+    yield (
+        "counter",
+        "polyglot_translation_coalesced_total",
+        {},
+        flights["coalesced"],
+        "Translations served by an identical in-flight call",
+    )
+
+    for stage, stats in executor_stats().items():
+        labels = {"stage": stage}
+        yield (
+            "gauge",
+            "polyglot_executor_pending",
+            labels,
+            stats["pending"],
+            "Jobs running or queued",
+        )
+        yield "gauge", "polyglot_executor_capacity", labels, stats["capacity"], "Admitted job limit"
+        yield (
+            "counter",
+            "polyglot_executor_rejected_total",
+            labels,
+            stats["rejected"],
+            "Jobs rejected with 503",
+        )
+
+    pool = pool_stats()
+    if pool:
+        for key in ("in_use", "idle", "waiting"):
+            yield "gauge", f"polyglot_db_pool_{key}", {}, pool[key], f"DB pool connections {key}"
+
+    write_behind = write_behind_stats()
+    if write_behind:
+        yield "gauge", "polyglot_write_behind_depth", {}, write_behind["depth"], "Queued rows"
+        yield (
+            "counter",
+            "polyglot_write_behind_failed_total",
+            {},
+            write_behind["failed"],
+            "Rows dropped after retries",
+        )
+
+    speech = speech_backend_stats()
+    if speech and "capacity" in speech:
+        labels = {"region": speech["region"]}
+        yield (
+            "gauge",
+            "polyglot_speech_in_flight",
+            labels,
+            speech["in_flight"],
+            "Recognitions running",
+        )
+        yield (
+            "gauge",
+            "polyglot_speech_sessions",
+            labels,
+            speech["sessions"],
+            "Live sessions holding a recognition slot",
+        )
+        yield "gauge", "polyglot_speech_capacity", labels, speech["capacity"], "Recognition slots"
+        yield (
+            "counter",
+            "polyglot_speech_rejected_total",
+            labels,
+            speech["rejected"],
+            "Recognitions rejected after waiting for a slot",
+        )
+
+    telemetry = telemetry_stats()
+    if telemetry:
+        yield (
+            "counter",
+            "polyglot_telemetry_dropped_total",
+            {},
+            telemetry["dropped"],
+            "Log records dropped when the telemetry queue was full",
+        )
+
+
+registry.register_collector(_collect_runtime)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint; everything is served from in-process state."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(
+        prometheus.render(registry.collect()), media_type=prometheus.CONTENT_TYPE
+    )
@@ -0,0 +1,168 @@
+# app/services/health.py
+
+"""
+Background dependency monitor behind /api/ready.
+
+Checks (Azure SQL via the pool, Translator, Speech) run concurrently on an
+interval and the probe serves the latest snapshot, so probes cost no
+outbound calls of their own. A dependency is only reported down after
+``failure_threshold`` consecutive failed checks, which keeps a single
+network blip from flapping readiness.
+
+A check is any ``async def check() -> bool``; raising or timing out counts
+as a failure. Tests and local setups swap them with register().
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+from app.config import settings
+from app.db import db
+from app.services.http_client import get_translator_client
+from app.services.translator_azure import _build_request
+from app.utils.executors import run_stage
+
+logger = logging.getLogger("polyglot.services.health")
+
+
+def _ping_db():
+    if db.RUNNING_IN_CI:
+        return True  # in-memory store, nothing to reach
+    with db.pooled_connection() as conn:
+        conn.cursor().execute("SELECT 1")
+    return True
+
+
+async def check_database() -> bool:
+    return await run_stage("db", _ping_db)
+
+
+async def _reachable(url: str) -> bool:
+    async with httpx.AsyncClient(timeout=settings.health_check_timeout) as client:
+        resp = await client.get(url)
+    return resp.status_code < 500
+
+
+async def check_translator() -> bool:
+    # Same condition the translator service uses to pick the real endpoint.
+    request = _build_request(None, [])
+    if request is None:
+        return True  # stub translator in use
+    url = request[0].removesuffix("/translate") + "/languages"
+    # /languages needs no key or quota, and the shared client is the one translations use.
+    resp = await get_translator_client().get(
+        url,
+        params={"api-version": "3.0", "scope": "translation"},
+        timeout=settings.health_check_timeout,
+    )
+    return resp.status_code < 500
+
+
+async def check_speech() -> bool:
+    if not settings.azure_speech_key:
+        return True  # stub transcriber in use
+    return await _reachable(f"https://{settings.azure_speech_region}.stt.speech.microsoft.com")
+
+
+DEFAULT_CHECKS = {
+    "database": check_database,
+    "translator": check_translator,
+    "speech_api": check_speech,
+}
+
+
+class HealthMonitor:
+    def __init__(
+        self,
+        checks=None,
+        interval: float = 15.0,
+        timeout: float = 3.0,
+        failure_threshold: int = 2,
+    ):
+        self._checks = dict(DEFAULT_CHECKS if checks is None else checks)
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self._failures: dict[str, int] = {}
+        self._snapshot = None
+        self._task = None
+
+    def register(self, name: str, check):
+        self._checks[name] = check
+        self._failures.pop(name, None)
+        self._snapshot = None
+
+    def unregister(self, name: str):
+        self._checks.pop(name, None)
+        self._failures.pop(name, None)
+        self._snapshot = None
+
+    async def _run_check(self, name, check):
+        start = time.perf_counter()
+        error = None
+        try:
+            passed = bool(await asyncio.wait_for(check(), self.timeout))
+        except asyncio.TimeoutError:
+            passed, error = False, "timeout"
+        except Exception as exc:
+            passed, error = False, f"{type(exc).__name__}: {exc}"
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        failures = 0 if passed else self._failures.get(name, 0) + 1
+        self._failures[name] = failures
+        result = {"ok": failures < self.failure_threshold, "latency_ms": latency_ms}
+        if failures:
+            result["consecutive_failures"] = failures
+        if error:
+            result["error"] = error
+        return name, result
+
+    async def run_once(self) -> dict:
+        results = await asyncio.gather(*(self._run_check(n, c) for n, c in self._checks.items()))
+        self._snapshot = {"checked_at": time.time(), "checks": dict(results)}
+        down = [name for name, r in results if not r["ok"]]
+        if down:
+            logger.warning("Dependencies unhealthy", extra={"down": down})
+        return self._snapshot
+
+    def _is_stale(self) -> bool:
+        return self._snapshot is None or (
+            time.time() - self._snapshot["checked_at"] > 2 * self.interval
+        )
+
+    async def current(self) -> dict:
+        """Latest snapshot; refreshed inline only if the monitor is not keeping it fresh."""
+        if self._is_stale():
+            return await self.run_once()
+        return self._snapshot
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Health check round failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+health_monitor = HealthMonitor(
+    interval=settings.health_check_interval,
+    timeout=settings.health_check_timeout,
+    failure_threshold=settings.health_failure_threshold,
+)
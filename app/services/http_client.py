@@ -0,0 +1,69 @@
+# app/services/http_client.py
+
+"""
+Long-lived async HTTP client for outbound calls to Azure Translator.
+
+One httpx.AsyncClient is kept per event loop so TCP/TLS connections are
+reused (keep-alive, optional HTTP/2) instead of being re-established for
+every translation. The client is closed from the FastAPI lifespan.
+"""
+
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger("polyglot.services.http_client")
+
+_translator_client: httpx.AsyncClient | None = None
+_translator_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_translator_client(**overrides) -> httpx.AsyncClient:
+    http2 = settings.translator_http2
+    if http2 and not _http2_available():
+        logger.warning("TRANSLATOR_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1.")
+        http2 = False
+
+    options = {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=settings.translator_max_connections,
+            max_keepalive_connections=settings.translator_max_keepalive,
+            keepalive_expiry=settings.translator_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(
+            settings.translator_timeout, connect=settings.translator_connect_timeout
+        ),
+    }
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+def get_translator_client() -> httpx.AsyncClient:
+    """
+    Return the shared client for the running event loop.
+    httpx connections are bound to the loop that opened them, so a new
+    loop (e.g. a fresh TestClient portal) gets a fresh client.
+    """
+    global _translator_client, _translator_loop
+    loop = asyncio.get_running_loop()
+    if _translator_client is None or _translator_client.is_closed or _translator_loop is not loop:
+        _translator_client = build_translator_client()
+        _translator_loop = loop
+    return _translator_client
+
+
+async def close_http_clients():
+    global _translator_client, _translator_loop
+    client, loop = _translator_client, _translator_loop
+    _translator_client = _translator_loop = None
+    if client is not None and not client.is_closed and loop is asyncio.get_running_loop():
+        await client.aclose()
@@ -1,9 +1,11 @@
 import bcrypt
 
+from app.config import settings
 
-def hash_password(raw: str) -> str:
+
+def hash_password(raw: str, rounds: int | None = None) -> str:
     raw_bytes = raw.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(raw_bytes, salt)
     return hashed.decode("utf-8")
 
@@ -12,3 +14,17 @@ def verify_password(raw: str, hashed: str) -> bool:
     raw_bytes = raw.encode("utf-8")
     hashed_bytes = hashed.encode("utf-8")
     return bcrypt.checkpw(raw_bytes, hashed_bytes)
+
+
+def hash_rounds(hashed: str) -> int | None:
+    """Work factor of a "$2b$12$..." hash, or None if it is not a bcrypt hash."""
+    parts = hashed.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True when a valid bcrypt hash uses a different work factor than configured."""
+    rounds = hash_rounds(hashed)
+    return rounds is not None and rounds != settings.bcrypt_rounds
@@ -0,0 +1,46 @@
+# app/services/singleflight.py
+
+"""
+Request coalescing for identical in-flight async calls.
+
+The first caller for a key starts the work as a task; callers that arrive
+while it is still running await the same task instead of issuing their
+own upstream call. The task is shielded, so one caller disconnecting does
+not cancel the call for everybody else.
+"""
+
+import asyncio
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, fn):
+        """Run ``await fn()`` once per key at a time and share its outcome."""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self._coalesced += 1
+        else:
+            task = loop.create_task(fn())
+            self._inflight[key] = task
+            self._leaders += 1
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter went away.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,257 @@
+# app/services/speech_pool.py
+
+"""
+Speech recognition backends for the caption pipeline.
+
+A SpeechRecognizer is bound to one audio stream, so it cannot outlive a
+request. Everything before it can: the AzureSpeechBackend builds one
+SpeechConfig per recognition locale (subscription, region, language) the
+first time it is needed, or at startup via warm(), and shares it read-only
+with every recognizer after that.
+
+Recognitions per region are capped, since Azure throttles concurrent
+requests per resource. A caller waits up to SPEECH_SLOT_TIMEOUT seconds for
+a slot and then gets StageSaturated (503 + Retry-After). Live sessions take
+the same slots: open_session() holds one for the session's lifetime, until
+close_session().
+
+The service connection belongs to a recognizer, so one-shot recognitions
+still open a connection per call; only the config is reused. A live
+session's connection is opened up front in open_session(), before any audio
+arrives, so the first partial does not wait for the handshake.
+
+Callers only see the SpeechBackend interface. Tests and offline setups
+install their own with set_speech_backend().
+"""
+
+import threading
+import time
+from typing import BinaryIO
+
+import azure.cognitiveservices.speech as speechsdk
+
+from app.config import settings
+from app.utils.executors import StageSaturated
+from app.utils.metrics import metric_speech_config, metric_speech_setup, metric_speech_wait
+
+LANG_MAP = {
+    "en": "en-US",
+    "es": "es-ES",
+    "fr": "fr-FR",
+    "de": "de-DE",
+    "it": "it-IT",
+}
+
+# Raw PCM the Speech SDK audio streams are configured for.
+PCM_SAMPLE_RATE = 16000
+PCM_BITS_PER_SAMPLE = 16
+PCM_CHANNELS = 1
+
+
+class _PcmReader(speechsdk.audio.PullAudioInputStreamCallback):
+    """Lets the SDK pull PCM from a file as it recognizes, instead of buffering all of it."""
+
+    def __init__(self, pcm: BinaryIO):
+        super().__init__()
+        self._pcm = pcm
+
+    def read(self, buffer: memoryview) -> int:
+        data = self._pcm.read(buffer.nbytes)
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        pass  # the caller owns the file
+
+
+def pcm_audio_config(pcm: bytes | BinaryIO):
+    stream_format = speechsdk.audio.AudioStreamFormat(
+        samples_per_second=PCM_SAMPLE_RATE,
+        bits_per_sample=PCM_BITS_PER_SAMPLE,
+        channels=PCM_CHANNELS,
+    )
+    if not isinstance(pcm, bytes):
+        stream = speechsdk.audio.PullAudioInputStream(
+            pull_stream_callback=_PcmReader(pcm), stream_format=stream_format
+        )
+        return speechsdk.audio.AudioConfig(stream=stream)
+    stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+    stream.write(pcm)
+    stream.close()
+    return speechsdk.audio.AudioConfig(stream=stream)
+
+
+class SpeechBackend:
+    def recognize(self, pcm: bytes | BinaryIO, from_lang: str) -> str:
+        """Recognize one utterance of 16 kHz mono s16le PCM; "" when nothing was heard."""
+        raise NotImplementedError
+
+    def open_session(self, from_lang: str, audio_config):
+        """
+        (recognizer, connection) for one continuous-recognition session, with
+        the connection already open. Holds a concurrency slot until
+        close_session() is called.
+        """
+        raise NotImplementedError
+
+    def close_session(self):
+        """Give back the slot taken by open_session()."""
+
+    def warm(self, langs):
+        """Prepare whatever per-language state the backend reuses; optional."""
+
+    def stats(self) -> dict:
+        return {}
+
+
+class AzureSpeechBackend(SpeechBackend):
+    def __init__(
+        self,
+        key: str,
+        region: str,
+        max_concurrent: int,
+        slot_timeout: float,
+        retry_after: int = 1,
+    ):
+        self.key = key
+        self.region = region
+        self.max_concurrent = max_concurrent
+        self.slot_timeout = slot_timeout
+        self.retry_after = retry_after
+        self._configs: dict[str, speechsdk.SpeechConfig] = {}
+        self._configs_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._in_flight = 0
+        self._sessions = 0
+        self._rejected = 0
+
+    def speech_config(self, lang: str) -> speechsdk.SpeechConfig:
+        """Shared SpeechConfig for ``lang``; must not be modified by callers."""
+        locale = LANG_MAP.get(lang, "en-US")
+        config = self._configs.get(locale)
+        if config is None:
+            with self._configs_lock:
+                config = self._configs.get(locale)
+                if config is None:
+                    start = time.perf_counter()
+                    config = speechsdk.SpeechConfig(subscription=self.key, region=self.region)
+                    config.speech_recognition_language = locale
+                    self._configs[locale] = config
+                    self._created += 1
+                    metric_speech_setup("config", (time.perf_counter() - start) * 1000)
+                    metric_speech_config(reused=False)
+                    return config
+        with self._lock:
+            self._reused += 1
+        metric_speech_config(reused=True)
+        return config
+
+    def warm(self, langs):
+        for lang in langs:
+            self.speech_config(lang)
+
+    def _acquire_slot(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.slot_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise StageSaturated("speech", self.retry_after)
+        metric_speech_wait((time.perf_counter() - start) * 1000)
+        with self._lock:
+            self._in_flight += 1
+
+    def _release_slot(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _new_recognizer(self, config, audio_config) -> speechsdk.SpeechRecognizer:
+        start = time.perf_counter()
+        recognizer = speechsdk.SpeechRecognizer(speech_config=config, audio_config=audio_config)
+        metric_speech_setup("recognizer", (time.perf_counter() - start) * 1000)
+        return recognizer
+
+    def recognize(self, pcm: bytes | BinaryIO, from_lang: str) -> str:
+        config = self.speech_config(from_lang)
+        self._acquire_slot()
+        try:
+            result = self._new_recognizer(config, pcm_audio_config(pcm)).recognize_once()
+        finally:
+            self._release_slot()
+
+        if result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            return result.text
+        return ""
+
+    def open_session(self, from_lang: str, audio_config):
+        config = self.speech_config(from_lang)
+        self._acquire_slot()
+        try:
+            recognizer = self._new_recognizer(config, audio_config)
+            start = time.perf_counter()
+            connection = speechsdk.Connection.from_recognizer(recognizer)
+            connection.open(True)  # for continuous recognition
+            metric_speech_setup("connection", (time.perf_counter() - start) * 1000)
+        except BaseException:
+            self._release_slot()
+            raise
+        with self._lock:
+            self._sessions += 1
+        return recognizer, connection
+
+    def close_session(self):
+        with self._lock:
+            self._sessions -= 1
+        self._release_slot()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "region": self.region,
+                "configs": len(self._configs),
+                "configs_created": self._created,
+                "configs_reused": self._reused,
+                "in_flight": self._in_flight,
+                "sessions": self._sessions,
+                "capacity": self.max_concurrent,
+                "rejected": self._rejected,
+            }
+
+
+# One backend (and so one concurrency cap) per region.
+_BACKENDS: dict[tuple[str, str], SpeechBackend] = {}
+_BACKENDS_LOCK = threading.Lock()
+_override: SpeechBackend | None = None
+
+
+def get_speech_backend() -> SpeechBackend:
+    if _override is not None:
+        return _override
+    key = (settings.azure_speech_region, settings.azure_speech_key)
+    backend = _BACKENDS.get(key)
+    if backend is None:
+        with _BACKENDS_LOCK:
+            backend = _BACKENDS.get(key)
+            if backend is None:
+                backend = _BACKENDS[key] = AzureSpeechBackend(
+                    settings.azure_speech_key,
+                    settings.azure_speech_region,
+                    max_concurrent=settings.speech_max_concurrent_per_region,
+                    slot_timeout=settings.speech_slot_timeout,
+                    retry_after=settings.pipeline_retry_after,
+                )
+    return backend
+
+
+def set_speech_backend(backend: SpeechBackend | None):
+    """Route recognitions to ``backend`` (e.g. a local fake); None restores Azure."""
+    global _override
+    _override = backend
+
+
+def speech_backend_stats() -> dict | None:
+    backend = _override if _override is not None else next(iter(_BACKENDS.values()), None)
+    return backend.stats() if backend is not None else None
@@ -1,63 +1,216 @@
 # app/services/stt_azure.py
 
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
+import threading
+from typing import BinaryIO
 
 import azure.cognitiveservices.speech as speechsdk
 
 from app.config import settings
+from app.services.speech_pool import (
+    LANG_MAP,
+    PCM_CHANNELS,
+    PCM_SAMPLE_RATE,
+    get_speech_backend,
+)
 from app.services.stt_stub import fake_transcribe
 
 logger = logging.getLogger("polyglot.services.stt_azure")
 
-LANG_MAP = {
-    "en": "en-US",
-    "es": "es-ES",
-    "fr": "fr-FR",
-    "de": "de-DE",
-    "it": "it-IT",
-}
+_FFMPEG_PCM_OUT = [
+    "-f",
+    "s16le",
+    "-acodec",
+    "pcm_s16le",
+    "-ac",
+    str(PCM_CHANNELS),
+    "-ar",
+    str(PCM_SAMPLE_RATE),
+    "pipe:1",
+]
 
 
-def convert_webm_to_wav(input_bytes: bytes) -> str:
-    with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as f_in:
-        f_in.write(input_bytes)
-        src = f_in.name
-    wav_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False).name
-    cmd = ["ffmpeg", "-y", "-i", src, wav_file]
-    subprocess.run(cmd, capture_output=True, check=True)
-    return wav_file
+# Uploads and PCM move through files and pipes in chunks of this size.
+STREAM_CHUNK_SIZE = 64 * 1024
 
+# Leading bytes of the containers ffmpeg is expected to see from browsers and
+# recorders: WAV, MP3 (ID3 tag or bare frame sync), Ogg, WebM/Matroska, FLAC,
+# AMR. MP4/M4A/3GP carry "ftyp" at offset 4 and are checked separately.
+AUDIO_SIGNATURES = (b"RIFF", b"ID3", b"\xff\xfb", b"\xff\xf3", b"\xff\xf2", b"OggS")
+AUDIO_SIGNATURES += (b"\x1a\x45\xdf\xa3", b"fLaC", b"#!AMR")
 
-def azure_transcribe(audio_bytes: bytes, from_lang: str) -> str:
+
+def looks_like_audio(head: bytes) -> bool:
+    """True if ``head`` (the first bytes of an upload) starts like a known audio container."""
+    return head.startswith(AUDIO_SIGNATURES) or head[4:8] == b"ftyp"
+
+
+def ffmpeg_pcm_cmd(src: str) -> list[str]:
+    return ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", src, *_FFMPEG_PCM_OUT]
+
+
+def decode_to_pcm(input_bytes: bytes) -> bytes:
+    """
+    Decode any ffmpeg-readable upload to 16 kHz mono s16le PCM in memory.
+    Bytes go in over stdin and PCM comes back over stdout, so nothing
+    touches the disk in the common (webm/ogg/wav/mp3) case.
+    """
+    try:
+        proc = subprocess.run(
+            ffmpeg_pcm_cmd("pipe:0"), input=input_bytes, capture_output=True, check=True
+        )
+        if proc.stdout:
+            return proc.stdout
+    except subprocess.CalledProcessError as err:
+        logger.info("ffmpeg could not decode from a pipe, retrying from a file: %s", err.stderr)
+    # Containers that need a seekable input (e.g. MP4 with a trailing moov atom).
+    return _decode_via_tempfile(input_bytes)
+
+
+def _decode_via_tempfile(input_bytes: bytes) -> bytes:
+    fd, src = tempfile.mkstemp(suffix=".audio")
+    try:
+        with os.fdopen(fd, "wb") as f_in:
+            f_in.write(input_bytes)
+        proc = subprocess.run(ffmpeg_pcm_cmd(src), capture_output=True, check=True)
+        return proc.stdout
+    finally:
+        os.unlink(src)
+
+
+def _pump(src: BinaryIO, dst):
+    """Copy ``src`` into ffmpeg's stdin chunk by chunk, then close it."""
+    try:
+        shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+    except BrokenPipeError:
+        pass  # ffmpeg stopped reading; its exit status says why
+    finally:
+        try:
+            dst.close()
+        except BrokenPipeError:
+            pass
+
+
+def _run_ffmpeg_spooled(cmd: list[str], src: BinaryIO | None = None):
+    """
+    Run ffmpeg and collect its PCM output in a spooled temp file (memory up
+    to STT_PCM_SPOOL_BYTES, disk beyond). ``src`` is streamed to stdin from
+    a feeder thread. Returns (returncode, pcm file at offset 0, stderr).
+    """
+    pcm = tempfile.SpooledTemporaryFile(max_size=settings.stt_pcm_spool_bytes)
+    with tempfile.TemporaryFile() as errors:  # a file, so a chatty ffmpeg cannot block on stderr
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if src is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=errors,
+        )
+        feeder = None
+        if src is not None:
+            feeder = threading.Thread(target=_pump, args=(src, proc.stdin), daemon=True)
+            feeder.start()
+        try:
+            shutil.copyfileobj(proc.stdout, pcm, STREAM_CHUNK_SIZE)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+            if feeder is not None:
+                feeder.join()
+        errors.seek(0)
+        stderr = errors.read()
+    pcm.seek(0)
+    return returncode, pcm, stderr
+
+
+def decode_file_to_pcm(src: BinaryIO) -> BinaryIO:
+    """
+    Streaming twin of decode_to_pcm for uploads that live in a (spooled)
+    file: the upload is fed to ffmpeg in chunks and the PCM is spooled, so
+    memory stays bounded however long the recording is. The caller closes
+    the returned file.
+    """
+    src.seek(0)
+    returncode, pcm, stderr = _run_ffmpeg_spooled(ffmpeg_pcm_cmd("pipe:0"), src)
+    if returncode == 0 and pcm.seek(0, os.SEEK_END):
+        pcm.seek(0)
+        return pcm
+    pcm.close()
+    logger.info("ffmpeg could not decode from a pipe, retrying from a file: %s", stderr)
+
+    # Containers that need a seekable input (e.g. MP4 with a trailing moov atom).
+    src.seek(0)
+    fd, path = tempfile.mkstemp(suffix=".audio")
+    try:
+        with os.fdopen(fd, "wb") as f_in:
+            shutil.copyfileobj(src, f_in, STREAM_CHUNK_SIZE)
+        cmd = ffmpeg_pcm_cmd(path)
+        returncode, pcm, stderr = _run_ffmpeg_spooled(cmd)
+    finally:
+        os.unlink(path)
+    if returncode != 0:
+        pcm.close()
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+    return pcm
+
+
+def use_stub_transcriber() -> bool:
+    return not settings.azure_speech_key or not settings.azure_speech_region or speechsdk is None
+
+
+def decode_audio(audio: bytes | BinaryIO) -> bytes | BinaryIO | None:
+    """
+    Decode the upload into PCM for the Speech SDK: bytes in, bytes out; a
+    file in, a spooled PCM file out (see decode_file_to_pcm).
+    Returns None when the stub transcriber is in use (nothing to decode).
+    """
+    if not audio or use_stub_transcriber():
+        return None
+    if isinstance(audio, bytes):
+        return decode_to_pcm(audio)
+    return decode_file_to_pcm(audio)
+
+
+def azure_transcribe(
+    audio_bytes: bytes | BinaryIO, from_lang: str, pcm: bytes | BinaryIO | None = None
+) -> str:
     """
     Transcribe audio to text.
     Returns just the transcript text (no auto-detection).
+    ``audio_bytes`` may also be an upload file; pass ``pcm`` when the audio
+    was already decoded via decode_audio().
     """
     if not audio_bytes:
         return ""
 
-    if not settings.azure_speech_key or not settings.azure_speech_region or speechsdk is None:
+    if use_stub_transcriber():
         if speechsdk is None:
             logger.warning("Azure Speech SDK not installed; using stub transcript.")
         return fake_transcribe(audio_bytes, from_lang)
 
-    wav_path = convert_webm_to_wav(audio_bytes)
+    decoded_here = pcm is None
+    if decoded_here:
+        pcm = decode_audio(audio_bytes)
+    try:
+        return recognize_pcm(pcm, from_lang)
+    finally:
+        if decoded_here and not isinstance(pcm, bytes):
+            pcm.close()
 
-    speech_config = speechsdk.SpeechConfig(
-        subscription=settings.azure_speech_key, region=settings.azure_speech_region
-    )
 
-    # Always use the specified language (no auto-detection)
-    speech_config.speech_recognition_language = LANG_MAP.get(from_lang, "en-US")
-
-    audio_config = speechsdk.AudioConfig(filename=wav_path)
-    recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
-
-    result = recognizer.recognize_once()
+def recognize_pcm(pcm: bytes | BinaryIO, from_lang: str) -> str:
+    """
+    One recognize_once() pass over decoded PCM through the speech backend
+    (shared per-language configs, capped concurrency). It ends at the first
+    pause, so audio longer than one utterance goes through stt_longform.
+    """
+    return get_speech_backend().recognize(pcm, from_lang)
 
-    if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-        return result.text
 
-    return ""
+def warm_speech_backend():
+    """Build the per-language speech configs up front; called at startup."""
+    if not use_stub_transcriber():
+        get_speech_backend().warm(LANG_MAP)
@@ -0,0 +1,200 @@
+# app/services/stt_longform.py
+
+"""
+Long-form transcription for uploads longer than one utterance.
+
+recognize_once() stops at the first pause (or ~15 s), so audio is split on
+silence first: a simple energy-based voice-activity detector walks the
+decoded PCM in 30 ms frames and returns speech segments, cut at pauses and
+never longer than STT_VAD_MAX_SEGMENT_MS. Audio with more than one segment,
+or longer than STT_LONG_FORM_AFTER_S, goes long-form. Each segment is
+recognized on the "stt" stage executor, at most STT_LONG_FORM_CONCURRENCY at
+a time per request, and the results come back in order with their
+timestamps. The first failing segment cancels the rest, so a failed request
+does not keep holding stt workers.
+
+PCM is read from the (spooled) file one frame or one segment at a time, so
+memory stays bounded by the segments in flight.
+"""
+
+import asyncio
+import io
+import math
+import sys
+import threading
+from array import array
+from operator import mul
+from typing import BinaryIO
+
+from app.config import settings
+from app.services import stt_azure
+from app.services.speech_pool import PCM_BITS_PER_SAMPLE, PCM_CHANNELS, PCM_SAMPLE_RATE
+from app.utils.executors import run_stage
+
+FRAME_MS = 30
+BYTES_PER_MS = PCM_SAMPLE_RATE * PCM_BITS_PER_SAMPLE // 8 * PCM_CHANNELS // 1000
+# Speech kept on each side of a segment so word edges are not clipped.
+SEGMENT_PAD_MS = 150
+
+
+def pcm_duration_ms(pcm: bytes | BinaryIO) -> int:
+    if isinstance(pcm, bytes):
+        return len(pcm) // BYTES_PER_MS
+    pos = pcm.tell()
+    size = pcm.seek(0, io.SEEK_END)
+    pcm.seek(pos)
+    return size // BYTES_PER_MS
+
+
+def is_long_form(pcm: bytes | BinaryIO, segments: list[tuple[int, int]]) -> bool:
+    """More than one utterance, or too long for a single recognize_once."""
+    return len(segments) > 1 or pcm_duration_ms(pcm) > settings.stt_long_form_after_s * 1000
+
+
+def frame_rms(frame: bytes) -> float:
+    samples = array("h")
+    samples.frombytes(frame[: len(frame) // 2 * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()  # PCM is s16le
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(map(mul, samples, samples)) / len(samples))
+
+
+class _SegmentBuilder:
+    """Turns per-frame speech/silence decisions into (start_ms, end_ms) segments."""
+
+    def __init__(self, min_silence_ms: int, max_segment_ms: int):
+        self.min_silence_ms = min_silence_ms
+        self.max_segment_ms = max_segment_ms
+        self.raw: list[tuple[int, int]] = []
+        self._start = None
+        self._last_speech = 0
+
+    def add(self, start_ms: int, end_ms: int, speech: bool):
+        if speech:
+            if self._start is None:
+                self._start = start_ms
+            self._last_speech = end_ms
+        if self._start is None:
+            return
+        if end_ms - self._start >= self.max_segment_ms:
+            self._close(end_ms)  # forced cut inside continuous speech
+        elif end_ms - self._last_speech >= self.min_silence_ms:
+            self._close(self._last_speech)
+
+    def _close(self, end_ms: int):
+        self.raw.append((self._start, end_ms))
+        self._start = None
+
+    def finish(self, total_ms: int, min_speech_ms: int) -> list[tuple[int, int]]:
+        if self._start is not None:
+            self._close(self._last_speech)
+        segments = []
+        for start, end in self.raw:
+            if end - start < min_speech_ms:
+                continue
+            start = max(start - SEGMENT_PAD_MS, segments[-1][1] if segments else 0)
+            end = min(end + SEGMENT_PAD_MS, total_ms, start + self.max_segment_ms)
+            segments.append((start, end))
+        return segments
+
+
+def find_speech_segments(
+    pcm: bytes | BinaryIO,
+    threshold: float | None = None,
+    min_silence_ms: int | None = None,
+    max_segment_ms: int | None = None,
+    min_speech_ms: int | None = None,
+) -> list[tuple[int, int]]:
+    """
+    Speech segments of 16 kHz mono s16le PCM as (start_ms, end_ms) pairs, in
+    order. A file is read from the start and left where it was found, so the
+    same PCM can be handed to the recognizer afterwards.
+    """
+    threshold = settings.stt_vad_energy_threshold if threshold is None else threshold
+    builder = _SegmentBuilder(
+        settings.stt_vad_min_silence_ms if min_silence_ms is None else min_silence_ms,
+        settings.stt_vad_max_segment_ms if max_segment_ms is None else max_segment_ms,
+    )
+    src = io.BytesIO(pcm) if isinstance(pcm, bytes) else pcm
+    pos = src.tell()
+    src.seek(0)
+    frame_bytes = FRAME_MS * BYTES_PER_MS
+    t = 0
+    try:
+        while frame := src.read(frame_bytes):
+            end = t + len(frame) // BYTES_PER_MS
+            builder.add(t, end, frame_rms(frame) >= threshold)
+            t = end
+    finally:
+        src.seek(pos)
+    min_speech = settings.stt_vad_min_speech_ms if min_speech_ms is None else min_speech_ms
+    return builder.finish(t, min_speech)
+
+
+class _PcmSlices:
+    """Thread-safe random access to a PCM file by time range."""
+
+    def __init__(self, pcm: bytes | BinaryIO):
+        self._src = io.BytesIO(pcm) if isinstance(pcm, bytes) else pcm
+        self._lock = threading.Lock()
+
+    def read(self, start_ms: int, end_ms: int) -> bytes:
+        with self._lock:
+            self._src.seek(start_ms * BYTES_PER_MS)
+            return self._src.read((end_ms - start_ms) * BYTES_PER_MS)
+
+
+def _recognize_slice(slices: _PcmSlices, start_ms: int, end_ms: int, from_lang: str, recognize):
+    return recognize(slices.read(start_ms, end_ms), from_lang)
+
+
+async def transcribe_long_form(
+    pcm: bytes | BinaryIO,
+    from_lang: str,
+    recognize=None,
+    segments: list[tuple[int, int]] | None = None,
+) -> list[dict]:
+    """
+    Split ``pcm`` on silence (unless ``segments`` from find_speech_segments
+    are passed in) and recognize the segments in parallel.
+    Returns [{index, start_ms, end_ms, text}] in time order; segments the
+    recognizer found no speech in keep an empty text. ``recognize(pcm_bytes,
+    from_lang)`` defaults to the Azure single-utterance recognizer.
+    """
+    recognize = recognize or stt_azure.recognize_pcm
+    if segments is None:
+        segments = await run_stage("decode", find_speech_segments, pcm)
+    slices = _PcmSlices(pcm)
+    in_flight = asyncio.Semaphore(max(1, settings.stt_long_form_concurrency))
+
+    failed = asyncio.Event()
+
+    async def one(index, start_ms, end_ms):
+        async with in_flight:
+            if failed.is_set():
+                raise asyncio.CancelledError  # a sibling failed while this one waited
+            try:
+                text = await run_stage(
+                    "stt", _recognize_slice, slices, start_ms, end_ms, from_lang, recognize
+                )
+            except BaseException:
+                failed.set()
+                raise
+        return {"index": index, "start_ms": start_ms, "end_ms": end_ms, "text": text or ""}
+
+    tasks = [asyncio.ensure_future(one(i, s, e)) for i, (s, e) in enumerate(segments)]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        # Queued and waiting segments give their stt slots back; a recognition
+        # already running on a worker thread still finishes in the background.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def join_segments(segments: list[dict], key: str = "text") -> str:
+    return " ".join(s[key].strip() for s in segments if s.get(key, "").strip())
@@ -0,0 +1,178 @@
+# app/services/stt_streaming.py
+
+"""
+Continuous speech recognition for the /ws/captions live endpoint.
+
+A streaming recognizer receives encoded audio chunks (MediaRecorder webm
+fragments) through push() and reports results through an ``emit(kind, text)``
+callback, where kind is "partial" (interim hypothesis) or "final" (finished
+segment). All methods are blocking and are called from worker threads.
+"""
+
+import logging
+import subprocess
+import threading
+
+import azure.cognitiveservices.speech as speechsdk
+
+from app.config import settings
+from app.services.speech_pool import (
+    PCM_BITS_PER_SAMPLE,
+    PCM_CHANNELS,
+    PCM_SAMPLE_RATE,
+    SpeechBackend,
+    get_speech_backend,
+)
+from app.services.stt_azure import ffmpeg_pcm_cmd, use_stub_transcriber
+
+logger = logging.getLogger("polyglot.services.stt_streaming")
+
+PCM_READ_SIZE = 3200  # 100 ms of 16 kHz mono s16le
+STOP_TIMEOUT_S = 10
+
+
+class StreamingRecognizer:
+    def start(self):
+        raise NotImplementedError
+
+    def push(self, chunk: bytes):
+        raise NotImplementedError
+
+    def stop(self):
+        """Flush buffered audio; every remaining final is emitted before this returns."""
+        raise NotImplementedError
+
+
+class AzureStreamingRecognizer(StreamingRecognizer):
+    """
+    ffmpeg turns the webm stream into PCM on the fly; a pump thread copies the
+    PCM into a Speech SDK push stream consumed by continuous recognition.
+
+    The recognizer comes from the speech backend, so a session shares the
+    per-language config and holds one of the region's concurrency slots from
+    start() to stop(). start() raises StageSaturated when none is free.
+    """
+
+    def __init__(self, from_lang: str, emit, backend: SpeechBackend | None = None):
+        self._emit = emit
+        self._from_lang = from_lang
+        self._backend = backend or get_speech_backend()
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=PCM_SAMPLE_RATE,
+            bits_per_sample=PCM_BITS_PER_SAMPLE,
+            channels=PCM_CHANNELS,
+        )
+        self._stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+        self._session_done = threading.Event()
+        self._recognizer = None
+        self._connection = None
+        self._ffmpeg = None
+        self._pump_thread = None
+
+    def _connect_events(self):
+        self._recognizer.recognizing.connect(lambda evt: self._emit("partial", evt.result.text))
+        self._recognizer.recognized.connect(self._on_recognized)
+        self._recognizer.session_stopped.connect(lambda evt: self._session_done.set())
+        self._recognizer.canceled.connect(lambda evt: self._session_done.set())
+
+    def _on_recognized(self, evt):
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and evt.result.text:
+            self._emit("final", evt.result.text)
+
+    def _pump(self):
+        try:
+            while True:
+                pcm = self._ffmpeg.stdout.read1(PCM_READ_SIZE)
+                if not pcm:
+                    break
+                self._stream.write(pcm)
+        finally:
+            self._stream.close()
+
+    def start(self):
+        # The slot comes first, so a saturated region costs no ffmpeg process.
+        self._recognizer, self._connection = self._backend.open_session(
+            self._from_lang, speechsdk.audio.AudioConfig(stream=self._stream)
+        )
+        try:
+            self._connect_events()
+            self._ffmpeg = subprocess.Popen(
+                ffmpeg_pcm_cmd("pipe:0"),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._pump_thread = threading.Thread(target=self._pump, daemon=True)
+            self._pump_thread.start()
+            self._recognizer.start_continuous_recognition_async().get()
+        except BaseException:
+            self._close()
+            raise
+
+    def push(self, chunk: bytes):
+        self._ffmpeg.stdin.write(chunk)
+        self._ffmpeg.stdin.flush()
+
+    def stop(self):
+        try:
+            self._ffmpeg.stdin.close()
+            self._pump_thread.join(STOP_TIMEOUT_S)
+            # The push stream is closed, so the session ends once the tail is recognized.
+            self._session_done.wait(STOP_TIMEOUT_S)
+            self._recognizer.stop_continuous_recognition_async().get()
+        finally:
+            self._close()
+
+    def _close(self):
+        """Ends ffmpeg (and with it the pump) and gives the speech slot back."""
+        try:
+            if self._ffmpeg is not None:
+                if self._ffmpeg.poll() is None:
+                    self._ffmpeg.kill()
+                self._ffmpeg.wait()
+            self._connection.close()
+        finally:
+            self._backend.close_session()
+
+
+class FakeStreamingRecognizer(StreamingRecognizer):
+    """
+    Deterministic stand-in used when no Speech key is configured and in tests.
+    Every chunk extends the partial hypothesis by one word of the sample
+    transcript; every ``chunks_per_segment`` chunks close a final segment.
+    """
+
+    def __init__(self, from_lang: str, emit, chunks_per_segment: int = 4):
+        self._emit = emit
+        lang = (from_lang or "en").lower()
+        sample = settings.sample_transcripts.get(lang, settings.sample_transcripts["en"])
+        self._words = sample.split()
+        self._chunks_per_segment = chunks_per_segment
+        self._in_segment = 0
+
+    def start(self):
+        pass
+
+    def _hypothesis(self) -> str:
+        return " ".join(self._words[: min(self._in_segment, len(self._words))])
+
+    def push(self, chunk: bytes):
+        if not chunk:
+            return
+        self._in_segment += 1
+        if self._in_segment >= self._chunks_per_segment:
+            self._emit("final", " ".join(self._words))
+            self._in_segment = 0
+        else:
+            self._emit("partial", self._hypothesis())
+
+    def stop(self):
+        if self._in_segment:
+            self._emit("final", self._hypothesis())
+            self._in_segment = 0
+
+
+def create_streaming_recognizer(from_lang: str, emit) -> StreamingRecognizer:
+    if use_stub_transcriber():
+        return FakeStreamingRecognizer(from_lang, emit)
+    return AzureStreamingRecognizer(from_lang, emit)
@@ -0,0 +1,110 @@
+# app/services/subtitles.py
+
+"""
+Subtitle timing storage and SRT/WebVTT rendering.
+
+Segment timing is stored next to the caption (Captions.Segments) as a flat
+JSON list of integers, four per segment:
+
+    [gap_ms, duration_ms, transcript_chars, translation_chars, ...]
+
+gap_ms is measured from the end of the previous segment. The segment texts
+are not stored again: they are the space-joined pieces of Transcript and
+TranslatedText, so the character counts are enough to cut them back out.
+A ten-minute recording with ~100 segments stores about 1.5 KB.
+
+If TranslatedText was edited after the fact (PUT /api/captions/{id}) the
+counts no longer add up, and the edited text is spread over the segments
+in proportion to the original lengths, on word boundaries.
+"""
+
+import json
+
+MEDIA_TYPES = {
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+}
+
+
+def encode_segments(segments: list[dict]) -> str | None:
+    """Compact timing for segments with start_ms/end_ms/text/translated; None if empty."""
+    if not segments:
+        return None
+    flat, prev_end = [], 0
+    for seg in segments:
+        flat += [
+            seg["start_ms"] - prev_end,
+            seg["end_ms"] - seg["start_ms"],
+            len(seg.get("text", "").strip()),
+            len(seg.get("translated", "").strip()),
+        ]
+        prev_end = seg["end_ms"]
+    return json.dumps(flat, separators=(",", ":"))
+
+
+def _cut(text: str, lengths: list[int]) -> list[str]:
+    """Split ``text`` (pieces joined by single spaces, empty pieces skipped) back into pieces."""
+    if sum(lengths) + max(sum(1 for n in lengths if n) - 1, 0) == len(text):
+        pieces, pos = [], 0
+        for n in lengths:
+            pieces.append(text[pos : pos + n])
+            pos += n + 1 if n else 0
+        return pieces
+    return _spread(text, lengths)
+
+
+def _spread(text: str, lengths: list[int]) -> list[str]:
+    words = text.split()
+    total = sum(lengths) or 1
+    pieces, used, seen = [], 0, 0
+    for n in lengths:
+        seen += n
+        upto = round(len(words) * seen / total)
+        pieces.append(" ".join(words[used:upto]))
+        used = upto
+    if used < len(words) and pieces:
+        pieces[-1] = " ".join(filter(None, [pieces[-1], *words[used:]]))
+    return pieces
+
+
+def decode_segments(encoded: str, transcript: str, translated: str) -> list[dict]:
+    flat = json.loads(encoded)
+    rows = [flat[i : i + 4] for i in range(0, len(flat), 4)]
+    texts = _cut(transcript or "", [r[2] for r in rows])
+    translations = _cut(translated or "", [r[3] for r in rows])
+    segments, end = [], 0
+    for index, ((gap, duration, _, _), text, tr) in enumerate(zip(rows, texts, translations)):
+        start = end + gap
+        end = start + duration
+        segments.append(
+            {"index": index, "start_ms": start, "end_ms": end, "text": text, "translated": tr}
+        )
+    return segments
+
+
+def _timestamp(ms: int, sep: str) -> str:
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{sep}{ms:03d}"
+
+
+def _cue_text(text: str, fmt: str) -> str:
+    # A blank line ends a cue, and WebVTT reserves "-->" for timings.
+    text = " ".join(text.split())
+    return text.replace("-->", "->") if fmt == "vtt" else text
+
+
+def render_subtitles(segments: list[dict], fmt: str, key: str = "translated"):
+    """Yield the subtitle file cue by cue; segments with no text in ``key`` are skipped."""
+    sep = "," if fmt == "srt" else "."
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+    number = 0
+    for seg in segments:
+        text = _cue_text(seg.get(key, ""), fmt)
+        if not text:
+            continue
+        number += 1
+        timing = f"{_timestamp(seg['start_ms'], sep)} --> {_timestamp(seg['end_ms'], sep)}"
+        yield f"{number}\n{timing}\n{text}\n\n"
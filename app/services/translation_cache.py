@@ -0,0 +1,203 @@
+# app/services/translation_cache.py
+
+"""
+Cache for Azure Translator results.
+
+Keys are built from the whitespace/Unicode-normalized text plus the
+normalized language pair. Entries live in an in-process LRU bounded by size
+and TTL; an optional shared backend (e.g. Redis) can sit behind it so
+replicas share hits.
+
+Async callers use aget()/aset(): the LRU is checked inline, and a backend
+that is not ``local`` is called on a worker thread so network round trips
+never block the event loop.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from app.config import settings
+
+logger = logging.getLogger("polyglot.services.translation_cache")
+
+
+class CacheBackend:
+    """
+    Interface for a shared cache tier. Implementations must be thread-safe
+    and should swallow their own transient errors where possible; anything
+    they raise is logged and treated as a miss. Backends that do I/O leave
+    ``local`` False so async callers reach them off the event loop.
+    """
+
+    local = False
+
+    def get(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    """Dict-backed shared tier, handy for tests and single-host setups."""
+
+    local = True
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(text: str, from_lang: str | None, to_lang: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"tr:{from_lang or 'auto'}:{to_lang}:{digest}"
+
+
+class TranslationCache:
+    def __init__(self, max_entries: int = 2048, ttl: float = 3600.0, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._backend_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> str | None:
+        value = self._local_get(key)
+        if value is not None:
+            return value
+        return self._record_backend(key, self._backend_get(key))
+
+    async def aget(self, key: str) -> str | None:
+        value = self._local_get(key)
+        if value is not None:
+            return value
+        if self.backend is not None and not self.backend.local:
+            return self._record_backend(key, await asyncio.to_thread(self._backend_get, key))
+        return self._record_backend(key, self._backend_get(key))
+
+    def set(self, key: str, value: str):
+        self._store_local(key, value)
+        self._backend_set(key, value)
+
+    async def aset(self, key: str, value: str):
+        self._store_local(key, value)
+        if self.backend is not None and not self.backend.local:
+            await asyncio.to_thread(self._backend_set, key, value)
+        else:
+            self._backend_set(key, value)
+
+    def _local_get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                value, expires_at = item
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+                self._evictions += 1
+        return None
+
+    def _record_backend(self, key, value):
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._backend_hits += 1
+        self._store_local(key, value)
+        return value
+
+    def _backend_set(self, key, value):
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, self.ttl)
+            except Exception:
+                logger.warning("Translation cache backend set failed", exc_info=True)
+
+    def _backend_get(self, key):
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get(key)
+        except Exception:
+            logger.warning("Translation cache backend get failed", exc_info=True)
+            return None
+
+    def _store_local(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._backend_hits = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "backend_hits": self._backend_hits,
+            }
+
+
+translation_cache = TranslationCache(
+    max_entries=settings.translation_cache_size, ttl=settings.translation_cache_ttl
+)
+
+
+def configure_translation_cache(max_entries=None, ttl=None, backend=None) -> TranslationCache:
+    """Replace the process-wide cache (e.g. to plug in a shared backend)."""
+    global translation_cache
+    translation_cache = TranslationCache(
+        max_entries=settings.translation_cache_size if max_entries is None else max_entries,
+        ttl=settings.translation_cache_ttl if ttl is None else ttl,
+        backend=backend,
+    )
+    return translation_cache
+
+
+def get_translation_cache() -> TranslationCache:
+    return translation_cache
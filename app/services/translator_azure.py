@@ -6,10 +6,17 @@ import logging
 import requests
 
 from app.config import settings
+from app.services.http_client import get_translator_client
+from app.services.singleflight import SingleFlight
+from app.services.translation_cache import get_translation_cache, make_key
 from app.services.translator_stub import fake_translate
+from app.utils.tracing import span
 
 logger = logging.getLogger("polyglot.services.translator_azure")
 
+# Identical concurrent (text, from, to) lookups share one upstream call.
+translation_flights = SingleFlight()
+
 
 def normalize_lang(lang: str) -> str:
     """
@@ -24,22 +31,19 @@ def normalize_lang(lang: str) -> str:
     return lang
 
 
-def azure_translate(text: str, from_lang: str, to_lang: str) -> str:
-    if not text:
-        return ""
-
-    # Normalize full codes (en-US → en)
-    from_lang = normalize_lang(from_lang)
-    to_lang = normalize_lang(to_lang)
-
-    # Use stub if no Azure keys
+def _build_request(from_lang: str, to_langs: list[str]):
+    """
+    Return (url, params, headers) for a Translator call, or None when no
+    Azure keys are configured and the stub should be used instead.
+    Expects already-normalized language codes.
+    """
     if not settings.azure_translator_key or not settings.azure_translator_endpoint:
-        return fake_translate(text, from_lang or "auto", to_lang)
+        return None
 
     url = settings.azure_translator_endpoint.rstrip("/") + "/translate"
     params = {
         "api-version": "3.0",
-        "to": [to_lang],
+        "to": list(to_langs),
     }
 
     # Only add 'from' parameter if it's not auto-detection
@@ -51,7 +55,23 @@ def azure_translate(text: str, from_lang: str, to_lang: str) -> str:
         "Ocp-Apim-Subscription-Region": settings.azure_translator_region,
         "Content-Type": "application/json",
     }
+    return url, params, headers
 
+
+def azure_translate(text: str, from_lang: str, to_lang: str) -> str:
+    if not text:
+        return ""
+
+    # Normalize full codes (en-US → en)
+    from_lang = normalize_lang(from_lang)
+    to_lang = normalize_lang(to_lang)
+
+    request = _build_request(from_lang, [to_lang])
+    # Use stub if no Azure keys
+    if request is None:
+        return fake_translate(text, from_lang or "auto", to_lang)
+
+    url, params, headers = request
     resp = requests.post(url, params=params, headers=headers, json=[{"text": text}], timeout=10)
     resp.raise_for_status()
 
@@ -59,6 +79,145 @@ def azure_translate(text: str, from_lang: str, to_lang: str) -> str:
     return data[0]["translations"][0]["text"]
 
 
-async def azure_translate_async(text: str, from_lang: str, to_lang: str) -> str:
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, lambda: azure_translate(text, from_lang, to_lang))
+async def azure_translate_async(
+    text: str, from_lang: str, to_lang: str, use_cache: bool = True
+) -> str:
+    """
+    Async twin of azure_translate using the shared keep-alive HTTP client.
+    Results from the real service are cached; ``use_cache=False`` skips the
+    lookup (the fresh result still refreshes the cache). Concurrent misses
+    for the same text and pair are coalesced into one upstream call.
+    """
+    if not text:
+        return ""
+
+    from_lang = normalize_lang(from_lang)
+    to_lang = normalize_lang(to_lang)
+
+    request = _build_request(from_lang, [to_lang])
+    if request is None:
+        return fake_translate(text, from_lang or "auto", to_lang)
+
+    cache = get_translation_cache()
+    key = make_key(text, from_lang, to_lang)
+    if use_cache and cache.enabled:
+        with span("cache_lookup") as lookup:
+            cached = await cache.aget(key)
+            if lookup is not None:
+                lookup.attributes["hit"] = cached is not None
+        if cached is not None:
+            return cached
+
+    async def fetch():
+        with span("translator_call"):
+            translated = await _post_translation(request, text)
+        if cache.enabled:
+            await cache.aset(key, translated)
+        return translated
+
+    return await translation_flights.do(key, fetch)
+
+
+async def _post_translation(request, text: str) -> str:
+    url, params, headers = request
+    client = get_translator_client()
+    resp = await client.post(url, params=params, headers=headers, json=[{"text": text}])
+    resp.raise_for_status()
+
+    data = resp.json()
+    return data[0]["translations"][0]["text"]
+
+
+# Azure Translator v3 limits per request: array size and total characters,
+# where characters are counted once per target language.
+MAX_BATCH_TEXTS = 100
+MAX_BATCH_CHARS = 50_000
+
+
+def chunk_batch(texts: list[str], n_targets: int = 1) -> list[list[int]]:
+    """
+    Group indexes of ``texts`` into chunks that respect the per-request
+    limits. A single text over the character limit gets a chunk of its own
+    (Azure will reject it, which surfaces as an error for that call).
+    """
+    chunks, current, chars = [], [], 0
+    for i, text in enumerate(texts):
+        cost = len(text) * max(n_targets, 1)
+        if current and (len(current) >= MAX_BATCH_TEXTS or chars + cost > MAX_BATCH_CHARS):
+            chunks.append(current)
+            current, chars = [], 0
+        current.append(i)
+        chars += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def azure_translate_batch(
+    texts: list[str], from_lang: str, to_langs: list[str], use_cache: bool = True
+) -> list[dict[str, str]]:
+    """
+    Translate many texts into many target languages with as few Translator
+    calls as possible. Returns one ``{to_lang: translation}`` dict per input
+    text, in input order. Language keys are the normalized codes.
+    """
+    from_lang = normalize_lang(from_lang)
+    targets = list(dict.fromkeys(normalize_lang(t) for t in to_langs))
+    results = [dict.fromkeys(targets, "") for _ in texts]
+
+    request = _build_request(from_lang, targets)
+    if request is None:
+        return [_stub_targets(text, from_lang, targets) for text in texts]
+
+    cache = get_translation_cache()
+    pending = []  # indexes that still need an upstream call
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        hits = await _cached_targets(cache, text, from_lang, targets) if use_cache else None
+        if hits is not None:
+            results[i] = hits
+        else:
+            pending.append(i)
+
+    chunks = chunk_batch([texts[i] for i in pending], len(targets))
+    responses = await asyncio.gather(
+        *(_post_batch(request, [texts[pending[j]] for j in chunk]) for chunk in chunks)
+    )
+
+    for chunk, data in zip(chunks, responses):
+        for j, item in zip(chunk, data):
+            i = pending[j]
+            # Translations come back in the same order as the `to` params.
+            results[i] = {t: tr["text"] for t, tr in zip(targets, item["translations"])}
+            if cache.enabled:
+                for t, value in results[i].items():
+                    await cache.aset(make_key(texts[i], from_lang, t), value)
+    return results
+
+
+def _stub_targets(text: str, from_lang: str, targets: list[str]) -> dict[str, str]:
+    if not text:
+        return dict.fromkeys(targets, "")
+    return {t: fake_translate(text, from_lang or "auto", t) for t in targets}
+
+
+async def _cached_targets(cache, text: str, from_lang: str, targets: list[str]):
+    """Return all target translations from the cache, or None on any miss."""
+    if not cache.enabled:
+        return None
+    hits = {}
+    for t in targets:
+        value = await cache.aget(make_key(text, from_lang, t))
+        if value is None:
+            return None
+        hits[t] = value
+    return hits
+
+
+async def _post_batch(request, texts: list[str]) -> list[dict]:
+    url, params, headers = request
+    client = get_translator_client()
+    resp = await client.post(url, params=params, headers=headers, json=[{"text": t} for t in texts])
+    resp.raise_for_status()
+    return resp.json()
@@ -1,9 +1,13 @@
 # app/utils/auth.py
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
-from fastapi import HTTPException, status
-from jose import JWTError, jwt
+import jwt
+from fastapi import HTTPException, Request, status
 
 from app.config import settings
 
@@ -16,18 +20,82 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens that already passed signature verification, keyed
+    by a SHA-256 of the token and valid until the token's own ``exp``. Tokens
+    without ``exp`` are never cached.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> str | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            username, exp = entry
+            if exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return username
+
+    def set(self, token: str, username: str, exp):
+        if self.max_entries <= 0 or exp is None:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (username, float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = VerifiedTokenCache(settings.auth_token_cache_size)
+
+
 def get_current_user_from_token(token: str) -> str:
     """
     Decode a JWT and return username (sub).
     DO NOT use OAuth2PasswordBearer here — we need custom header logic.
     """
+    username = token_cache.get(token)
+    if username is not None:
+        return username
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username = payload.get("sub")
-        if not username:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        return username
-    except JWTError as err:
+    except jwt.PyJWTError as err:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token"
         ) from err
+
+    username = payload.get("sub")
+    if not username:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    token_cache.set(token, username, payload.get("exp"))
+    return username
+
+
+async def get_current_user(request: Request) -> str:
+    """FastAPI dependency: the username behind the request's Bearer token."""
+    auth = request.headers.get("Authorization")
+    if not auth or not auth.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid token")
+    return get_current_user_from_token(auth.split(" ")[1])
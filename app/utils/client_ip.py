@@ -0,0 +1,58 @@
+# app/utils/client_ip.py
+
+"""
+Client address for per-IP limits behind a reverse proxy.
+
+Behind the Azure App Service front end the socket peer is the proxy, and
+the real client is in X-Forwarded-For. Clients can set that header too, so
+it is only read when the peer is in TRUSTED_PROXIES. The hops are then
+walked right to left, skipping further trusted proxies, and the first
+untrusted address is the client. With no trusted proxies configured the
+peer address is used as is.
+"""
+
+import ipaddress
+from functools import lru_cache
+
+from fastapi import Request
+
+from app.config import settings
+
+
+@lru_cache(maxsize=8)
+def _networks(spec: str) -> tuple:
+    return tuple(
+        ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip()
+    )
+
+
+def _parse(value: str):
+    """IP address from "1.2.3.4", "1.2.3.4:5678" or "[::1]:5678"; None if malformed."""
+    value = value.strip()
+    if value.startswith("["):
+        value = value[1 : value.find("]")]
+    elif value.count(":") == 1:
+        value = value.split(":")[0]
+    try:
+        return ipaddress.ip_address(value)
+    except ValueError:
+        return None
+
+
+def _trusted(addr, networks) -> bool:
+    return addr is not None and any(addr in net for net in networks)
+
+
+def client_ip(request: Request) -> str:
+    peer = request.client.host if request.client else "unknown"
+    networks = _networks(settings.trusted_proxies)
+    if not networks or not _trusted(_parse(peer), networks):
+        return peer
+    hops = [hop for value in request.headers.getlist("x-forwarded-for") for hop in value.split(",")]
+    for hop in reversed(hops):
+        addr = _parse(hop)
+        if addr is None:
+            break  # malformed entry: nothing left of it can be trusted
+        if not _trusted(addr, networks):
+            return str(addr)
+    return peer
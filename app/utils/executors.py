@@ -0,0 +1,121 @@
+# app/utils/executors.py
+
+"""
+Bounded per-stage thread pools for the blocking parts of the caption pipeline
+(audio decode, STT, DB writes) and for bcrypt password hashing. Translation
+is natively async and is bounded by the shared HTTP client's connection
+limits instead.
+
+Each stage admits at most ``workers + queue_size`` jobs. Anything beyond that
+is rejected immediately with StageSaturated, which main.py turns into a
+503 + Retry-After instead of letting requests pile up.
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from app.config import settings
+
+
+class StageSaturated(RuntimeError):
+    def __init__(self, stage: str, retry_after: int):
+        super().__init__(f"Pipeline stage '{stage}' is saturated")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class StageExecutor:
+    def __init__(self, name: str, workers: int, queue_size: int, retry_after: int = 1):
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.retry_after = retry_after
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"polyglot-{name}")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+
+    def _done(self, _future):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    async def run(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise StageSaturated(self.name, self.retry_after)
+
+        with self._lock:
+            self._pending += 1
+        # Carry contextvars (request-scoped state) into the worker thread.
+        ctx = contextvars.copy_context()
+        try:
+            future = self._pool.submit(ctx.run, partial(fn, *args, **kwargs))
+        except BaseException:
+            self._done(None)
+            raise
+        # The slot is freed when the thread finishes, not when the awaiting
+        # request goes away, so cancelled requests still count against capacity.
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "pending": self._pending,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+STAGES = ("decode", "stt", "db", "hash")
+
+_EXECUTORS: dict[str, StageExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _stage_workers(stage: str) -> int:
+    return getattr(settings, f"pipeline_{stage}_workers")
+
+
+def get_executor(stage: str) -> StageExecutor:
+    executor = _EXECUTORS.get(stage)
+    if executor is None:
+        if stage not in STAGES:
+            raise KeyError(f"Unknown pipeline stage: {stage}")
+        with _EXECUTORS_LOCK:
+            executor = _EXECUTORS.get(stage)
+            if executor is None:
+                executor = StageExecutor(
+                    stage,
+                    workers=_stage_workers(stage),
+                    queue_size=settings.pipeline_queue_size,
+                    retry_after=settings.pipeline_retry_after,
+                )
+                _EXECUTORS[stage] = executor
+    return executor
+
+
+async def run_stage(stage: str, fn, *args, **kwargs):
+    return await get_executor(stage).run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {name: executor.stats() for name, executor in list(_EXECUTORS.items())}
+
+
+def shutdown_executors():
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown()
@@ -1,13 +1,291 @@
 # app/utils/metrics.py
 
+"""
+In-process metric registry.
+
+Counters, gauges and histograms (optionally labelled) are updated in memory
+on the request path: a dict lookup and an add under a short lock. Values
+are cumulative for the process lifetime and are read two ways:
+
+- GET /metrics renders them in Prometheus text format (app.utils.prometheus).
+- A background flusher emits one log record per series every
+  TELEMETRY_FLUSH_INTERVAL seconds with the change since the previous flush,
+  so Application Insights gets aggregates instead of one line per event.
+
+Values that already live elsewhere (cache stats, executor depths, pool
+usage) are registered as collectors and read at scrape time.
+"""
+
+import bisect
 import logging
+import threading
 
 logger = logging.getLogger("polyglot")
 
+# Upper bounds (ms) for latency histograms; the last bucket is +Inf.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Label sets per metric beyond which new combinations are folded into "other".
+MAX_SERIES_PER_METRIC = 500
+OVERFLOW_LABEL = "other"
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+def _delta_histogram(now: dict, before: dict | None) -> dict:
+    if before is None:
+        return now
+    return {
+        "count": now["count"] - before["count"],
+        "sum": now["sum"] - before["sum"],
+        "buckets": {le: n - before["buckets"][le] for le, n in now["buckets"].items()},
+    }
+
+
+class MetricsRegistry:
+    def __init__(self, max_series: int = MAX_SERIES_PER_METRIC):
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._kinds: dict[str, str] = {}
+        self._help: dict[str, str] = {}
+        self._series: dict[str, dict[tuple, object]] = {}
+        self._collectors = []
+        self._last_flush: dict = {}
+
+    def _labels(self, name: str, labels: dict) -> tuple:
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(name, {})
+        if key not in series and len(series) >= self.max_series:
+            key = tuple((k, OVERFLOW_LABEL) for k, _ in key)
+        return key
+
+    def _declare(self, name: str, kind: str, help_text: str | None):
+        known = self._kinds.setdefault(name, kind)
+        if known != kind:
+            raise ValueError(f"Metric {name} is a {known}, not a {kind}")
+        if help_text:
+            self._help.setdefault(name, help_text)
+        return self._series.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1, help_text: str | None = None, **labels):
+        with self._lock:
+            series = self._declare(name, "counter", help_text)
+            key = self._labels(name, labels)
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, help_text: str | None = None, **labels):
+        with self._lock:
+            series = self._declare(name, "gauge", help_text)
+            series[self._labels(name, labels)] = value
+
+    def observe(self, name: str, value: float, help_text: str | None = None, **labels):
+        with self._lock:
+            series = self._declare(name, "histogram", help_text)
+            key = self._labels(name, labels)
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    def register_collector(self, collect):
+        """``collect()`` yields (kind, name, labels, value, help) tuples at read time."""
+        with self._lock:
+            if collect not in self._collectors:
+                self._collectors.append(collect)
+
+    def collect(self) -> list[dict]:
+        """Every series as {name, kind, help, labels, value}; histograms as snapshot dicts."""
+        with self._lock:
+            out = [
+                {
+                    "name": name,
+                    "kind": self._kinds[name],
+                    "help": self._help.get(name, ""),
+                    "labels": dict(key),
+                    "value": value.snapshot() if isinstance(value, Histogram) else value,
+                }
+                for name, series in self._series.items()
+                for key, value in series.items()
+            ]
+            collectors = list(self._collectors)
+        for collect in collectors:
+            try:
+                for kind, name, labels, value, help_text in collect():
+                    out.append(
+                        {
+                            "name": name,
+                            "kind": kind,
+                            "help": help_text,
+                            "labels": labels,
+                            "value": value,
+                        }
+                    )
+            except Exception:
+                logger.exception("Metric collector failed")
+        return out
+
+    def interval(self) -> list[dict]:
+        """Own series with counters/histograms reduced to the change since the last call."""
+        with self._lock:
+            rows = []
+            last = {}
+            for name, series in self._series.items():
+                kind = self._kinds[name]
+                for key, value in series.items():
+                    now = value.snapshot() if isinstance(value, Histogram) else value
+                    before = self._last_flush.get((name, key))
+                    last[(name, key)] = now
+                    if kind == "counter":
+                        now = now - (before or 0)
+                    elif kind == "histogram":
+                        now = _delta_histogram(now, before)
+                    rows.append({"name": name, "kind": kind, "labels": dict(key), "value": now})
+            self._last_flush = last
+            return rows
+
+    def reset(self):
+        with self._lock:
+            self._kinds.clear()
+            self._help.clear()
+            self._series.clear()
+            self._last_flush.clear()
+
+
+registry = MetricsRegistry()
+
+
+def flush_metrics():
+    """Emit one aggregated log record per series for the interval since the last flush."""
+    for row in registry.interval():
+        value = row["value"]
+        if row["kind"] == "histogram":
+            if not value["count"]:
+                continue
+            dims = dict(value)
+        elif row["kind"] == "counter":
+            if not value:
+                continue
+            dims = {"count": value}
+        else:
+            dims = {"value": value}
+        logger.info(row["name"], extra={"custom_dimensions": {**row["labels"], **dims}})
+
+
+class MetricsFlusher:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                flush_metrics()
+            except Exception:
+                logger.exception("Metric flush failed")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="polyglot-metrics", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the thread and flush whatever accumulated since the last interval."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        flush_metrics()
+
 
 def metric_caption_processed():
-    logger.info("metric_caption_processed", extra={"custom_dimensions": {"count": 1}})
+    registry.inc("polyglot_captions_processed_total", help_text="Captions stored")
 
 
 def metric_processing_time(ms: int):
-    logger.info("metric_processing_time_ms", extra={"custom_dimensions": {"ms": ms}})
+    registry.observe(
+        "polyglot_processing_time_ms", ms, help_text="End-to-end caption/translation time (ms)"
+    )
+
+
+def metric_stage_time(stage: str, ms: float, from_lang: str, to_lang: str):
+    registry.observe(
+        "polyglot_stage_duration_ms",
+        ms,
+        help_text="Pipeline stage time (ms) by language pair",
+        stage=stage,
+        from_lang=(from_lang or "auto").lower(),
+        to_lang=(to_lang or "").lower(),
+    )
+
+
+def metric_request(fields: dict):
+    """RequestLoggingMiddleware hook: latency per route template."""
+    registry.observe(
+        "polyglot_http_request_duration_ms",
+        fields["duration_ms"],
+        help_text="HTTP request latency (ms) by route",
+        route=fields["path"],
+        method=fields["method"],
+        status=str(fields["status_code"]),
+    )
+
+
+def metric_write_behind_batch(rows: int, depth: int, lag_ms: int):
+    registry.inc(
+        "polyglot_write_behind_rows_total", rows, help_text="Captions written by write-behind"
+    )
+    registry.set_gauge(
+        "polyglot_write_behind_queue_depth",
+        depth,
+        help_text="Write-behind rows waiting after a batch",
+    )
+    registry.observe(
+        "polyglot_write_behind_lag_ms",
+        lag_ms,
+        help_text="Enqueue-to-commit lag of write-behind batches",
+    )
+
+
+def metric_speech_config(reused: bool):
+    registry.inc(
+        "polyglot_speech_configs_total",
+        help_text="Speech config lookups by outcome",
+        result="reused" if reused else "created",
+    )
+
+
+def metric_speech_setup(kind: str, ms: float):
+    registry.observe(
+        "polyglot_speech_setup_ms",
+        ms,
+        help_text="Time to build a speech config or recognizer (ms)",
+        kind=kind,
+    )
+
+
+def metric_speech_wait(ms: float):
+    registry.observe(
+        "polyglot_speech_slot_wait_ms",
+        ms,
+        help_text="Wait for a per-region recognition slot (ms)",
+    )
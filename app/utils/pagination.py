@@ -0,0 +1,27 @@
+# app/utils/pagination.py
+
+import base64
+from datetime import datetime, timezone
+
+
+def to_naive_utc(value: datetime | None) -> datetime | None:
+    """CreatedAt is stored as naive UTC; bring aware datetimes (e.g. ...Z) onto that scale."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def encode_cursor(created_at: datetime, caption_id: int) -> str:
+    """Opaque keyset cursor for the (CreatedAt, Id) history ordering."""
+    raw = f"{created_at.isoformat()}|{caption_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, caption_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return to_naive_utc(datetime.fromisoformat(created_at)), int(caption_id)
+    except (ValueError, UnicodeDecodeError) as err:
+        raise ValueError("Invalid cursor") from err
@@ -0,0 +1,56 @@
+# app/utils/prometheus.py
+
+"""Prometheus text exposition (format 0.0.4) for app.utils.metrics.registry."""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict, extra: dict | None = None) -> str:
+    merged = {**labels, **(extra or {})}
+    if not merged:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in merged.items()) + "}"
+
+
+def _number(value) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _histogram_lines(name, labels, hist):
+    lines = []
+    cumulative = 0
+    for le, count in hist["buckets"].items():
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(labels, {'le': le})} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(hist['sum'])}")
+    lines.append(f"{name}_count{_labels(labels)} {hist['count']}")
+    return lines
+
+
+def render(series: list[dict]) -> str:
+    """Render MetricsRegistry.collect() output, grouping series under one HELP/TYPE."""
+    grouped: dict[str, list[dict]] = {}
+    for row in series:
+        grouped.setdefault(row["name"], []).append(row)
+
+    lines = []
+    for name, rows in grouped.items():
+        if rows[0]["help"]:
+            lines.append(f"# HELP {name} {rows[0]['help']}")
+        lines.append(f"# TYPE {name} {rows[0]['kind']}")
+        for row in rows:
+            if row["kind"] == "histogram":
+                lines.extend(_histogram_lines(name, row["labels"], row["value"]))
+            else:
+                lines.append(f"{name}{_labels(row['labels'])} {_number(row['value'])}")
+    return "\n".join(lines) + "\n"
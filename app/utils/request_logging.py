@@ -0,0 +1,80 @@
+# app/utils/request_logging.py
+
+"""
+Raw ASGI request logging.
+
+Unlike a BaseHTTPMiddleware, this wraps receive/send and never buffers or
+re-wraps the response, so streaming responses, background tasks and
+StaticFiles behave exactly as without it. Non-HTTP scopes (WebSockets,
+lifespan) are passed straight through.
+"""
+
+import logging
+import time
+
+# Used when no route matched (404s), so arbitrary URLs don't become log dimensions.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope, root_path: str = "") -> str:
+    """
+    Path template of the matched route (e.g. /api/captions/{caption_id}).
+    Routing fills in scope["route"]; mounted apps such as StaticFiles only
+    extend root_path, so their mount prefix (e.g. /static) is used instead.
+    """
+    route = scope.get("route")
+    if getattr(route, "path", None):
+        return route.path
+    mounted = scope.get("root_path", "")[len(root_path) :]
+    return mounted or UNMATCHED_ROUTE
+
+
+class RequestLoggingMiddleware:
+    def __init__(self, app, logger: logging.Logger | None = None, on_complete=None):
+        self.app = app
+        self.logger = logger
+        # Optional hook(fields) for metrics; called once per finished request.
+        self.on_complete = on_complete
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        sizes = {"request": 0, "response": 0}
+        status = 500  # reported if the app raises before starting a response
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            self._record(scope, root_path, status, sizes, start)
+
+    def _record(self, scope, root_path, status, sizes, start):
+        fields = {
+            "path": route_template(scope, root_path),
+            "method": scope["method"],
+            "status_code": status,
+            "request_bytes": sizes["request"],
+            "response_bytes": sizes["response"],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        if self.on_complete is not None:
+            self.on_complete(fields)
+        if self.logger is not None:
+            self.logger.info("Request received", extra={"custom_dimensions": fields})
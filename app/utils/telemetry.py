@@ -1,24 +1,161 @@
 import logging
+import logging.handlers
+import queue
+import random
+import threading
 
 from opencensus.ext.azure.log_exporter import AzureLogHandler
 from opencensus.ext.azure.trace_exporter import AzureExporter
 from opencensus.trace.samplers import ProbabilitySampler
 from opencensus.trace.tracer import Tracer
 
+from app.config import settings
+from app.utils.metrics import MetricsFlusher
 
-def setup_telemetry(connection_string: str | None):
+
+class RouteSampler(logging.Filter):
+    """
+    Keep a fraction of request log records per route. Records carry the route
+    in custom_dimensions["path"]; anything without one, and anything at
+    WARNING or above, is always kept.
+    """
+
+    def __init__(self, rates: dict, default: float = 1.0):
+        super().__init__()
+        self.rates = dict(rates)
+        self.default = default
+        self.sampled_out = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        dims = getattr(record, "custom_dimensions", None)
+        path = dims.get("path") if isinstance(dims, dict) else None
+        if path is None:
+            return True
+        rate = self.rates.get(path, self.default)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a SimpleQueue (no lock on put) with a soft size limit.
+    When the exporter falls behind, new records are dropped and counted
+    rather than blocking the request or growing memory.
+
+    prepare() is left cheap on purpose: message formatting happens on the
+    listener thread, not on the request path.
+    """
+
+    def __init__(self, max_size: int):
+        super().__init__(queue.SimpleQueue())
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class TelemetryPipeline:
+    """Request-side handler plus the listener thread that feeds the exporters."""
+
+    def __init__(self, exporters, max_size: int, sample_rates: dict, default_rate: float):
+        self.handler = BoundedQueueHandler(max_size)
+        self.sampler = RouteSampler(sample_rates, default_rate)
+        self.handler.addFilter(self.sampler)
+        self.exporters = list(exporters)
+        self.listener = logging.handlers.QueueListener(
+            self.handler.queue, *self.exporters, respect_handler_level=True
+        )
+
+    def start(self):
+        self.listener.start()
+
+    def stop(self):
+        # Hands everything already queued to the exporters before returning;
+        # AzureLogHandler ships its own buffer within its grace period at exit.
+        self.listener.stop()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.sampled_out,
+        }
+
+
+_pipeline: TelemetryPipeline | None = None
+_flusher: MetricsFlusher | None = None
+_lock = threading.Lock()
+
+
+def setup_telemetry(connection_string: str | None, exporters=None):
+    """
+    Route the "polyglot" logger through a bounded in-process queue. The Azure
+    exporter (itself batching) runs on the listener thread; ``exporters``
+    replaces it, e.g. with local handlers in tests. Aggregated metrics are
+    flushed into the same pipeline every TELEMETRY_FLUSH_INTERVAL seconds.
+    """
+    global _pipeline, _flusher
     logger = logging.getLogger("polyglot")
     logger.setLevel(logging.INFO)
 
-    if connection_string:
-        # Logs
-        handler = AzureLogHandler(connection_string=f"InstrumentationKey={connection_string}")
-        logger.addHandler(handler)
+    if exporters is None:
+        exporters = []
+        if connection_string:
+            # Logs
+            exporters.append(
+                AzureLogHandler(connection_string=f"InstrumentationKey={connection_string}")
+            )
 
-        # Tracing
-        Tracer(
-            exporter=AzureExporter(connection_string=f"InstrumentationKey={connection_string}"),
-            sampler=ProbabilitySampler(1.0),
-        )
+            # Tracing
+            Tracer(
+                exporter=AzureExporter(connection_string=f"InstrumentationKey={connection_string}"),
+                sampler=ProbabilitySampler(1.0),
+            )
+
+    with _lock:
+        if _pipeline is not None:
+            logger.removeHandler(_pipeline.handler)
+            _pipeline.stop()
+        _pipeline = None
+        if exporters:
+            _pipeline = TelemetryPipeline(
+                exporters,
+                max_size=settings.telemetry_queue_size,
+                sample_rates=settings.telemetry_sample_rates,
+                default_rate=settings.telemetry_default_sample_rate,
+            )
+            _pipeline.start()
+            logger.addHandler(_pipeline.handler)
+        if _flusher is None:
+            _flusher = MetricsFlusher(settings.telemetry_flush_interval)
+            _flusher.start()
 
     return logger
+
+
+def telemetry_stats():
+    return _pipeline.stats() if _pipeline is not None else None
+
+
+def shutdown_telemetry():
+    """Flush aggregated metrics, then drain the log queue; called on app shutdown."""
+    global _pipeline, _flusher
+    with _lock:
+        flusher, _flusher = _flusher, None
+        pipeline, _pipeline = _pipeline, None
+    if flusher is not None:
+        flusher.stop()
+    if pipeline is not None:
+        logging.getLogger("polyglot").removeHandler(pipeline.handler)
+        pipeline.stop()
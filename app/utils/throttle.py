@@ -0,0 +1,63 @@
+# app/utils/throttle.py
+
+"""
+Sliding-window attempt limiter used to stop login/register floods before
+they reach bcrypt. Each key (e.g. "user:alice", "ip:10.0.0.1") keeps the
+timestamps of its recent attempts; the number of tracked keys is bounded so
+a spray of random usernames cannot grow memory without limit.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class Throttled(RuntimeError):
+    def __init__(self, key: str, retry_after: int):
+        super().__init__(f"Too many attempts for {key}")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class SlidingWindowLimiter:
+    def __init__(self, limit: int, window: float, max_keys: int = 10000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, deque] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _recent(self, key: str, now: float) -> deque:
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        self._hits.move_to_end(key)
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        return hits
+
+    def check(self, key: str):
+        """Raise Throttled if ``key`` already used up its attempts in the window."""
+        if self.limit <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            hits = self._recent(key, now)
+            if len(hits) >= self.limit:
+                raise Throttled(key, max(1, math.ceil(hits[0] + self.window - now)))
+
+    def hit(self, key: str):
+        if self.limit <= 0:
+            return
+        with self._lock:
+            self._recent(key, time.monotonic()).append(time.monotonic())
+
+    def reset(self, key: str | None = None):
+        with self._lock:
+            if key is None:
+                self._hits.clear()
+            else:
+                self._hits.pop(key, None)
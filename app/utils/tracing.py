@@ -0,0 +1,122 @@
+# app/utils/tracing.py
+
+"""
+Lightweight in-process request tracing.
+
+A Trace is started per request and stored in a context variable, so code
+further down (e.g. the translation cache lookup in the translator service)
+can open spans without the trace being passed around. Spans are timed with
+perf_counter and carry the trace's attributes (the language pair) plus
+their own. When no trace is active, span() costs one context lookup.
+
+A finished trace feeds the per-stage latency histograms, and can be
+rendered as a Server-Timing header or a JSON breakdown when a client opts in.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Span:
+    __slots__ = ("name", "parent", "attributes", "offset_ms", "duration_ms")
+
+    def __init__(self, name: str, parent: str | None, attributes: dict, offset_ms: float):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.offset_ms = offset_ms
+        self.duration_ms = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "offset_ms": round(self.offset_ms, 2),
+            "duration_ms": round(self.duration_ms, 2),
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.spans: list[Span] = []
+        self._start = time.perf_counter()
+        self._stack: list[str] = []
+
+    def set_attributes(self, **attributes):
+        """Add attributes to the trace and to every span opened afterwards."""
+        self.attributes.update(attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        start = time.perf_counter()
+        span = Span(
+            name,
+            self._stack[-1] if self._stack else None,
+            {**self.attributes, **attributes},
+            (start - self._start) * 1000,
+        )
+        self._stack.append(name)
+        try:
+            yield span
+        finally:
+            self._stack.pop()
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            self.spans.append(span)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def breakdown(self) -> dict[str, float]:
+        """{"<span>_ms": duration} in the order spans started; repeated names add up."""
+        out: dict[str, float] = {}
+        for span in sorted(self.spans, key=lambda s: s.offset_ms):
+            key = f"{span.name}_ms"
+            out[key] = round(out.get(key, 0.0) + span.duration_ms, 2)
+        return out
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. ``stt;dur=412.3, total;dur=530.1``."""
+        parts = [f"{key.removesuffix('_ms')};dur={ms:.1f}" for key, ms in self.breakdown().items()]
+        parts.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "attributes": self.attributes,
+            "duration_ms": round(self.elapsed_ms(), 2),
+            "spans": [s.to_dict() for s in sorted(self.spans, key=lambda s: s.offset_ms)],
+        }
+
+
+_current: ContextVar[Trace | None] = ContextVar("polyglot_trace", default=None)
+
+
+@contextmanager
+def start_trace(name: str, **attributes):
+    """Make a new Trace current for the enclosed block (and tasks it creates)."""
+    trace = Trace(name, **attributes)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a span of the current trace; a no-op outside a trace."""
+    trace = _current.get()
+    if trace is None:
+        yield None
+        return
+    with trace.span(name, **attributes) as s:
+        yield s
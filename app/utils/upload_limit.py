@@ -0,0 +1,166 @@
+# app/utils/upload_limit.py
+
+"""
+Request body size limit, enforced while the body streams in.
+
+Every request body is capped at ``max_bytes``; upload routes (POST paths in
+``uploads``) get their own, larger cap. A declared Content-Length over the
+limit is answered with 413 before any of the body is read. Chunked or
+under-declared bodies are counted as the app receives them, and the receive
+call that crosses the limit raises UploadTooLarge. FastAPI re-raises
+HTTPExceptions from body parsing, so the client gets a 413 and the
+multipart parser stops spooling the upload.
+
+On upload routes the file part's own Content-Type header is read as it
+streams past, and a type that is plainly not audio raises UnsupportedUpload
+(415) the same way, before the file is spooled. Generic types are let
+through and sniffed by the route once the upload has arrived.
+"""
+
+import json
+
+from fastapi import HTTPException
+
+# Types that say nothing about the content; these uploads are sniffed instead.
+# audio/* and video/* (MediaRecorder webm/mp4) are trusted as declared.
+GENERIC_UPLOAD_TYPES = {"", "application/octet-stream", "binary/octet-stream"}
+
+# Part headers are short; a "header block" longer than this is not one.
+_MAX_PART_HEADER_BYTES = 8192
+
+
+class UploadTooLarge(HTTPException):
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds the {max_bytes} byte limit")
+
+
+class UnsupportedUpload(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=415, detail="Upload is not an audio file")
+
+
+def media_type(content_type: str | None) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def declared_non_audio(content_type: str | None) -> bool:
+    """True for a declared type that rules audio out (generic types are not decided here)."""
+    kind = media_type(content_type)
+    return not kind.startswith(("audio/", "video/")) and kind not in GENERIC_UPLOAD_TYPES
+
+
+def _header(scope, wanted: bytes) -> bytes | None:
+    for name, value in scope.get("headers", []):
+        if name == wanted:
+            return value
+    return None
+
+
+def _declared_length(scope) -> int | None:
+    value = _header(scope, b"content-length")
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class _PartTypeScanner:
+    """Finds the Content-Type header of one multipart field as the body streams past."""
+
+    def __init__(self, field: str):
+        self._marker = f'name="{field}"'.encode()
+        self._buf = b""
+        self.done = False
+
+    def feed(self, chunk: bytes) -> str | None:
+        """The field's declared type once its part headers are complete ("" if none), else None."""
+        self._buf += chunk
+        start = self._buf.find(self._marker)
+        if start < 0:
+            self._buf = self._buf[-len(self._marker) :]  # the marker may straddle chunks
+            return None
+        self._buf = self._buf[start:]
+        end = self._buf.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self._buf) > _MAX_PART_HEADER_BYTES:
+                self.done = True
+            return None
+        self.done = True
+        for line in self._buf[:end].split(b"\r\n")[1:]:
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-type":
+                return value.strip().decode("latin-1")
+        return ""
+
+
+class UploadLimitMiddleware:
+    def __init__(
+        self,
+        app,
+        max_bytes: int,
+        uploads: dict[str, int] | None = None,
+        upload_field: str = "audio",
+    ):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.uploads = uploads or {}
+        self.upload_field = upload_field
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes, scanner = self._limits(scope)
+        if not max_bytes and scanner is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = _declared_length(scope)
+        if max_bytes and declared is not None and declared > max_bytes:
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received += len(body)
+                if max_bytes and received > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                if scanner is not None and not scanner.done:
+                    declared_type = scanner.feed(body)
+                    if declared_type is not None and declared_non_audio(declared_type):
+                        raise UnsupportedUpload()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _limits(self, scope) -> tuple[int, _PartTypeScanner | None]:
+        """The body cap for this request, and a part-type scanner for multipart uploads."""
+        if scope["method"] != "POST" or scope["path"] not in self.uploads:
+            return self.max_bytes, None
+        content_type = (_header(scope, b"content-type") or b"").decode("latin-1")
+        if media_type(content_type) != "multipart/form-data":
+            return self.uploads[scope["path"]], None
+        return self.uploads[scope["path"]], _PartTypeScanner(self.upload_field)
+
+    async def _reject(self, send, max_bytes: int):
+        body = json.dumps({"detail": UploadTooLarge(max_bytes).detail}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
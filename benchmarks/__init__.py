@@ -0,0 +1 @@
+"""Microbenchmarks for hot paths. Run modules directly, e.g. ``python -m benchmarks.jwt_decode``."""
@@ -0,0 +1,54 @@
+"""
+Per-request JWT verification cost: python-jose vs PyJWT, and the cached
+path used by app.utils.auth.get_current_user_from_token.
+
+    python -m benchmarks.jwt_decode [--number 20000]
+
+python-jose is optional; its row is skipped when it is not installed.
+"""
+
+import argparse
+import timeit
+from datetime import timedelta
+
+import jwt as pyjwt
+
+from app.config import settings
+from app.utils import auth
+
+
+def _bench(fn, number):
+    # Best of 5 runs, reported in microseconds per call.
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    token = auth.create_access_token({"sub": "bench"}, timedelta(hours=1))
+    key, algs = settings.SECRET_KEY, [settings.ALGORITHM]
+
+    cases = {"pyjwt decode": lambda: pyjwt.decode(token, key, algorithms=algs)}
+    try:
+        from jose import jwt as jose_jwt
+
+        cases["jose decode"] = lambda: jose_jwt.decode(token, key, algorithms=algs)
+    except ImportError:
+        print("python-jose not installed; skipping")
+
+    def cold():
+        auth.token_cache.clear()
+        auth.get_current_user_from_token(token)
+
+    cases["auth uncached"] = cold
+    auth.get_current_user_from_token(token)
+    cases["auth cached"] = lambda: auth.get_current_user_from_token(token)
+
+    for name, fn in cases.items():
+        print(f"{name:<16} {_bench(fn, args.number):8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+End-to-end load benchmark against app.main:app with local fakes.
+
+    python -m benchmarks.load [--requests 2000] [--concurrency 32]
+        [--mix captions=3,manual=3,history=3,login=1]
+        [--stt-ms 300] [--decode-ms 20] [--translate-ms 80] [--db-ms 5]
+        [--output benchmarks/results/load.json]
+
+The app runs in-process (httpx ASGI transport, lifespan included). Audio
+decode, STT, the Translator HTTP call and every DB function are replaced by
+fakes that sleep for the configured latency, so the numbers reflect our own
+pipeline (executors, cache, coalescing, middleware) rather than Azure.
+Translation goes through the real cache and single-flight path. bcrypt runs
+for real at a low work factor.
+
+The report (throughput, status codes and p50/p95/p99 per route) is printed
+and written as JSON together with the git commit, so runs can be diffed
+across commits. 503s on captions are the stage executors shedding load
+(PIPELINE_* settings), not failures of the fakes.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from app.config import settings
+from app.db import db
+from app.main import app
+from app.routers import auth as auth_router
+from app.routers import caption as caption_router
+from app.routers import manual as manual_router
+from app.services import translator_azure
+from app.services.translation_cache import get_translation_cache
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MIX = "captions=3,manual=3,history=3,login=1"
+PHRASES = ["hello world", "good morning", "where is the station", "thank you", "see you soon"]
+LANG_PAIRS = [("en", "es"), ("en", "fr"), ("es", "en"), ("fr", "de")]
+
+# DB functions each router imported by name, so every call site gets the fake.
+DB_FUNCTIONS = {
+    caption_router: (
+        "insert_caption_entry",
+        "fetch_captions",
+        "update_caption_entry",
+        "delete_caption_entry",
+        "insert_caption_entries",
+        "update_caption_entries",
+        "delete_caption_entries",
+    ),
+    manual_router: ("insert_caption_entry",),
+    auth_router: ("get_user_by_username", "create_user", "update_user_password"),
+}
+
+
+def _slow(fn, seconds):
+    def wrapper(*args, **kwargs):
+        time.sleep(seconds)
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def _patched(patches):
+    """Apply (obj, attr, value) patches and restore them afterwards."""
+    originals = [(obj, attr, getattr(obj, attr)) for obj, attr, _ in patches]
+    try:
+        for obj, attr, value in patches:
+            setattr(obj, attr, value)
+        yield
+    finally:
+        for obj, attr, value in reversed(originals):
+            setattr(obj, attr, value)
+
+
+@contextmanager
+def fake_backends(decode_ms, stt_ms, translate_ms, db_ms):
+    def fake_decode(audio_bytes):
+        time.sleep(decode_ms / 1000)
+        return b"\0" * 3200
+
+    def fake_transcribe(audio_bytes, from_lang, pcm=None):
+        time.sleep(stt_ms / 1000)
+        return random.choice(PHRASES)
+
+    async def fake_post_translation(request, text):
+        await asyncio.sleep(translate_ms / 1000)
+        return f"[{request[1]['to'][0]}] {text}"
+
+    patches = [
+        (caption_router, "decode_audio", fake_decode),
+        (caption_router, "azure_transcribe", fake_transcribe),
+        (translator_azure, "_post_translation", fake_post_translation),
+        # Any key/endpoint makes the translator take the cached, coalesced path.
+        (settings, "azure_translator_key", "bench"),
+        (settings, "azure_translator_endpoint", "http://translator.invalid"),
+        (settings, "bcrypt_rounds", 4),
+        (auth_router.ip_attempts, "limit", 0),
+        (auth_router.user_failures, "limit", 0),
+    ]
+    for module, names in DB_FUNCTIONS.items():
+        patches += [(module, n, _slow(getattr(db, n), db_ms / 1000)) for n in names]
+
+    get_translation_cache().clear()
+    with _patched(patches):
+        yield
+
+
+def _audio_payload() -> bytes:
+    sample = REPO_ROOT / "hello_ex.mp3"
+    return sample.read_bytes() if sample.exists() else random.randbytes(48 * 1024)
+
+
+class Scenario:
+    def __init__(self, client: httpx.AsyncClient, token: str, username: str, password: str):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.username = username
+        self.password = password
+        self.audio = _audio_payload()
+
+    async def captions(self):
+        from_lang, to_lang = random.choice(LANG_PAIRS)
+        return await self.client.post(
+            "/api/captions",
+            headers=self.headers,
+            files={"audio": ("hello_ex.mp3", self.audio, "audio/mpeg")},
+            data={"from_lang": from_lang, "to_lang": to_lang},
+        )
+
+    async def manual(self):
+        from_lang, to_lang = random.choice(LANG_PAIRS)
+        return await self.client.post(
+            "/api/manual/translate",
+            headers=self.headers,
+            json={"text": random.choice(PHRASES), "from_lang": from_lang, "to_lang": to_lang},
+        )
+
+    async def history(self):
+        return await self.client.get("/api/captions?limit=25", headers=self.headers)
+
+    async def login(self):
+        return await self.client.post(
+            "/api/auth/login", json={"username": self.username, "password": self.password}
+        )
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Scenario, name.strip()):
+            raise ValueError(f"Unknown scenario: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples: dict[str, list], elapsed: float) -> dict:
+    routes = {}
+    for name, rows in samples.items():
+        latencies = sorted(ms for ms, _ in rows)
+        statuses = Counter(str(status) for _, status in rows)
+        errors = sum(n for status, n in statuses.items() if int(status) >= 400)
+        routes[name] = {
+            "requests": len(rows),
+            "errors": errors,
+            "status": dict(sorted(statuses.items())),
+            "throughput_rps": round(len(rows) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(r["errors"] for r in routes.values()),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+async def run_load(total: int, concurrency: int, mix: dict[str, float]) -> dict:
+    username, password = f"bench-{random.getrandbits(32):x}", "bench-password"
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post(
+                "/api/auth/register", json={"username": username, "password": password}
+            )
+            resp = await client.post(
+                "/api/auth/login", json={"username": username, "password": password}
+            )
+            resp.raise_for_status()
+            scenario = Scenario(client, resp.json()["access_token"], username, password)
+
+            names, weights = list(mix), list(mix.values())
+            plan = iter(random.choices(names, weights=weights, k=total))
+            samples: dict[str, list] = {name: [] for name in names}
+
+            async def worker():
+                for name in plan:
+                    start = time.perf_counter()
+                    try:
+                        status = (await getattr(scenario, name)()).status_code
+                    except httpx.HTTPError:
+                        status = 599
+                    samples[name].append(((time.perf_counter() - start) * 1000, status))
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return summarize(samples, time.perf_counter() - start)
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--decode-ms", type=float, default=20)
+    parser.add_argument("--stt-ms", type=float, default=300)
+    parser.add_argument("--translate-ms", type=float, default=80)
+    parser.add_argument("--db-ms", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks/results/load.json")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    mix = parse_mix(args.mix)
+    with fake_backends(args.decode_ms, args.stt_ms, args.translate_ms, args.db_ms):
+        report = asyncio.run(run_load(args.requests, args.concurrency, mix))
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        **report,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+
+    print(f"{'route':<10} {'req':>6} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, r in report["routes"].items():
+        print(
+            f"{name:<10} {r['requests']:>6} {r['errors']:>5} {r['throughput_rps']:>8.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        )
+    print(f"total: {report['requests']} requests, {report['throughput_rps']} req/s -> {output}")
+
+
+if __name__ == "__main__":
+    main()
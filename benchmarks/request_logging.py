@@ -0,0 +1,89 @@
+"""
+Requests/sec through a minimal FastAPI app with no logging middleware, the
+previous BaseHTTPMiddleware-based logger, and RequestLoggingMiddleware.
+
+    python -m benchmarks.request_logging [--requests 5000] [--concurrency 20]
+
+Requests go through httpx's in-process ASGI transport, so the numbers show
+middleware overhead only (no sockets). Log records go to a NullHandler.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.utils.request_logging import RequestLoggingMiddleware
+
+logger = logging.getLogger("polyglot.bench")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+logger.setLevel(logging.INFO)
+
+
+class LegacyLogAllRequestsMiddleware(BaseHTTPMiddleware):
+    """The middleware app/main.py used before RequestLoggingMiddleware."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        logger.info(
+            "Request received",
+            extra={
+                "custom_dimensions": {
+                    "path": request.url.path,
+                    "method": request.method,
+                    "status_code": response.status_code,
+                }
+            },
+        )
+        return response
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id, "text": "x" * 256}
+
+    if variant == "base_http":
+        app.add_middleware(LegacyLogAllRequestsMiddleware)
+    elif variant == "asgi":
+        app.add_middleware(RequestLoggingMiddleware, logger=logger)
+    return app
+
+
+async def _drive(app, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for n in remaining:
+                resp = await client.get(f"/api/items/{n}")
+                resp.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for variant in ("none", "base_http", "asgi"):
+        app = build_app(variant)
+        asyncio.run(_drive(app, 200, args.concurrency))  # warm-up
+        rps = asyncio.run(_drive(app, args.requests, args.concurrency))
+        print(f"{variant:<10} {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
-async function loadHistory() {
+const HISTORY_PAGE_SIZE = 25;
+
+// cursor: opaque value from the previous page's X-Next-Cursor header (null = first page)
+async function loadHistory(cursor = null) {
     const token = localStorage.getItem("jwt");
     if (!token) {
         window.location.href = "/";
@@ -6,22 +9,29 @@ async function loadHistory() {
     }
 
     try {
-        const res = await fetch("/api/captions", {
+        const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE });
+        if (cursor) params.set("cursor", cursor);
+
+        const res = await fetch(`/api/captions?${params}`, {
             headers: { "Authorization": `Bearer ${token}` }
         });
 
         if (!res.ok) throw new Error("Failed to fetch history");
 
         const items = await res.json();
+        const nextCursor = res.headers.get("X-Next-Cursor");
         const container = document.getElementById("historyList");
-        container.innerHTML = "";
+        document.getElementById("loadMoreBtn")?.remove();
+        if (!cursor) container.innerHTML = "";
 
-        if (!items || items.length === 0) {
+        if (!cursor && (!items || items.length === 0)) {
             container.innerHTML = "<p class=\"panel-copy\">No captions yet.</p>";
             return;
         }
 
-        localStorage.setItem("savedTranslationsCount", items.length);
+        if (!cursor && !nextCursor) {
+            localStorage.setItem("savedTranslationsCount", items.length);
+        }
 
         items.forEach(item => {
             const block = document.createElement("div");
@@ -46,6 +56,15 @@ async function loadHistory() {
             container.appendChild(block);
         });
 
+        if (nextCursor) {
+            const more = document.createElement("button");
+            more.id = "loadMoreBtn";
+            more.className = "btn btn--soft";
+            more.textContent = "Load more";
+            more.onclick = () => loadHistory(nextCursor);
+            container.appendChild(more);
+        }
+
         document.querySelectorAll(".edit-btn").forEach(btn => {
             btn.onclick = () => {
                 const card = btn.closest(".history-card");
@@ -1,6 +1,9 @@
 document.addEventListener("DOMContentLoaded", () => {
     let mediaRecorder;
     let audioChunks = [];
+    let socket = null;
+    let finalTranscripts = [];
+    let finalTranslations = [];
 
     const startBtn = document.getElementById("startBtn");
     const stopBtn = document.getElementById("stopBtn");
@@ -14,19 +17,105 @@ document.addEventListener("DOMContentLoaded", () => {
         return;
     }
 
+    function rememberSession() {
+        const fromValue = document.getElementById("fromLang").value;
+        const toValue = document.getElementById("toLang").value;
+        const pairLabel = `${fromValue.toUpperCase()} → ${toValue.toUpperCase()}`;
+        localStorage.setItem("preferredPair", pairLabel);
+
+        const now = new Date();
+        localStorage.setItem("lastSession", now.toISOString());
+        localStorage.setItem("lastSessionHuman", now.toLocaleString());
+    }
+
+    function resetButtons() {
+        startBtn.disabled = false;
+        stopBtn.disabled = true;
+    }
+
+    // Live captions over /ws/captions; resolves false if the socket can't open.
+    function openLiveSocket() {
+        const params = new URLSearchParams({
+            from_lang: document.getElementById("fromLang").value,
+            to_lang: document.getElementById("toLang").value
+        });
+        const scheme = window.location.protocol === "https:" ? "wss" : "ws";
+
+        return new Promise(resolve => {
+            let ws;
+            try {
+                ws = new WebSocket(`${scheme}://${window.location.host}/ws/captions?${params}`);
+            } catch (err) {
+                resolve(false);
+                return;
+            }
+
+            ws.onopen = () => {
+                // Authenticate inside the socket so the token stays out of URLs and logs.
+                ws.send(JSON.stringify({ type: "auth", token }));
+                socket = ws;
+                resolve(true);
+            };
+            ws.onerror = () => resolve(false);
+
+            ws.onmessage = event => {
+                const msg = JSON.parse(event.data);
+                if (msg.type === "partial") {
+                    originalEl.textContent = [...finalTranscripts, msg.transcript].join(" ");
+                    translatedEl.textContent = [...finalTranslations, msg.translated].join(" ");
+                } else if (msg.type === "final") {
+                    finalTranscripts.push(msg.transcript);
+                    finalTranslations.push(msg.translated);
+                    originalEl.textContent = finalTranscripts.join(" ");
+                    translatedEl.textContent = finalTranslations.join(" ");
+                } else if (msg.type === "done") {
+                    if (!finalTranscripts.length) {
+                        originalEl.textContent = "(no transcript)";
+                        translatedEl.textContent = "(no translation)";
+                    }
+                    rememberSession();
+                    statusEl.textContent = "Done ✅";
+                    ws.close();
+                }
+            };
+
+            ws.onclose = () => {
+                socket = null;
+                resetButtons();
+            };
+        });
+    }
+
     async function startRecording() {
         try {
             audioChunks = [];
+            finalTranscripts = [];
+            finalTranslations = [];
             originalEl.textContent = "";
             translatedEl.textContent = "";
 
             const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
             mediaRecorder = new MediaRecorder(stream, { mimeType: "audio/webm" });
 
-            mediaRecorder.ondataavailable = e => audioChunks.push(e.data);
-            mediaRecorder.onstop = sendAudioToBackend;
-
-            mediaRecorder.start();
+            const live = await openLiveSocket();
+
+            if (live) {
+                // Ship each chunk as soon as MediaRecorder emits it.
+                mediaRecorder.ondataavailable = e => {
+                    if (socket && e.data.size > 0) socket.send(e.data);
+                };
+                mediaRecorder.onstop = () => {
+                    stream.getTracks().forEach(track => track.stop());
+                    if (socket) socket.send(JSON.stringify({ type: "stop" }));
+                    statusEl.textContent = "Finishing…";
+                };
+                mediaRecorder.start(250);
+            } else {
+                // Fallback: record everything, then upload once.
+                mediaRecorder.ondataavailable = e => audioChunks.push(e.data);
+                mediaRecorder.onstop = sendAudioToBackend;
+                mediaRecorder.start();
+            }
 
             startBtn.disabled = true;
             stopBtn.disabled = false;
@@ -59,8 +148,7 @@ document.addEventListener("DOMContentLoaded", () => {
             if (!res.ok) {
                 const err = await res.json().catch(() => ({}));
                 statusEl.textContent = `Error: ${err.detail || res.statusText}`;
-                startBtn.disabled = false;
-                stopBtn.disabled = true;
+                resetButtons();
                 return;
             }
 
@@ -69,22 +157,14 @@ document.addEventListener("DOMContentLoaded", () => {
             originalEl.textContent = data.transcript || "(no transcript)";
             translatedEl.textContent = data.translated || "(no translation)";
 
-            const fromValue = document.getElementById("fromLang").value;
-            const toValue = document.getElementById("toLang").value;
-            const pairLabel = `${fromValue.toUpperCase()} → ${toValue.toUpperCase()}`;
-            localStorage.setItem("preferredPair", pairLabel);
-
-            const now = new Date();
-            localStorage.setItem("lastSession", now.toISOString());
-            localStorage.setItem("lastSessionHuman", now.toLocaleString());
+            rememberSession();
 
             statusEl.textContent = "Done ✅";
         } catch (error) {
             console.error("Upload failed:", error);
             statusEl.textContent = "Error uploading audio.";
         } finally {
-            startBtn.disabled = false;
-            stopBtn.disabled = true;
+            resetButtons();
         }
     }
 
@@ -1,9 +1,20 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.db import db
 from app.main import app
 from app.routers import caption as caption_router
 from app.routers import manual as manual_router
+from app.services import translator_azure
+from app.services.translation_cache import get_translation_cache
 
 # -------------------------------------------
 # AUTH OVERRIDE FOR TESTS
@@ -31,3 +42,172 @@ app.dependency_overrides[manual_router.get_current_user] = override_get_current_
 @pytest.fixture
 def client():
     return TestClient(app)
+
+
+# -------------------------------------------
+# LOCAL FAKE AZURE TRANSLATOR
+# -------------------------------------------
+
+
+class FakeTranslatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        query = parse_qs(urlparse(self.path).query)
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        self.server.requests.append(
+            {
+                "path": urlparse(self.path).path,
+                "query": query,
+                "texts": [item["text"] for item in body],
+                "peer": self.client_address,
+            }
+        )
+
+        out = [
+            {"translations": [{"text": f"[{to}] {item['text']}", "to": to} for to in query["to"]]}
+            for item in body
+        ]
+        payload = json.dumps(out).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        # GET /languages: the readiness probe
+        self.server.requests.append({"path": urlparse(self.path).path, "method": "GET"})
+        payload = b'{"translation": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_translator(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTranslatorHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    get_translation_cache().clear()
+    host, port = server.server_address
+    monkeypatch.setattr(translator_azure.settings, "azure_translator_key", "key")
+    monkeypatch.setattr(
+        translator_azure.settings, "azure_translator_endpoint", f"http://{host}:{port}/"
+    )
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+# -------------------------------------------
+# SQL CODE PATHS ON SQLITE
+# -------------------------------------------
+
+SQLITE_SCHEMA = """
+CREATE TABLE Users (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL UNIQUE,
+    HashedPassword TEXT NOT NULL
+);
+CREATE TABLE Captions (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Transcript TEXT NOT NULL,
+    TranslatedText TEXT NOT NULL,
+    FromLang TEXT NOT NULL,
+    ToLang TEXT NOT NULL,
+    ProcessingMs INTEGER NOT NULL,
+    SessionId TEXT NULL,
+    UserId TEXT NOT NULL,
+    CreatedAt TIMESTAMP NOT NULL,
+    ClientId TEXT NULL,
+    Segments TEXT NULL,
+    UNIQUE (UserId, ClientId)
+);
+"""
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Path of a sqlite database with the app schema, for driving the real SQL functions."""
+    sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+    sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+    path = tmp_path / "captions.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SQLITE_SCHEMA)
+    return path
+
+
+class _FailingCursor:
+    def __init__(self, cursor, failure):
+        self._cursor = cursor
+        self._failure = failure
+
+    def execute(self, sql, params=()):
+        if self._failure["prefix"] and sql.startswith(self._failure["prefix"]):
+            self._failure["countdown"] -= 1
+            if self._failure["countdown"] == 0:
+                raise sqlite3.OperationalError("injected failure")
+        return self._cursor.execute(sql, params)
+
+    def executemany(self, sql, seq):
+        for params in seq:
+            self.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _AutocommitConnection:
+    """sqlite3 behaving like the production pyodbc connections: autocommit unless switched off."""
+
+    def __init__(self, conn, failure):
+        self._conn = conn
+        self._failure = failure
+
+    @property
+    def autocommit(self):
+        return self._conn.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self._conn.isolation_level = None if value else ""
+
+    def cursor(self):
+        return _FailingCursor(self._conn.cursor(), self._failure)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@pytest.fixture
+def autocommit_db(sqlite_db):
+    """
+    Pool of autocommit sqlite connections as the SQL backend.
+    ``fail_on(prefix, nth)`` makes the nth statement starting with ``prefix`` raise.
+    """
+    failure = {"prefix": None, "countdown": 0}
+
+    def factory():
+        conn = sqlite3.connect(
+            sqlite_db,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+        )
+        return _AutocommitConnection(conn, failure)
+
+    def fail_on(prefix, nth):
+        failure.update(prefix=prefix, countdown=nth)
+
+    pool = db.configure_pool(factory, dialect="sqlite", max_size=1)
+    yield SimpleNamespace(pool=pool, fail_on=fail_on)
+    db.close_pool()
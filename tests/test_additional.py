@@ -1,4 +1,5 @@
 import asyncio
+import subprocess
 from datetime import timedelta
 from pathlib import Path
 from unittest.mock import patch
@@ -32,24 +33,53 @@ def test_jwt_tokens_invalid():
 # ---------------------------------------------------------------------------
 
 
-def test_convert_webm_to_wav_uses_ffmpeg(monkeypatch):
-    created = {}
+def test_decode_to_pcm_streams_through_pipes(monkeypatch):
+    captured = {}
+
+    def fake_run(cmd, input=None, capture_output=False, check=False):
+        captured["cmd"] = cmd
+        captured["input"] = input
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"\x00\x01" * 4, stderr=b"")
+
+    monkeypatch.setattr(stt_azure.subprocess, "run", fake_run)
+
+    pcm = stt_azure.decode_to_pcm(b"abc")
+    assert pcm == b"\x00\x01" * 4
+    assert captured["input"] == b"abc"
+    assert captured["cmd"][captured["cmd"].index("-i") + 1] == "pipe:0"
+    assert captured["cmd"][-1] == "pipe:1"
+    assert "16000" in captured["cmd"]
+
+
+def test_decode_to_pcm_falls_back_to_temp_file_and_cleans_up(monkeypatch):
+    seen = {}
+
+    def fake_run(cmd, input=None, capture_output=False, check=False):
+        src = cmd[cmd.index("-i") + 1]
+        if src == "pipe:0":
+            raise subprocess.CalledProcessError(1, cmd, stderr=b"moov atom not found")
+        seen["src"] = Path(src)
+        assert seen["src"].read_bytes() == b"mp4 bytes"
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"pcm", stderr=b"")
+
+    monkeypatch.setattr(stt_azure.subprocess, "run", fake_run)
+
+    assert stt_azure.decode_to_pcm(b"mp4 bytes") == b"pcm"
+    assert not seen["src"].exists()
+
+
+def test_decode_to_pcm_removes_temp_file_on_failure(monkeypatch):
+    seen = {}
 
-    def fake_run(cmd, capture_output, check):
-        # mimic ffmpeg creating the wav file
-        src = Path(cmd[3])
-        dst = Path(cmd[4])
-        created["src"] = src
-        created["dst"] = dst
-        dst.write_bytes(b"RIFF")
-        src.unlink(missing_ok=True)
+    def fake_run(cmd, input=None, capture_output=False, check=False):
+        seen["src"] = Path(cmd[cmd.index("-i") + 1])
+        raise subprocess.CalledProcessError(1, cmd, stderr=b"invalid data")
 
     monkeypatch.setattr(stt_azure.subprocess, "run", fake_run)
 
-    wav_path = Path(stt_azure.convert_webm_to_wav(b"abc"))
-    assert wav_path.exists()
-    assert created["dst"] == wav_path
-    wav_path.unlink(missing_ok=True)
+    with pytest.raises(subprocess.CalledProcessError):
+        stt_azure.decode_to_pcm(b"garbage")
+    assert not seen["src"].exists()
 
 
 def test_azure_transcribe_falls_back_to_stub(monkeypatch):
@@ -203,8 +203,17 @@ def test_health_basic():
     assert r.json()["status"] == "ok"
 
 
-@patch("app.routers.health.requests.get", side_effect=Exception("fail"))
-def test_health_ready(mocked):
-    r = client.get("/api/ready")
+def test_health_ready(monkeypatch):
+    from app.services.health import health_monitor
+
+    async def failing_check():
+        raise Exception("fail")
+
+    monkeypatch.setattr(health_monitor, "failure_threshold", 1)
+    health_monitor.register("flaky", failing_check)
+    try:
+        r = client.get("/api/ready")
+    finally:
+        health_monitor.unregister("flaky")
     assert r.status_code == 200
     assert r.json()["ready"] is False
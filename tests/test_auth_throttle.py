@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.db import db
+from app.main import app
+from app.routers import auth as auth_router
+from app.services import passwords as pw
+from app.utils import client_ip as client_ip_module
+from app.utils.client_ip import client_ip
+from app.utils.throttle import SlidingWindowLimiter, Throttled
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    auth_router.ip_attempts.reset()
+    auth_router.user_failures.reset()
+    yield
+    auth_router.ip_attempts.reset()
+    auth_router.user_failures.reset()
+
+
+@pytest.fixture
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(pw.settings, "bcrypt_rounds", 4)
+
+
+def _login(client, username, password):
+    return client.post("/api/auth/login", json={"username": username, "password": password})
+
+
+def test_sliding_window_limiter():
+    limiter = SlidingWindowLimiter(limit=2, window=30)
+    for _ in range(2):
+        limiter.check("k")
+        limiter.hit("k")
+    with pytest.raises(Throttled) as err:
+        limiter.check("k")
+    assert 1 <= err.value.retry_after <= 30
+    limiter.check("other")
+    limiter.reset("k")
+    limiter.check("k")
+
+
+def test_failed_logins_lock_the_username_before_hashing(client, fast_bcrypt, monkeypatch):
+    monkeypatch.setattr(auth_router.user_failures, "limit", 3)
+    name = f"u-{uuid.uuid4().hex}"
+    db.create_user(name, pw.hash_password("right"))
+
+    with patch("app.routers.auth.pw.verify_password", return_value=False) as verify:
+        assert [_login(client, name, "wrong").status_code for _ in range(3)] == [401] * 3
+        resp = _login(client, name, "wrong")
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert verify.call_count == 3  # the throttled attempt never reached bcrypt
+
+
+def test_parallel_wrong_passwords_cannot_outrun_the_user_limit(fast_bcrypt, monkeypatch):
+    monkeypatch.setattr(auth_router.user_failures, "limit", 3)
+    name = f"u-{uuid.uuid4().hex}"
+    db.create_user(name, pw.hash_password("right"))
+    verified = []
+    lock = threading.Lock()
+
+    def slow_verify(password, hashed):
+        with lock:
+            verified.append(password)
+        time.sleep(0.05)
+        return False
+
+    async def burst():
+        req = auth_router.LoginRequest(username=name, password="wrong")
+        calls = [auth_router.login(req, _request("203.0.113.9")) for _ in range(8)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    with patch("app.routers.auth.pw.verify_password", side_effect=slow_verify):
+        results = asyncio.run(burst())
+
+    codes = sorted(r.status_code for r in results if isinstance(r, HTTPException))
+    assert codes == [401] * 3 + [429] * 5
+    assert len(verified) == 3
+
+
+def _request(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 50000), "headers": headers})
+
+
+def test_client_ip_uses_forwarded_for_only_from_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(client_ip_module.settings, "trusted_proxies", "")
+    assert client_ip(_request("10.0.0.5", "198.51.100.7")) == "10.0.0.5"
+
+    monkeypatch.setattr(client_ip_module.settings, "trusted_proxies", "10.0.0.0/8, 169.254.0.1")
+    # A spoofed left-most entry is ignored: the proxy appended the real peer on the right.
+    assert client_ip(_request("10.0.0.5", "1.1.1.1, 198.51.100.7:61234")) == "198.51.100.7"
+    assert client_ip(_request("169.254.0.1", "203.0.113.4, 10.1.2.3")) == "203.0.113.4"
+    assert client_ip(_request("10.0.0.5", "[2001:db8::1]:443")) == "2001:db8::1"
+    # An untrusted peer cannot pick its own address.
+    assert client_ip(_request("198.51.100.7", "1.1.1.1")) == "198.51.100.7"
+    assert client_ip(_request("10.0.0.5", "not-an-ip")) == "10.0.0.5"
+
+
+def test_ip_limit_is_per_forwarded_client(fast_bcrypt, monkeypatch):
+    monkeypatch.setattr(client_ip_module.settings, "trusted_proxies", "10.0.0.0/8")
+    monkeypatch.setattr(auth_router.ip_attempts, "limit", 1)
+    client = TestClient(app, client=("10.0.0.5", 50000))  # behind the front end
+
+    def register(ip):
+        body = {"username": f"u-{uuid.uuid4().hex}", "password": "pw"}
+        return client.post("/api/auth/register", json=body, headers={"X-Forwarded-For": ip})
+
+    assert register("198.51.100.1").status_code == 200
+    assert register("198.51.100.2").status_code == 200
+    assert register("198.51.100.1").status_code == 429
+
+
+def test_successful_login_clears_failures(client, fast_bcrypt, monkeypatch):
+    monkeypatch.setattr(auth_router.user_failures, "limit", 2)
+    name = f"u-{uuid.uuid4().hex}"
+    db.create_user(name, pw.hash_password("right"))
+
+    assert _login(client, name, "wrong").status_code == 401
+    assert _login(client, name, "right").status_code == 200
+    assert _login(client, name, "wrong").status_code == 401
+    assert _login(client, name, "right").status_code == 200
+
+
+def test_ip_flood_is_rejected_on_register(client, fast_bcrypt, monkeypatch):
+    monkeypatch.setattr(auth_router.ip_attempts, "limit", 2)
+    codes = [
+        client.post(
+            "/api/auth/register", json={"username": f"u-{uuid.uuid4().hex}", "password": "pw"}
+        ).status_code
+        for _ in range(3)
+    ]
+    assert codes == [200, 200, 429]
+
+
+def test_login_rehashes_when_work_factor_changes(client, fast_bcrypt):
+    name = f"u-{uuid.uuid4().hex}"
+    db.create_user(name, pw.hash_password("secret", rounds=5))
+
+    assert _login(client, name, "secret").status_code == 200
+    stored = db.get_user_by_username(name)["HashedPassword"]
+    assert pw.hash_rounds(stored) == 4
+    assert pw.verify_password("secret", stored)
+
+
+def test_needs_rehash_ignores_foreign_hashes(fast_bcrypt):
+    assert pw.needs_rehash(pw.hash_password("x", rounds=5))
+    assert not pw.needs_rehash(pw.hash_password("x"))
+    assert not pw.needs_rehash("not-a-bcrypt-hash")
@@ -1,5 +1,10 @@
+import time
 from datetime import timedelta
 
+import pytest
+from fastapi import HTTPException
+
+from app.utils import auth
 from app.utils.auth import create_access_token, get_current_user_from_token
 
 
@@ -7,3 +12,37 @@ def test_token_roundtrip():
     token = create_access_token({"sub": "testuser"}, timedelta(hours=1))
     user = get_current_user_from_token(token)
     assert user == "testuser"
+
+
+def test_verified_tokens_are_cached_until_exp(monkeypatch):
+    auth.token_cache.clear()
+    token = create_access_token({"sub": "cached"}, timedelta(hours=1))
+    calls = []
+    real_decode = auth.jwt.decode
+    monkeypatch.setattr(
+        auth.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw)
+    )
+
+    assert get_current_user_from_token(token) == "cached"
+    assert get_current_user_from_token(token) == "cached"
+    assert len(calls) == 1
+
+    # An entry past its exp is dropped and the token is verified again.
+    auth.token_cache.set(token, "cached", time.time() - 1)
+    assert get_current_user_from_token(token) == "cached"
+    assert len(calls) == 2
+
+
+def test_token_cache_is_bounded_and_rejects_tampering():
+    cache = auth.VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    for name in ("a", "b", "c"):
+        cache.set(f"token-{name}", name, exp)
+    assert len(cache) == 2
+    assert cache.get("token-a") is None and cache.get("token-c") == "c"
+
+    auth.token_cache.clear()
+    token = create_access_token({"sub": "victim"}, timedelta(hours=1))
+    get_current_user_from_token(token)
+    with pytest.raises(HTTPException):
+        get_current_user_from_token(token[:-2] + ("AA" if token[-2:] != "AA" else "BB"))
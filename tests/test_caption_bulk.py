@@ -0,0 +1,88 @@
+from fastapi.testclient import TestClient
+
+from app.db import db
+from app.main import app
+from app.routers import caption as caption_router
+
+
+def _item(n):
+    return {"transcript": f"t{n}", "translated_text": f"x{n}", "from_lang": "en", "to_lang": "fr"}
+
+
+def test_bulk_create_returns_ids_in_order(client):
+    resp = client.post("/api/captions/bulk", json={"items": [_item(n) for n in range(5)]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 5
+    ids = [r["id"] for r in body["results"]]
+    assert [r["index"] for r in body["results"]] == list(range(5))
+    assert ids == sorted(ids)
+
+    stored = {r["Id"]: r["Transcript"] for r in db.fetch_captions(user_id="testuser")}
+    assert [stored[i] for i in ids] == [f"t{n}" for n in range(5)]
+
+
+def test_bulk_update_and_delete_report_each_item(client):
+    ids = [
+        r["id"]
+        for r in client.post("/api/captions/bulk", json={"items": [_item(1), _item(2)]}).json()[
+            "results"
+        ]
+    ]
+    foreign = db.insert_caption_entry("t", "x", "en", "fr", 0, user_id="someone-else")
+
+    resp = client.put(
+        "/api/captions/bulk",
+        json={
+            "items": [
+                {"id": ids[0], "translated_text": "new"},
+                {"id": foreign, "translated_text": "no"},
+            ]
+        },
+    )
+    assert resp.json() == {
+        "updated": 1,
+        "results": [{"id": ids[0], "status": "updated"}, {"id": foreign, "status": "not_found"}],
+    }
+
+    resp = client.request("DELETE", "/api/captions/bulk", json={"ids": [ids[1], foreign]})
+    assert resp.json()["deleted"] == 1
+    assert [r["status"] for r in resp.json()["results"]] == ["deleted", "not_found"]
+    assert db.fetch_captions(user_id="someone-else")
+
+
+def test_bulk_limits_are_validated(client):
+    assert client.post("/api/captions/bulk", json={"items": []}).status_code == 422
+    assert (
+        client.request("DELETE", "/api/captions/bulk", json={"ids": list(range(1001))}).status_code
+        == 422
+    )
+
+
+def test_bulk_client_ids_are_unique_per_user(client):
+    other = {**_item(1), "processing_ms": 0, "user_id": "someone-else", "client_id": "shared"}
+    db.insert_caption_entries([other])
+    items = [{**_item(1), "client_id": "shared"}, {**_item(2), "client_id": "mine"}]
+    assert client.post("/api/captions/bulk", json={"items": items}).status_code == 200
+
+    repeated = [{**_item(3), "client_id": "again"}, {**_item(4), "client_id": "again"}]
+    assert client.post("/api/captions/bulk", json={"items": repeated}).status_code == 422
+
+    resp = client.post(
+        "/api/captions/bulk", json={"items": [{**_item(5), "client_id": "new"}, items[1]]}
+    )
+    assert resp.status_code == 409
+    stored = {r["ClientId"] for r in db.fetch_captions(user_id="testuser")}
+    assert {"mine", "shared"} <= stored
+    assert not {"again", "new"} & stored  # rejected batches leave nothing behind
+
+
+def test_bulk_client_id_conflict_on_sql_is_a_409(autocommit_db, monkeypatch):
+    monkeypatch.setattr(caption_router, "insert_caption_entries", db._real_insert_caption_entries)
+    client = TestClient(app)
+    first = [{**_item(1), "client_id": "c1"}]
+    assert client.post("/api/captions/bulk", json={"items": first}).status_code == 200
+
+    batch = [{**_item(2), "client_id": "c2"}, *first]
+    assert client.post("/api/captions/bulk", json={"items": batch}).status_code == 409
+    assert [r["ClientId"] for r in db._real_fetch_captions(user_id="testuser")] == ["c1"]
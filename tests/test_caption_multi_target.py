@@ -0,0 +1,117 @@
+import math
+from array import array
+from io import BytesIO
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.db import db
+from app.db.db import memory_store
+from app.main import app
+from app.routers import caption as caption_router
+from app.services import stt_longform
+
+
+def _post(client, to_lang, **data):
+    file = ("audio", BytesIO(b"OggS speech"), "audio/ogg")
+    return client.post(
+        "/api/captions", files={"audio": file}, data={"from_lang": "en", "to_lang": to_lang, **data}
+    )
+
+
+def test_one_transcription_and_one_translator_call_for_all_targets(client, fake_translator):
+    with (
+        patch("app.routers.caption.decode_audio", return_value=bytes(16 * 2 * 2000)),
+        patch("app.routers.caption.azure_transcribe", return_value="good morning") as stt,
+    ):
+        resp = _post(client, ["es", "fr,de", "fr"])
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert stt.call_count == 1
+    assert len(fake_translator.requests) == 1
+    assert fake_translator.requests[0]["query"]["to"] == ["es", "fr", "de"]
+
+    assert body["translated"] == "[es] good morning"
+    assert [(t["to_lang"], t["translated"]) for t in body["translations"]] == [
+        ("es", "[es] good morning"),
+        ("fr", "[fr] good morning"),
+        ("de", "[de] good morning"),
+    ]
+    assert body["id"] == body["translations"][0]["id"]
+    assert body["segments"][0]["translations"]["de"] == "[de] good morning"
+
+    rows = [memory_store.get_caption(t["id"], "testuser") for t in body["translations"]]
+    assert [r["ToLang"] for r in rows] == ["es", "fr", "de"]
+    assert {r["SessionId"] for r in rows} == {body["session_id"]}
+    assert all(r["Transcript"] == "good morning" and r["Segments"] for r in rows)
+
+    fr = body["translations"][1]["id"]
+    srt = client.get(f"/api/captions/{fr}/subtitles")
+    assert srt.status_code == 200
+    assert "[fr] good morning" in srt.text
+
+
+@patch("app.routers.caption.azure_transcribe", return_value="hello")
+@patch("app.routers.caption.azure_translate_async", return_value="hola")
+def test_single_target_response_is_unchanged(mock_translate, mock_transcribe, client):
+    resp = _post(client, "es")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["translated"] == "hola"
+    assert "translations" not in body and "session_id" not in body
+    assert memory_store.get_caption(body["id"], "testuser")["SessionId"] is None
+
+
+def test_linked_rows_are_stored_all_or_nothing(autocommit_db, monkeypatch):
+    # Real SQL insert on autocommit connections, one row per statement,
+    # failing on the second target's row.
+    monkeypatch.setattr(caption_router, "insert_caption_entries", db._real_insert_caption_entries)
+    monkeypatch.setattr(db, "_MAX_PARAMS", len(db._INSERT_COLUMNS))
+    autocommit_db.fail_on("INSERT", 2)
+
+    with patch("app.routers.caption.azure_transcribe", return_value="hello"):
+        resp = _post(TestClient(app, raise_server_exceptions=False), ["es", "fr", "de"])
+
+    assert resp.status_code == 500
+    assert db._real_fetch_captions(user_id="testuser") == []
+
+
+def test_invalid_target_lists_are_rejected(client):
+    assert _post(client, " , ").status_code == 400
+    resp = _post(client, ",".join(f"l{i}" for i in range(11)))
+    assert resp.status_code == 400
+    assert "At most 10" in resp.json()["detail"]
+
+
+def _tone(ms):
+    n = 16 * ms
+    return array("h", (int(8000 * math.sin(2 * math.pi * 440 * i / 16000)) for i in range(n)))
+
+
+def test_long_form_segments_go_out_in_one_batch(client, fake_translator, monkeypatch):
+    monkeypatch.setattr(stt_longform.settings, "stt_long_form_after_s", 2)
+    pcm = array("h")
+    for part in (_tone(1500), array("h", bytes(16 * 700 * 2)), _tone(1500)):
+        pcm.extend(part)
+    texts = iter(["good morning", "everyone"])
+    with (
+        patch("app.routers.caption.decode_audio", return_value=pcm.tobytes()),
+        patch.object(
+            stt_longform.stt_azure, "recognize_pcm", side_effect=lambda pcm, lang: next(texts)
+        ),
+    ):
+        resp = _post(client, ["es", "it"])
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(fake_translator.requests) == 1
+    assert fake_translator.requests[0]["texts"] == ["good morning", "everyone"]
+    assert [t["translated"] for t in body["translations"]] == [
+        "[es] good morning [es] everyone",
+        "[it] good morning [it] everyone",
+    ]
+    assert [s["translations"]["it"] for s in body["segments"]] == [
+        "[it] good morning",
+        "[it] everyone",
+    ]
@@ -0,0 +1,285 @@
+"""
+Contract tests shared by both caption repositories: the in-memory store used
+in CI/dev and the SQL functions (run against sqlite through the pool).
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import db
+from app.db.memory_store import CAPTION_COLUMNS, InMemoryCaptionStore
+
+T0 = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _sql_repo(path):
+    def factory():
+        return sqlite3.connect(path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+
+    db.configure_pool(factory, dialect="sqlite", max_size=2)
+    return SimpleNamespace(
+        get_user_by_username=db._real_get_user_by_username,
+        create_user=db._real_create_user,
+        update_user_password=db._real_update_user_password,
+        insert_caption_entry=db._real_insert_caption_entry,
+        insert_caption_entries=db._real_insert_caption_entries,
+        update_caption_entries=db._real_update_caption_entries,
+        delete_caption_entries=db._real_delete_caption_entries,
+        fetch_captions=db._real_fetch_captions,
+        get_caption=db._real_get_caption,
+        fetch_recent_captions=db._real_fetch_recent_captions,
+        update_caption_entry=db._real_update_caption_entry,
+        delete_caption_entry=db._real_delete_caption_entry,
+    )
+
+
+@pytest.fixture(params=["memory", "sql"])
+def repo(request, sqlite_db):
+    if request.param == "memory":
+        yield InMemoryCaptionStore()
+        return
+    yield _sql_repo(sqlite_db)
+    db.close_pool()
+
+
+def _insert(repo, user, minutes, from_lang="en", to_lang="fr", text="hello"):
+    return repo.insert_caption_entry(
+        transcript=text,
+        translated_text=f"[{to_lang}] {text}",
+        from_lang=from_lang,
+        to_lang=to_lang,
+        processing_ms=5,
+        session_id=None,
+        user_id=user,
+        created_at=T0 + timedelta(minutes=minutes),
+    )
+
+
+def test_users_round_trip_and_reject_duplicates(repo):
+    assert repo.get_user_by_username("alice") is None
+    repo.create_user("alice", "hash")
+    assert repo.get_user_by_username("alice") == {"Username": "alice", "HashedPassword": "hash"}
+    with pytest.raises((ValueError, sqlite3.IntegrityError)):
+        repo.create_user("alice", "other")
+
+
+def test_update_user_password(repo):
+    repo.create_user("alice", "old")
+    assert repo.update_user_password("alice", "new") is True
+    assert repo.get_user_by_username("alice")["HashedPassword"] == "new"
+    assert repo.update_user_password("nobody", "x") is False
+
+
+def test_insert_returns_increasing_ids(repo):
+    first = _insert(repo, "alice", 0)
+    second = _insert(repo, "alice", 1)
+    assert isinstance(first, int) and second > first
+
+
+def test_bulk_insert_writes_every_row_with_client_ids(repo, monkeypatch):
+    # Force several statements per call on the SQL side.
+    monkeypatch.setattr(db, "_MAX_PARAMS", 9 * 4)
+    rows = [
+        {
+            "transcript": f"t{i}",
+            "translated_text": f"x{i}",
+            "from_lang": "en",
+            "to_lang": "fr",
+            "processing_ms": i,
+            "user_id": "alice",
+            "created_at": T0 + timedelta(minutes=i),
+            "client_id": f"c{i}",
+        }
+        for i in range(10)
+    ]
+    ids = repo.insert_caption_entries(rows)
+    fetched = repo.fetch_captions(user_id="alice")
+    assert [r["ClientId"] for r in fetched] == [f"c{i}" for i in reversed(range(10))]
+    assert [r["Id"] for r in fetched] == ids[::-1]
+
+
+def test_bulk_update_and_delete_report_per_item(repo, monkeypatch):
+    monkeypatch.setattr(db, "_MAX_PARAMS", 2)
+    mine = [_insert(repo, "alice", m) for m in range(3)]
+    theirs = _insert(repo, "bob", 9)
+
+    updates = [(mine[0], "a"), (theirs, "b"), (mine[2], "c"), (999, "d")]
+    assert repo.update_caption_entries(updates, user_id="alice") == [True, False, True, False]
+    texts = {r["Id"]: r["TranslatedText"] for r in repo.fetch_captions(user_id="alice")}
+    assert texts[mine[0]] == "a" and texts[mine[2]] == "c"
+    assert repo.fetch_captions(user_id="bob")[0]["TranslatedText"] != "b"
+
+    results = repo.delete_caption_entries([mine[1], theirs, mine[1], 999], user_id="alice")
+    assert results == [True, False, False, False]
+    assert [r["Id"] for r in repo.fetch_captions(user_id="alice")] == [mine[2], mine[0]]
+    assert len(repo.fetch_captions(user_id="bob")) == 1
+
+
+def test_fetch_is_scoped_to_user_and_projected(repo):
+    _insert(repo, "alice", 0)
+    _insert(repo, "bob", 1)
+    rows = repo.fetch_captions(user_id="alice")
+    assert len(rows) == 1
+    assert tuple(rows[0]) == CAPTION_COLUMNS
+    assert rows[0]["CreatedAt"] == T0
+    assert repo.fetch_captions(user_id="carol") == []
+
+
+def test_fetch_orders_newest_first_with_id_tiebreak(repo):
+    old = _insert(repo, "alice", 0)
+    tie_a = _insert(repo, "alice", 5)
+    tie_b = _insert(repo, "alice", 5)
+    new = _insert(repo, "alice", 9)
+    ids = [r["Id"] for r in repo.fetch_captions(user_id="alice")]
+    assert ids == [new, tie_b, tie_a, old]
+
+
+def test_keyset_cursor_pages_without_gaps(repo):
+    inserted = [_insert(repo, "alice", m // 2) for m in range(7)]
+    seen, before = [], None
+    while True:
+        page = repo.fetch_captions(user_id="alice", limit=3, before=before)
+        if not page:
+            break
+        seen.extend(r["Id"] for r in page)
+        before = (page[-1]["CreatedAt"], page[-1]["Id"])
+    assert seen == sorted(inserted, reverse=True)
+
+
+def test_filters_by_language_and_time(repo):
+    _insert(repo, "alice", 0, to_lang="fr")
+    es = _insert(repo, "alice", 10, to_lang="es")
+    _insert(repo, "alice", 20, from_lang="de", to_lang="es")
+    _insert(repo, "alice", 30, to_lang="es")
+
+    rows = repo.fetch_captions(
+        user_id="alice",
+        from_lang="en",
+        to_lang="es",
+        since=T0 + timedelta(minutes=10),
+        until=T0 + timedelta(minutes=30),
+    )
+    assert [r["Id"] for r in rows] == [es]
+
+
+def test_limit_applies_after_filters(repo):
+    for m in range(5):
+        _insert(repo, "alice", m, to_lang="es" if m % 2 else "fr")
+    rows = repo.fetch_captions(user_id="alice", to_lang="fr", limit=2)
+    assert [r["CreatedAt"] for r in rows] == [T0 + timedelta(minutes=4), T0 + timedelta(minutes=2)]
+
+
+def test_update_and_delete_require_ownership(repo):
+    cid = _insert(repo, "alice", 0)
+    assert repo.update_caption_entry(cid, "edited", user_id="bob") is False
+    assert repo.update_caption_entry(cid, "edited", user_id=None) is False
+    assert repo.update_caption_entry(cid, "edited", user_id="alice") is True
+    assert repo.fetch_captions(user_id="alice")[0]["TranslatedText"] == "edited"
+
+    assert repo.delete_caption_entry(cid, user_id="bob") is False
+    assert repo.delete_caption_entry(cid, user_id="alice") is True
+    assert repo.delete_caption_entry(cid, user_id="alice") is False
+    assert repo.fetch_captions(user_id="alice") == []
+
+
+def test_recent_captions_span_users_newest_first(repo):
+    ids = [_insert(repo, "alice" if m % 2 else "bob", m) for m in range(12)]
+    recent = repo.fetch_recent_captions()
+    assert [r["Id"] for r in recent] == ids[::-1][:10]
+    assert {r["UserId"] for r in recent} == {"alice", "bob"}
+
+
+def test_get_caption_returns_segments_for_the_owner_only(repo):
+    cid = repo.insert_caption_entry(
+        transcript="hello there",
+        translated_text="hola",
+        from_lang="en",
+        to_lang="es",
+        processing_ms=5,
+        user_id="alice",
+        created_at=T0,
+        segments="[0,1200,5,4,300,900,5,0]",
+    )
+    plain = _insert(repo, "alice", 1)
+
+    row = repo.get_caption(cid, user_id="alice")
+    assert set(row) == {*CAPTION_COLUMNS, "Segments"}
+    assert row["Segments"] == "[0,1200,5,4,300,900,5,0]"
+    assert repo.get_caption(plain, user_id="alice")["Segments"] is None
+    assert repo.get_caption(cid, user_id="bob") is None
+    assert repo.get_caption(999, user_id="alice") is None
+
+
+# --- Transactions on autocommit connections (SQL only) -------------------
+
+
+def test_bulk_insert_failing_midway_commits_nothing(autocommit_db, monkeypatch):
+    monkeypatch.setattr(db, "_MAX_PARAMS", len(db._INSERT_COLUMNS) * 2)  # two rows per statement
+    rows = [
+        {
+            "transcript": f"t{i}",
+            "translated_text": f"x{i}",
+            "from_lang": "en",
+            "to_lang": "fr",
+            "processing_ms": i,
+            "user_id": "alice",
+            "created_at": T0,
+        }
+        for i in range(5)
+    ]
+    autocommit_db.fail_on("INSERT", 2)
+    with pytest.raises(sqlite3.OperationalError):
+        db._real_insert_caption_entries(rows)
+    assert db._real_fetch_captions(user_id="alice") == []
+
+    # The connection goes back to the pool in autocommit mode, as it came out.
+    with autocommit_db.pool.connection() as conn:
+        assert conn.autocommit is True
+
+
+def test_bulk_update_and_delete_failing_midway_change_nothing(autocommit_db):
+    sql = SimpleNamespace(insert_caption_entry=db._real_insert_caption_entry)
+    ids = [_insert(sql, "alice", m) for m in range(3)]
+    before = db._real_fetch_captions(user_id="alice")
+
+    autocommit_db.fail_on("UPDATE", 2)
+    with pytest.raises(sqlite3.OperationalError):
+        db._real_update_caption_entries([(cid, "edited") for cid in ids], user_id="alice")
+    autocommit_db.fail_on("DELETE", 3)
+    with pytest.raises(sqlite3.OperationalError):
+        db._real_delete_caption_entries(ids, user_id="alice")
+
+    assert db._real_fetch_captions(user_id="alice") == before
+
+
+def test_duplicate_client_ids_are_rejected_whole(repo):
+    row = {
+        "transcript": "t",
+        "translated_text": "x",
+        "from_lang": "en",
+        "to_lang": "fr",
+        "processing_ms": 1,
+        "user_id": "alice",
+        "client_id": "c1",
+    }
+    repo.insert_caption_entries([row])
+    for batch in ([{**row, "client_id": "c2"}, row], [{**row, "client_id": "c3"}] * 2):
+        with pytest.raises(Exception) as err:
+            repo.insert_caption_entries(batch)
+        assert db.is_duplicate_client_id(err.value)
+    with pytest.raises(Exception) as err:
+        repo.insert_caption_entry(**row)
+    assert db.is_duplicate_client_id(err.value)
+    assert [r["ClientId"] for r in repo.fetch_captions(user_id="alice")] == ["c1"]
+
+    # Uniqueness is per owner.
+    repo.insert_caption_entries([{**row, "user_id": "bob"}])
+    assert [r["ClientId"] for r in repo.fetch_captions(user_id="bob")] == ["c1"]
+
+    # A deleted row's ClientId can be used again.
+    (only,) = repo.fetch_captions(user_id="alice")
+    assert repo.delete_caption_entry(only["Id"], user_id="alice")
+    repo.insert_caption_entries([row])
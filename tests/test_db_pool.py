@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.db import db
+from app.db.pool import ConnectionPool, PoolClosed, PoolTimeout
+
+
+@pytest.fixture
+def sqlite_factory(tmp_path):
+    path = tmp_path / "pool.db"
+
+    def factory():
+        return sqlite3.connect(path, check_same_thread=False)
+
+    return factory
+
+
+def test_pool_reuses_connections(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory, max_size=2)
+    with pool.connection() as conn:
+        first = conn
+    with pool.connection() as conn:
+        assert conn is first
+
+    stats = pool.stats()
+    assert stats["created"] == 1
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+
+
+def test_pool_is_bounded_and_times_out(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory, max_size=1, timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(held)
+    assert pool.stats()["in_use"] == 0
+
+
+def test_pool_waiter_gets_released_connection(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory, max_size=1, timeout=2)
+    held = pool.acquire()
+    got = {}
+
+    def waiter():
+        got["conn"] = pool.acquire()
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    while pool.stats()["waiting"] == 0:
+        time.sleep(0.005)
+    pool.release(held)
+    t.join(timeout=2)
+
+    assert got["conn"] is held
+    assert pool.stats()["created"] == 1
+
+
+def test_pool_evicts_idle_connections(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory, max_size=2, max_idle=0.01)
+    with pool.connection():
+        pass
+    time.sleep(0.03)
+    with pool.connection():
+        pass
+
+    stats = pool.stats()
+    assert stats["created"] == 2
+    assert stats["recycled"] == 1
+
+
+def test_pool_replaces_unhealthy_connection(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory, max_size=1, ping_after=0)
+    with pool.connection() as conn:
+        stale = conn
+    stale.close()  # simulate the server dropping the session
+
+    with pool.connection() as conn:
+        assert conn is not stale
+        conn.execute("SELECT 1")
+    assert pool.stats()["recycled"] == 1
+
+
+def test_pool_pings_only_connections_that_idled(sqlite_factory):
+    pings = []
+
+    def health_check(conn):
+        pings.append(conn)
+        return True
+
+    pool = ConnectionPool(sqlite_factory, max_size=1, health_check=health_check, ping_after=0.02)
+    for _ in range(3):
+        with pool.connection():
+            pass
+    assert pings == []
+
+    time.sleep(0.04)
+    with pool.connection():
+        pass
+    assert len(pings) == 1
+
+
+def test_pool_rolls_back_on_error(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory, max_size=1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise ValueError("boom")
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_closed_pool_rejects_checkout(sqlite_factory):
+    pool = ConnectionPool(sqlite_factory)
+    pool.close()
+    with pytest.raises(PoolClosed):
+        pool.acquire()
+
+
+def test_real_user_functions_run_through_pool(sqlite_factory):
+    pool = db.configure_pool(sqlite_factory, max_size=2)
+    try:
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE Users (Username TEXT PRIMARY KEY, HashedPassword TEXT)")
+
+        db._real_create_user("ada", "hash")
+        assert db._real_get_user_by_username("ada") == {
+            "Username": "ada",
+            "HashedPassword": "hash",
+        }
+        assert db._real_get_user_by_username("nobody") is None
+        assert db.pool_stats()["created"] == 1
+    finally:
+        db.close_pool()
@@ -1,3 +1,13 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import health
+from app.services.health import HealthMonitor, check_translator, health_monitor
+
+
 def test_liveness(client):
     resp = client.get("/health")
     assert resp.status_code == 200
@@ -10,3 +20,71 @@ def test_readiness(client):
     data = resp.json()
     assert "checks" in data
     assert "ready" in data
+
+
+def test_translator_check_probes_the_configured_endpoint(fake_translator):
+    assert asyncio.run(check_translator()) is True
+    assert fake_translator.requests == [{"path": "/languages", "method": "GET"}]
+
+
+def test_translator_check_skips_the_stub(monkeypatch):
+    monkeypatch.setattr(health.settings, "azure_translator_key", "")
+    monkeypatch.setattr(health.settings, "use_azure_translator", True)
+    assert asyncio.run(check_translator()) is True
+
+
+def _monitor(**checks):
+    return HealthMonitor(checks=checks, interval=60, timeout=0.5, failure_threshold=2)
+
+
+def test_checks_run_concurrently_with_latency():
+    async def slow():
+        await asyncio.sleep(0.2)
+        return True
+
+    monitor = _monitor(a=slow, b=slow, c=slow)
+    start = time.perf_counter()
+    snapshot = asyncio.run(monitor.run_once())
+    assert time.perf_counter() - start < 0.5
+    assert all(r["ok"] and r["latency_ms"] >= 150 for r in snapshot["checks"].values())
+
+
+def test_failures_need_consecutive_rounds_and_timeouts_count():
+    async def hang():
+        await asyncio.sleep(5)
+
+    monitor = _monitor(hang=hang)
+    first = asyncio.run(monitor.run_once())["checks"]["hang"]
+    assert first["ok"] is True and first["error"] == "timeout"
+    second = asyncio.run(monitor.run_once())["checks"]["hang"]
+    assert second["ok"] is False and second["consecutive_failures"] == 2
+
+
+def test_probe_serves_cached_snapshot(client, monkeypatch):
+    calls = []
+
+    async def counting():
+        calls.append(1)
+        return True
+
+    monkeypatch.setattr(health_monitor, "_checks", {"fake": counting})
+    monkeypatch.setattr(health_monitor, "_snapshot", None)
+    first = client.get("/api/ready").json()
+    second = client.get("/api/ready").json()
+
+    assert len(calls) == 1
+    assert first["checked_at"] == second["checked_at"]
+    assert second["checks"] == {"app": True, "fake": True}
+    assert second["details"]["fake"]["latency_ms"] >= 0
+    assert second["age_s"] >= 0
+
+
+def test_lifespan_runs_monitor_in_background(monkeypatch):
+    async def ok():
+        return True
+
+    monkeypatch.setattr(health_monitor, "_checks", {"fake": ok})
+    monkeypatch.setattr(health_monitor, "_snapshot", None)
+    with TestClient(app):
+        assert health_monitor._task is not None
+    assert health_monitor._task is None
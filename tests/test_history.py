@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db import db
+from app.utils.pagination import decode_cursor, encode_cursor
+
+BASE = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def history():
+    """Seven captions for testuser under a source language no other test uses."""
+    lang = uuid.uuid4().hex[:8]
+    ids = []
+    for i in range(7):
+        ids.append(
+            db.insert_caption_entry(
+                transcript=f"t{i}",
+                translated_text=f"x{i}",
+                from_lang=lang,
+                to_lang="es" if i % 2 else "fr",
+                processing_ms=1,
+                user_id="testuser",
+                # two rows share a timestamp to exercise the Id tie-breaker
+                created_at=BASE + timedelta(minutes=min(i, 5)),
+            )
+        )
+    return lang, ids
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor(BASE, 42)
+    assert decode_cursor(cursor) == (BASE, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_pages_walk_the_whole_history_once(client, history):
+    lang, ids = history
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, "from_lang": lang}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/api/captions", params=params)
+        assert resp.status_code == 200
+        seen.extend(row["Id"] for row in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        assert 'rel="next"' in resp.headers["Link"]
+
+    assert seen == list(reversed(ids))
+
+
+def test_filters_and_projection(client, history):
+    lang, _ = history
+    resp = client.get(
+        "/api/captions",
+        params={
+            "from_lang": lang,
+            "to_lang": "es",
+            "since": (BASE + timedelta(minutes=2)).isoformat(),
+        },
+    )
+    rows = resp.json()
+    assert [row["Transcript"] for row in rows] == ["t5", "t3"]
+    assert "UserId" not in rows[0]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_timezone_aware_bounds_are_compared_as_utc(client, history):
+    lang, _ = history
+    since = (BASE + timedelta(minutes=2)).isoformat() + "Z"
+    resp = client.get("/api/captions", params={"from_lang": lang, "to_lang": "es", "since": since})
+    assert resp.status_code == 200
+    assert [row["Transcript"] for row in resp.json()] == ["t5", "t3"]
+
+    # 12:00 at +02:00 is 10:00 UTC, before every row.
+    until = BASE.isoformat() + "+02:00"
+    resp = client.get("/api/captions", params={"from_lang": lang, "until": until})
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+def test_history_is_scoped_to_the_user(history):
+    lang, _ = history
+    assert db.fetch_captions(user_id="someone-else", from_lang=lang) == []
+    assert len(db.fetch_captions(user_id="testuser", from_lang=lang)) == 7
+
+
+def test_invalid_cursor_is_rejected(client):
+    resp = client.get("/api/captions", params={"cursor": "%%%"})
+    assert resp.status_code == 400
+
+
+def test_limit_is_bounded(client):
+    assert client.get("/api/captions", params={"limit": 0}).status_code == 422
+    assert client.get("/api/captions", params={"limit": 1000}).status_code == 422
@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.db import db
+from app.routers import live
+from app.services.stt_streaming import FakeStreamingRecognizer
+from app.utils.auth import create_access_token
+from app.utils.executors import StageSaturated
+
+URL = "/ws/captions?from_lang=en&to_lang=es"
+
+
+@contextmanager
+def _live(client, user="liveuser"):
+    with client.websocket_connect(URL) as ws:
+        token = create_access_token({"sub": user}, timedelta(minutes=5))
+        ws.send_json({"type": "auth", "token": token})
+        yield ws
+
+
+def _collect(ws):
+    messages = []
+    while True:
+        msg = ws.receive_json()
+        messages.append(msg)
+        if msg["type"] == "done":
+            return messages
+
+
+def test_streams_partials_and_finals(client, monkeypatch):
+    monkeypatch.setattr(
+        live,
+        "create_streaming_recognizer",
+        lambda lang, emit: FakeStreamingRecognizer(lang, emit, chunks_per_segment=3),
+    )
+
+    with _live(client) as ws:
+        for _ in range(4):
+            ws.send_bytes(b"webm-chunk")
+        ws.send_text("stop")
+        messages = _collect(ws)
+
+    kinds = [m["type"] for m in messages]
+    assert "partial" in kinds
+    finals = [m for m in messages if m["type"] == "final"]
+    assert [f["transcript"] for f in finals] == ["stub transcript 1", "stub"]
+    assert finals[0]["translated"] == "[es] stub transcript 1"
+    assert messages[-1] == {"type": "done", "segments": 2}
+
+
+def test_only_final_segments_are_persisted(client):
+    with _live(client, user="persisted") as ws:
+        for _ in range(4):  # default fake: one final per 4 chunks
+            ws.send_bytes(b"chunk")
+        ws.send_text('{"type": "stop"}')
+        messages = _collect(ws)
+
+    final_id = next(m["id"] for m in messages if m["type"] == "final")
+    rows = db.fetch_captions(user_id="persisted")
+    assert [r["Id"] for r in rows] == [final_id]
+    assert rows[0]["SessionId"]
+
+
+@pytest.mark.parametrize(
+    "first", [{"type": "auth", "token": "garbage"}, {"type": "stop"}, {"token": ""}]
+)
+def test_rejects_missing_or_bad_auth_message(client, first):
+    with pytest.raises(WebSocketDisconnect) as err:
+        with client.websocket_connect(URL) as ws:
+            ws.send_json(first)
+            ws.receive_json()
+    assert err.value.code == 1008
+
+
+def test_saturated_speech_region_closes_with_1013(client, monkeypatch):
+    class Saturated(FakeStreamingRecognizer):
+        def start(self):
+            raise StageSaturated("speech", 2)
+
+    monkeypatch.setattr(live, "create_streaming_recognizer", Saturated)
+    with pytest.raises(WebSocketDisconnect) as err:
+        with _live(client) as ws:
+            ws.receive_json()
+    assert err.value.code == 1013
+
+
+def test_token_in_query_string_is_not_accepted(client):
+    token = create_access_token({"sub": "liveuser"}, timedelta(minutes=5))
+    with pytest.raises(WebSocketDisconnect) as err:
+        with client.websocket_connect(f"{URL}&token={token}") as ws:
+            ws.send_bytes(b"chunk")
+            ws.receive_json()
+    assert err.value.code == 1008
+
+
+def test_delivery_failure_closes_the_socket(client, monkeypatch):
+    async def broken_translate(*args, **kwargs):
+        raise RuntimeError("translator down")
+
+    monkeypatch.setattr(live, "azure_translate_async", broken_translate)
+    with pytest.raises(WebSocketDisconnect) as err:
+        with _live(client) as ws:
+            ws.send_bytes(b"chunk")
+            ws.receive_json()
+    assert err.value.code == 1011
+
+
+def test_failing_recognizer_stop_still_ends_the_session(client, monkeypatch):
+    class BrokenStop(FakeStreamingRecognizer):
+        def stop(self):
+            raise RuntimeError("speech session did not stop")
+
+    monkeypatch.setattr(live, "create_streaming_recognizer", BrokenStop)
+    with pytest.raises(WebSocketDisconnect) as err:
+        with _live(client) as ws:
+            ws.send_text("stop")
+            assert ws.receive_json() == {"type": "done", "segments": 0}
+            ws.receive_json()
+    assert err.value.code == 1011
+
+
+def test_saturated_stt_stage_ends_the_session(client, monkeypatch):
+    async def saturated(stage, fn, *args, **kwargs):
+        if stage == "stt":
+            raise StageSaturated("stt", 1)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(live, "run_stage", saturated)
+    with pytest.raises(WebSocketDisconnect) as err:
+        with _live(client) as ws:
+            ws.send_bytes(b"chunk")
+            assert ws.receive_json() == {"type": "done", "segments": 0}
+            ws.receive_json()
+    assert err.value.code == 1013
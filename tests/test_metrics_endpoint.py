@@ -0,0 +1,59 @@
+from io import BytesIO
+from unittest.mock import patch
+
+from app.utils import prometheus
+from app.utils.metrics import OVERFLOW_LABEL, MetricsRegistry
+
+
+def _sample(text, line_start):
+    return [line for line in text.splitlines() if line.startswith(line_start)]
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.inc("jobs_total", 2, help_text="Jobs", kind="a")
+    registry.set_gauge("depth", 3.0)
+    for ms in (1, 7, 7, 20000):
+        registry.observe("latency_ms", ms, route="/x")
+
+    text = prometheus.render(registry.collect())
+    assert "# HELP jobs_total Jobs\n# TYPE jobs_total counter\n" in text
+    assert 'jobs_total{kind="a"} 2' in text
+    assert "depth 3" in text
+    assert 'latency_ms_bucket{route="/x",le="5"} 1' in text
+    assert 'latency_ms_bucket{route="/x",le="10"} 3' in text
+    assert 'latency_ms_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'latency_ms_count{route="/x"} 4' in text
+
+
+def test_label_cardinality_is_capped():
+    registry = MetricsRegistry(max_series=2)
+    for lang in ("en", "fr", "xx", "yy"):
+        registry.inc("calls_total", lang=lang)
+    labels = sorted(row["labels"]["lang"] for row in registry.collect())
+    assert labels == ["en", "fr", OVERFLOW_LABEL]
+
+
+@patch("app.routers.caption.azure_transcribe", return_value="hello")
+@patch("app.routers.caption.azure_translate_async", return_value="hola")
+def test_metrics_endpoint_exposes_routes_stages_and_runtime(mock_tr, mock_stt, client):
+    files = {"audio": ("a.webm", BytesIO(b"fake audio"), "audio/webm")}
+    resp = client.post("/api/captions", files=files, data={"from_lang": "en", "to_lang": "es"})
+    assert resp.status_code == 200
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+
+    assert _sample(
+        text,
+        'polyglot_http_request_duration_ms_count{method="POST",route="/api/captions",status="200"}',
+    )
+    for stage in ("decode", "stt", "translate", "db"):
+        assert _sample(
+            text,
+            f'polyglot_stage_duration_ms_count{{from_lang="en",stage="{stage}",to_lang="es"}}',
+        )
+    assert _sample(text, "polyglot_translation_cache_hit_ratio")
+    assert _sample(text, 'polyglot_executor_pending{stage="stt"}')
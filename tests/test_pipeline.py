@@ -0,0 +1,91 @@
+import asyncio
+import threading
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import executors
+from app.utils.executors import StageExecutor, StageSaturated
+
+
+def test_stage_executor_runs_off_the_event_loop():
+    stage = StageExecutor("test", workers=1, queue_size=0)
+
+    async def main():
+        return await stage.run(threading.get_ident)
+
+    try:
+        assert asyncio.run(main()) != threading.get_ident()
+    finally:
+        stage.shutdown()
+
+
+def test_stage_executor_rejects_when_saturated():
+    stage = StageExecutor("test", workers=1, queue_size=1, retry_after=7)
+    gate = threading.Event()
+
+    async def main():
+        first = asyncio.ensure_future(stage.run(gate.wait))
+        second = asyncio.ensure_future(stage.run(gate.wait))
+        await asyncio.sleep(0.01)
+        assert stage.stats()["pending"] == 2
+        with pytest.raises(StageSaturated) as err:
+            await stage.run(gate.wait)
+        gate.set()
+        await asyncio.gather(first, second)
+        return err.value
+
+    try:
+        err = asyncio.run(main())
+    finally:
+        gate.set()
+        stage.shutdown()
+
+    assert err.retry_after == 7
+    assert stage.stats() == {"workers": 1, "capacity": 2, "pending": 0, "rejected": 1}
+
+
+@patch("app.routers.caption.azure_transcribe", return_value="hello")
+@patch("app.routers.caption.azure_translate_async", return_value="hola")
+def test_create_caption_reports_stage_timings(mock_translate, mock_transcribe, client):
+    file = ("audio", BytesIO(b"fake audio"), "audio/webm")
+    resp = client.post(
+        "/api/captions",
+        files={"audio": file},
+        data={"from_lang": "en", "to_lang": "es", "timing": "true"},
+    )
+    assert resp.status_code == 200
+    assert set(resp.json()["stages"]) == {
+        "upload_check_ms",
+        "decode_ms",
+        "stt_ms",
+        "translate_ms",
+        "db_ms",
+    }
+
+
+def test_create_caption_returns_503_when_stage_saturated(client, monkeypatch):
+    async def saturated(stage, fn, *args, **kwargs):
+        raise StageSaturated(stage, 3)
+
+    monkeypatch.setattr("app.routers.caption.run_stage", saturated)
+
+    file = ("audio", BytesIO(b"fake audio"), "audio/webm")
+    resp = client.post(
+        "/api/captions", files={"audio": file}, data={"from_lang": "en", "to_lang": "es"}
+    )
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+
+
+def test_get_executor_uses_settings(monkeypatch):
+    monkeypatch.setattr(executors, "_EXECUTORS", {})
+    monkeypatch.setattr(executors.settings, "pipeline_stt_workers", 3)
+    monkeypatch.setattr(executors.settings, "pipeline_queue_size", 5)
+    stage = executors.get_executor("stt")
+    try:
+        assert stage.stats()["capacity"] == 8
+        assert executors.get_executor("stt") is stage
+    finally:
+        stage.shutdown()
@@ -0,0 +1,76 @@
+from fastapi import BackgroundTasks, FastAPI, WebSocket
+from fastapi.responses import StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from app.main import FRONTEND_DIR
+from app.utils.request_logging import UNMATCHED_ROUTE, RequestLoggingMiddleware
+
+
+def _app():
+    done = []
+    app = FastAPI()
+
+    @app.post("/items/{item_id}")
+    async def item(item_id: int, body: dict):
+        return {"id": item_id, **body}
+
+    @app.get("/stream")
+    async def stream(background: BackgroundTasks):
+        background.add_task(done.append, "background")
+
+        async def chunks():
+            for n in range(3):
+                yield f"chunk{n};".encode()
+
+        return StreamingResponse(chunks())
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text())
+        await websocket.close()
+
+    app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
+
+    logged = []
+    app.add_middleware(RequestLoggingMiddleware, on_complete=logged.append)
+    return TestClient(app), logged, done
+
+
+def test_logs_route_template_status_sizes_and_duration():
+    client, logged, _ = _app()
+    resp = client.post("/items/7", json={"a": 1})
+    assert resp.status_code == 200
+
+    (fields,) = logged
+    assert fields["path"] == "/items/{item_id}"
+    assert fields["method"] == "POST"
+    assert fields["status_code"] == 200
+    assert fields["request_bytes"] == len(b'{"a":1}')
+    assert fields["response_bytes"] == len(resp.content)
+    assert fields["duration_ms"] >= 0
+
+    client.get("/no/such/page")
+    assert logged[-1]["path"] == UNMATCHED_ROUTE and logged[-1]["status_code"] == 404
+
+
+def test_streaming_and_background_tasks_pass_through():
+    client, logged, done = _app()
+    resp = client.get("/stream")
+    assert resp.text == "chunk0;chunk1;chunk2;"
+    assert done == ["background"]
+    assert logged[-1]["response_bytes"] == len(resp.content)
+
+
+def test_websockets_and_static_files_pass_through():
+    client, logged, _ = _app()
+    with client.websocket_connect("/ws") as ws:
+        ws.send_text("ping")
+        assert ws.receive_text() == "ping"
+    assert logged == []  # only HTTP requests are logged
+
+    resp = client.get("/static/login.html")
+    assert resp.status_code == 200
+    assert logged[-1]["path"] == "/static"
+    assert logged[-1]["response_bytes"] == len(resp.content)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.services import translation_cache as tc
+from app.services import translator_azure
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        return await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["done"] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flights = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def main():
+        results = await asyncio.gather(
+            *(flights.do("k", boom) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # A later call starts a fresh flight.
+        return await flights.do("k", _ok)
+
+    async def _ok():
+        return "ok"
+
+    assert asyncio.run(main()) == "ok"
+    assert flights.stats()["leaders"] == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_flight():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flights.do("k", work))
+        second = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+@pytest.fixture
+def slow_upstream(monkeypatch):
+    calls = []
+
+    async def fake_post(request, text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return f"<{text}>"
+
+    monkeypatch.setattr(translator_azure.settings, "azure_translator_key", "key")
+    monkeypatch.setattr(translator_azure.settings, "azure_translator_endpoint", "https://x")
+    monkeypatch.setattr(translator_azure, "_post_translation", fake_post)
+    monkeypatch.setattr(translator_azure, "translation_flights", SingleFlight())
+    tc.configure_translation_cache(max_entries=0)
+    yield calls
+    tc.configure_translation_cache()
+
+
+def test_translate_async_coalesces_identical_requests(slow_upstream):
+    async def main():
+        return await asyncio.gather(
+            translator_azure.azure_translate_async("hello", "en", "es"),
+            translator_azure.azure_translate_async("hello", "en-US", "es"),
+            translator_azure.azure_translate_async("hello", "en", "fr"),
+        )
+
+    assert asyncio.run(main()) == ["<hello>", "<hello>", "<hello>"]
+    assert slow_upstream == ["hello", "hello"]  # es shared, fr separate
+    assert translator_azure.translation_flights.stats()["coalesced"] == 1
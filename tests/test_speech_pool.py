@@ -0,0 +1,190 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import speech_pool, stt_azure, stt_streaming
+from app.services.speech_pool import AzureSpeechBackend, SpeechBackend, set_speech_backend
+from app.utils.executors import StageSaturated
+from app.utils.metrics import registry
+
+
+class FakeSpeechBackend(SpeechBackend):
+    def __init__(self):
+        self.calls = []
+
+    def recognize(self, pcm, from_lang):
+        self.calls.append((pcm, from_lang))
+        return f"heard {len(pcm)} bytes"
+
+
+class FakeSpeechConfig:
+    created = 0
+
+    def __init__(self, subscription, region):
+        FakeSpeechConfig.created += 1
+        self.region = region
+        self.speech_recognition_language = None
+
+
+class FakeConnection:
+    opened = []
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    @classmethod
+    def from_recognizer(cls, recognizer):
+        return cls(recognizer)
+
+    def open(self, for_continuous_recognition):
+        FakeConnection.opened.append(for_continuous_recognition)
+
+    def close(self):
+        pass
+
+
+class FakeRecognizer:
+    gate = None
+
+    def __init__(self, speech_config, audio_config):
+        self.language = speech_config.speech_recognition_language
+
+    def recognize_once(self):
+        if FakeRecognizer.gate is not None:
+            FakeRecognizer.gate.wait(5)
+        reason = speech_pool.speechsdk.ResultReason.RecognizedSpeech
+        return SimpleNamespace(reason=reason, text=f"text in {self.language}")
+
+
+@pytest.fixture
+def fake_sdk(monkeypatch):
+    FakeSpeechConfig.created = 0
+    FakeRecognizer.gate = None
+    FakeConnection.opened = []
+    monkeypatch.setattr(speech_pool.speechsdk, "SpeechConfig", FakeSpeechConfig)
+    monkeypatch.setattr(speech_pool.speechsdk, "Connection", FakeConnection)
+    monkeypatch.setattr(speech_pool.speechsdk, "SpeechRecognizer", FakeRecognizer)
+    monkeypatch.setattr(speech_pool, "pcm_audio_config", lambda pcm: None)
+
+
+def test_azure_transcribe_goes_through_the_installed_backend(monkeypatch):
+    monkeypatch.setattr(stt_azure.settings, "azure_speech_key", "key")
+    fake = FakeSpeechBackend()
+    set_speech_backend(fake)
+    try:
+        assert stt_azure.azure_transcribe(b"upload", "es", pcm=b"\0" * 320) == "heard 320 bytes"
+    finally:
+        set_speech_backend(None)
+    assert fake.calls == [(b"\0" * 320, "es")]
+
+
+def test_speech_configs_are_built_once_per_language(fake_sdk):
+    backend = AzureSpeechBackend("key", "westeurope", max_concurrent=2, slot_timeout=1)
+    backend.warm(["en", "es"])
+
+    assert backend.recognize(b"pcm", "en") == "text in en-US"
+    assert backend.recognize(b"pcm", "es") == "text in es-ES"
+    assert backend.recognize(b"pcm", "xx") == "text in en-US"  # unknown codes fall back to en-US
+
+    assert FakeSpeechConfig.created == 2
+    assert backend.speech_config("en") is backend.speech_config("en")
+    stats = backend.stats()
+    assert stats["configs_created"] == 2
+    assert stats["configs_reused"] == 5
+    assert stats["in_flight"] == 0
+
+
+def test_recognitions_are_capped_per_region(fake_sdk):
+    backend = AzureSpeechBackend(
+        "key", "westeurope", max_concurrent=1, slot_timeout=0.05, retry_after=4
+    )
+    FakeRecognizer.gate = threading.Event()
+    holder = threading.Thread(target=backend.recognize, args=(b"pcm", "en"))
+    holder.start()
+    try:
+        while backend.stats()["in_flight"] == 0:
+            time.sleep(0.001)
+        with pytest.raises(StageSaturated) as err:
+            backend.recognize(b"pcm", "en")
+    finally:
+        FakeRecognizer.gate.set()
+        holder.join()
+
+    assert err.value.retry_after == 4
+    assert backend.stats()["rejected"] == 1
+    assert backend.recognize(b"pcm", "en") == "text in en-US"  # slot released
+
+
+def test_setup_and_reuse_are_recorded_as_metrics(fake_sdk):
+    registry.reset()
+    backend = AzureSpeechBackend("key", "westeurope", max_concurrent=1, slot_timeout=1)
+    backend.recognize(b"pcm", "fr")
+    backend.recognize(b"pcm", "fr")
+
+    rows = {(r["name"], tuple(sorted(r["labels"].items()))): r["value"] for r in registry.collect()}
+    assert rows[("polyglot_speech_configs_total", (("result", "created"),))] == 1
+    assert rows[("polyglot_speech_configs_total", (("result", "reused"),))] == 1
+    assert rows[("polyglot_speech_setup_ms", (("kind", "recognizer"),))]["count"] == 2
+    assert rows[("polyglot_speech_slot_wait_ms", ())]["count"] == 2
+
+
+def test_live_sessions_hold_a_region_slot_until_closed(fake_sdk):
+    registry.reset()
+    backend = AzureSpeechBackend("key", "westeurope", max_concurrent=1, slot_timeout=0.05)
+
+    recognizer, connection = backend.open_session("es", audio_config=None)
+    assert recognizer.language == "es-ES"
+    assert connection.recognizer is recognizer
+    assert FakeConnection.opened == [True]  # opened up front, for continuous recognition
+    assert backend.stats()["sessions"] == 1
+    with pytest.raises(StageSaturated):
+        backend.recognize(b"pcm", "es")
+
+    backend.close_session()
+    assert backend.recognize(b"pcm", "es") == "text in es-ES"
+    assert FakeSpeechConfig.created == 1  # the session used the shared config
+    stats = backend.stats()
+    assert (stats["sessions"], stats["in_flight"]) == (0, 0)
+    rows = {(r["name"], tuple(sorted(r["labels"].items()))): r["value"] for r in registry.collect()}
+    assert rows[("polyglot_speech_setup_ms", (("kind", "connection"),))]["count"] == 1
+
+
+class SaturatedBackend(SpeechBackend):
+    def open_session(self, from_lang, audio_config):
+        raise StageSaturated("speech", 3)
+
+
+class FailingStartBackend(SpeechBackend):
+    def __init__(self):
+        self.closed = 0
+
+    def open_session(self, from_lang, audio_config):
+        recognizer = SimpleNamespace(
+            recognizing=SimpleNamespace(connect=lambda cb: None),
+            recognized=SimpleNamespace(connect=lambda cb: None),
+            session_stopped=SimpleNamespace(connect=lambda cb: None),
+            canceled=SimpleNamespace(connect=lambda cb: None),
+        )
+        return recognizer, SimpleNamespace(close=lambda: None)
+
+    def close_session(self):
+        self.closed += 1
+
+
+def test_streaming_recognizer_takes_its_slot_from_the_backend(monkeypatch):
+    def no_ffmpeg(*args, **kwargs):
+        raise OSError("ffmpeg not found")
+
+    monkeypatch.setattr(stt_streaming.subprocess, "Popen", no_ffmpeg)
+
+    saturated = stt_streaming.AzureStreamingRecognizer("en", print, backend=SaturatedBackend())
+    with pytest.raises(StageSaturated):
+        saturated.start()
+
+    backend = FailingStartBackend()
+    failing = stt_streaming.AzureStreamingRecognizer("en", print, backend=backend)
+    with pytest.raises(OSError):
+        failing.start()
+    assert backend.closed == 1  # the slot is given back when start fails
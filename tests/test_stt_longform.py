@@ -0,0 +1,181 @@
+import asyncio
+import math
+import threading
+import time
+from array import array
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.routers import caption as caption_router
+from app.services import stt_azure, stt_longform
+from app.services.speech_pool import SpeechBackend, set_speech_backend
+from app.services.stt_longform import find_speech_segments, transcribe_long_form
+from app.utils.executors import StageSaturated
+
+RATE = 16000
+
+
+def tone(ms, amplitude=8000, freq=440):
+    n = RATE * ms // 1000
+    return array("h", (int(amplitude * math.sin(2 * math.pi * freq * i / RATE)) for i in range(n)))
+
+
+def silence(ms):
+    return array("h", bytes(RATE * ms // 1000 * 2))
+
+
+def pcm(*parts):
+    out = array("h")
+    for part in parts:
+        out.extend(part)
+    return out.tobytes()
+
+
+def test_segments_split_on_silence_with_timestamps():
+    audio = pcm(silence(300), tone(1000), silence(600), tone(2000), silence(600), tone(500))
+    segments = find_speech_segments(audio, min_silence_ms=400, min_speech_ms=200)
+
+    assert len(segments) == 3
+    starts = [s for s, _ in segments]
+    assert abs(starts[0] - (300 - stt_longform.SEGMENT_PAD_MS)) <= 30
+    assert abs(starts[1] - (1900 - stt_longform.SEGMENT_PAD_MS)) <= 30
+    assert segments == sorted(segments)
+    assert all(a_end <= b_start for (_, a_end), (b_start, _) in zip(segments, segments[1:]))
+
+
+def test_continuous_speech_is_cut_at_max_segment_length():
+    segments = find_speech_segments(pcm(tone(30_000)), max_segment_ms=14_000)
+    assert len(segments) == 3
+    assert all(end - start <= 14_000 for start, end in segments)
+
+
+def test_short_blips_and_silence_produce_no_segments():
+    assert find_speech_segments(pcm(silence(2000))) == []
+    assert find_speech_segments(pcm(silence(500), tone(60), silence(500)), min_speech_ms=200) == []
+
+
+def test_reads_pcm_from_a_file():
+    audio = pcm(tone(1000), silence(600), tone(1000))
+    assert find_speech_segments(BytesIO(audio)) == find_speech_segments(audio)
+
+
+def test_transcribe_long_form_runs_segments_in_parallel_and_keeps_order(monkeypatch):
+    monkeypatch.setattr(stt_longform.settings, "stt_long_form_concurrency", 2)
+    audio = pcm(*(p for _ in range(5) for p in (tone(800), silence(600))))
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def recognize(segment_pcm, from_lang):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return f"{from_lang}:{len(segment_pcm) // 32}ms"
+
+    segments = asyncio.run(transcribe_long_form(audio, "en", recognize=recognize))
+
+    assert [s["index"] for s in segments] == [0, 1, 2, 3, 4]
+    assert [s["start_ms"] for s in segments] == sorted(s["start_ms"] for s in segments)
+    assert all(s["text"] == f"en:{s['end_ms'] - s['start_ms']}ms" for s in segments)
+    assert peak[0] == 2
+
+
+def test_first_failing_segment_cancels_the_rest(monkeypatch):
+    monkeypatch.setattr(stt_longform.settings, "stt_long_form_concurrency", 1)
+    audio = pcm(*(p for _ in range(4) for p in (tone(800), silence(600))))
+    calls = []
+
+    def recognize(segment_pcm, from_lang):
+        calls.append(len(segment_pcm))
+        raise StageSaturated("stt", 2)
+
+    async def run():
+        with pytest.raises(StageSaturated):
+            await transcribe_long_form(audio, "en", recognize=recognize)
+        await asyncio.sleep(0.1)  # siblings would have reached the recognizer by now
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_short_audio_with_two_utterances_is_segmented(client):
+    audio = pcm(tone(1500), silence(700), tone(1500))  # well under STT_LONG_FORM_AFTER_S
+    texts = iter(["good morning", "everyone"])
+
+    with (
+        patch("app.routers.caption.decode_audio", return_value=audio),
+        patch("app.routers.caption.azure_transcribe") as single,
+        patch.object(
+            stt_longform.stt_azure, "recognize_pcm", side_effect=lambda p, lang: next(texts)
+        ),
+    ):
+        file = ("audio", BytesIO(b"OggS short recording"), "audio/ogg")
+        resp = client.post(
+            "/api/captions", files={"audio": file}, data={"from_lang": "en", "to_lang": "es"}
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["transcript"] == "good morning everyone"
+    assert not single.called
+
+
+class _ReadingBackend(SpeechBackend):
+    """Reads file PCM from where it stands, as the SDK pull stream does."""
+
+    def __init__(self):
+        self.received = []
+
+    def recognize(self, pcm, from_lang):
+        data = pcm if isinstance(pcm, bytes) else pcm.read()
+        self.received.append(len(data))
+        return "hello"
+
+
+def test_single_utterance_file_pcm_reaches_the_recognizer_whole(monkeypatch):
+    monkeypatch.setattr(stt_azure.settings, "azure_speech_key", "key")
+    monkeypatch.setattr(stt_azure.settings, "azure_speech_region", "westeurope")
+    audio = pcm(silence(300), tone(1500), silence(300))
+    spooled = SpooledTemporaryFile(max_size=1024)
+    spooled.write(audio)
+    spooled.seek(0)
+    backend = _ReadingBackend()
+    set_speech_backend(backend)
+    try:
+        upload = SimpleNamespace(file=BytesIO(b"OggS upload"))
+        transcript, segments = asyncio.run(caption_router._transcribe(upload, spooled, "en"))
+    finally:
+        set_speech_backend(None)
+        spooled.close()
+
+    assert (transcript, segments) == ("hello", None)
+    assert backend.received == [len(audio)]
+
+
+def test_create_caption_uses_long_form_for_long_audio(client, monkeypatch):
+    monkeypatch.setattr(stt_longform.settings, "stt_long_form_after_s", 2)
+    audio = pcm(tone(1500), silence(700), tone(1500), silence(700))
+    texts = iter(["good morning", "everyone"])
+
+    with (
+        patch("app.routers.caption.decode_audio", return_value=audio),
+        patch.object(
+            stt_longform.stt_azure, "recognize_pcm", side_effect=lambda p, lang: next(texts)
+        ),
+    ):
+        file = ("audio", BytesIO(b"OggS long recording"), "audio/ogg")
+        resp = client.post(
+            "/api/captions", files={"audio": file}, data={"from_lang": "en", "to_lang": "es"}
+        )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["transcript"] == "good morning everyone"
+    assert body["translated"] == "[es] good morning [es] everyone"
+    assert [s["text"] for s in body["segments"]] == ["good morning", "everyone"]
+    assert [s["translated"] for s in body["segments"]] == ["[es] good morning", "[es] everyone"]
+    assert body["segments"][0]["end_ms"] <= body["segments"][1]["start_ms"]
@@ -0,0 +1,120 @@
+import json
+import math
+from array import array
+from io import BytesIO
+from unittest.mock import patch
+
+from app.db.db import memory_store
+from app.services import stt_longform
+from app.services.subtitles import decode_segments, encode_segments, render_subtitles
+
+SEGMENTS = [
+    {"start_ms": 250, "end_ms": 1800, "text": "good morning", "translated": "buenos días"},
+    {"start_ms": 2400, "end_ms": 2900, "text": "", "translated": ""},
+    {"start_ms": 3100, "end_ms": 3_725_040, "text": "everyone", "translated": "a todos"},
+]
+
+
+def test_encoding_is_compact_and_round_trips():
+    encoded = encode_segments(SEGMENTS)
+    assert json.loads(encoded) == [250, 1550, 12, 11, 600, 500, 0, 0, 200, 3_721_940, 8, 7]
+
+    decoded = decode_segments(encoded, "good morning everyone", "buenos días a todos")
+    assert [(s["start_ms"], s["end_ms"]) for s in decoded] == [
+        (s["start_ms"], s["end_ms"]) for s in SEGMENTS
+    ]
+    assert [s["text"] for s in decoded] == ["good morning", "", "everyone"]
+    assert [s["translated"] for s in decoded] == ["buenos días", "", "a todos"]
+    assert encode_segments([]) is None
+
+
+def test_edited_translation_is_spread_over_segments():
+    encoded = encode_segments(SEGMENTS)
+    decoded = decode_segments(encoded, "good morning everyone", "hola hola a todos amigos")
+    assert " ".join(filter(None, (s["translated"] for s in decoded))) == "hola hola a todos amigos"
+    assert decoded[0]["translated"] and decoded[2]["translated"]
+
+
+def test_render_srt_and_vtt():
+    segments = decode_segments(
+        encode_segments(SEGMENTS), "good morning everyone", "buenos días a todos"
+    )
+    srt = "".join(render_subtitles(segments, "srt"))
+    assert srt == (
+        "1\n00:00:00,250 --> 00:00:01,800\nbuenos días\n\n"
+        "2\n00:00:03,100 --> 01:02:05,040\na todos\n\n"
+    )
+
+    vtt = "".join(render_subtitles(segments, "vtt", key="text"))
+    assert vtt.startswith("WEBVTT\n\n1\n00:00:00.250 --> 00:00:01.800\ngood morning\n")
+
+
+def test_vtt_cue_text_cannot_break_the_format():
+    segments = [{"start_ms": 0, "end_ms": 10, "translated": "a --> b\n\nc"}]
+    assert "".join(render_subtitles(segments, "vtt")).endswith("a -> b c\n\n")
+
+
+def _tone(ms):
+    n = 16 * ms
+    return array("h", (int(8000 * math.sin(2 * math.pi * 440 * i / 16000)) for i in range(n)))
+
+
+def _create_long_caption(client, monkeypatch):
+    monkeypatch.setattr(stt_longform.settings, "stt_long_form_after_s", 2)
+    pcm = array("h")
+    for part in (_tone(1500), array("h", bytes(16 * 700 * 2)), _tone(1500)):
+        pcm.extend(part)
+    texts = iter(["good morning", "everyone"])
+    with (
+        patch("app.routers.caption.decode_audio", return_value=pcm.tobytes()),
+        patch.object(
+            stt_longform.stt_azure, "recognize_pcm", side_effect=lambda pcm, lang: next(texts)
+        ),
+    ):
+        file = ("audio", BytesIO(b"OggS lecture"), "audio/ogg")
+        resp = client.post(
+            "/api/captions", files={"audio": file}, data={"from_lang": "en", "to_lang": "es"}
+        )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_subtitles_endpoint_streams_stored_segments(client, monkeypatch):
+    created = _create_long_caption(client, monkeypatch)
+    cid = created["id"]
+
+    srt = client.get(f"/api/captions/{cid}/subtitles")
+    assert srt.status_code == 200
+    assert srt.headers["content-type"].startswith("application/x-subrip")
+    assert f'filename="caption-{cid}.srt"' in srt.headers["content-disposition"]
+    first, second = created["segments"]
+    assert srt.text.splitlines()[:3] == [
+        "1",
+        f"{_srt(first['start_ms'])} --> {_srt(first['end_ms'])}",
+        "[es] good morning",
+    ]
+
+    vtt = client.get(f"/api/captions/{cid}/subtitles", params={"format": "vtt", "lang": "en"})
+    assert vtt.status_code == 200
+    assert vtt.headers["content-type"].startswith("text/vtt")
+    assert vtt.text.startswith("WEBVTT")
+    assert "good morning" in vtt.text and "everyone" in vtt.text and "[es]" not in vtt.text
+
+    assert client.get(f"/api/captions/{cid}/subtitles", params={"lang": "de"}).status_code == 400
+    assert client.get(f"/api/captions/{cid}/subtitles", params={"format": "ass"}).status_code == 422
+
+
+def _srt(ms):
+    return f"00:00:{ms // 1000:02d},{ms % 1000:03d}"
+
+
+def test_subtitles_require_ownership_and_timing(client):
+    other = memory_store.insert_caption_entry(
+        "hi", "hola", "en", "es", 1, user_id="someone-else", segments="[0,500,2,4]"
+    )
+    assert client.get(f"/api/captions/{other}/subtitles").status_code == 404
+
+    untimed = memory_store.insert_caption_entry("hi", "hola", "en", "es", 1, user_id="testuser")
+    resp = client.get(f"/api/captions/{untimed}/subtitles")
+    assert resp.status_code == 404
+    assert "timing" in resp.json()["detail"]
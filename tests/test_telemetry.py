@@ -0,0 +1,89 @@
+import logging
+import threading
+
+from app.utils import metrics
+from app.utils.metrics import MetricsRegistry
+from app.utils.telemetry import BoundedQueueHandler, RouteSampler, TelemetryPipeline
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.get_ident())
+
+
+def _record(msg="m", level=logging.INFO, path=None):
+    record = logging.LogRecord("polyglot", level, __file__, 1, msg, None, None)
+    if path is not None:
+        record.custom_dimensions = {"path": path}
+    return record
+
+
+def test_queue_handler_drops_when_full():
+    handler = BoundedQueueHandler(max_size=2)
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_route_sampler_keeps_warnings_and_unrouted_records():
+    sampler = RouteSampler({"/health": 0.0}, default=1.0)
+    assert not sampler.filter(_record(path="/health"))
+    assert sampler.filter(_record(path="/health", level=logging.WARNING))
+    assert sampler.filter(_record(path="/api/captions"))
+    assert sampler.filter(_record())
+    assert sampler.sampled_out == 1
+
+
+def test_pipeline_exports_off_the_calling_thread():
+    exporter = ListHandler()
+    pipeline = TelemetryPipeline([exporter], max_size=100, sample_rates={}, default_rate=1.0)
+    logger = logging.getLogger("polyglot.test_pipeline")
+    logger.propagate = False
+    logger.addHandler(pipeline.handler)
+    pipeline.start()
+    try:
+        for n in range(10):
+            logger.warning("event %d", n)
+    finally:
+        pipeline.stop()
+        logger.removeHandler(pipeline.handler)
+
+    assert [r.getMessage() for r in exporter.records] == [f"event {n}" for n in range(10)]
+    assert threading.get_ident() not in exporter.threads
+    assert pipeline.stats()["dropped"] == 0
+
+
+def test_metrics_are_aggregated_and_flushed_as_interval_deltas(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    for ms in (3, 40, 400, 20000):
+        metrics.metric_processing_time(ms)
+    metrics.metric_caption_processed()
+    metrics.metric_caption_processed()
+
+    emitted = []
+    monkeypatch.setattr(
+        metrics.logger,
+        "info",
+        lambda name, extra: emitted.append((name, extra["custom_dimensions"])),
+    )
+    metrics.flush_metrics()
+
+    dims = dict(emitted)
+    assert dims["polyglot_captions_processed_total"] == {"count": 2}
+    hist = dims["polyglot_processing_time_ms"]
+    assert hist["count"] == 4 and hist["sum"] == 20443
+    assert hist["buckets"]["5"] == 1 and hist["buckets"]["+Inf"] == 1
+
+    # The next flush only carries what happened since the previous one.
+    emitted.clear()
+    metrics.metric_caption_processed()
+    metrics.flush_metrics()
+    assert emitted == [("polyglot_captions_processed_total", {"count": 1})]
@@ -0,0 +1,72 @@
+from io import BytesIO
+from unittest.mock import patch
+
+from app.utils.tracing import Trace, current_trace, span, start_trace
+
+
+def test_spans_carry_trace_attributes_and_parent():
+    trace = Trace("t", from_lang="en", to_lang="es")
+    with trace.span("translate"):
+        with trace.span("cache_lookup", hit=False):
+            pass
+
+    inner, outer = trace.spans
+    assert inner.name == "cache_lookup"
+    assert inner.parent == "translate"
+    assert inner.attributes == {"from_lang": "en", "to_lang": "es", "hit": False}
+    assert outer.parent is None
+    assert list(trace.breakdown()) == ["translate_ms", "cache_lookup_ms"]
+
+
+def test_server_timing_lists_spans_and_total():
+    trace = Trace("t")
+    with trace.span("stt"):
+        pass
+    header = trace.server_timing()
+    assert header.startswith("stt;dur=")
+    assert ", total;dur=" in header
+
+
+def test_span_outside_a_trace_is_a_no_op():
+    assert current_trace() is None
+    with span("anything") as s:
+        assert s is None
+
+
+def test_start_trace_sets_and_restores_current():
+    with start_trace("outer") as trace:
+        assert current_trace() is trace
+        with span("work"):
+            pass
+    assert current_trace() is None
+    assert [s.name for s in trace.spans] == ["work"]
+
+
+@patch("app.routers.caption.azure_transcribe", return_value="hello")
+@patch("app.routers.caption.azure_translate_async", return_value="hola")
+def test_caption_timing_is_opt_in(mock_translate, mock_transcribe, client):
+    def post(**extra):
+        file = ("audio", BytesIO(b"fake audio"), "audio/webm")
+        data = {"from_lang": "en", "to_lang": "es", **extra}
+        return client.post("/api/captions", files={"audio": file}, data=data)
+
+    plain = post()
+    assert plain.status_code == 200
+    assert "Server-Timing" not in plain.headers
+    assert "stages" not in plain.json()
+
+    timed = post(timing="true")
+    assert timed.status_code == 200
+    names = [part.split(";")[0] for part in timed.headers["Server-Timing"].split(", ")]
+    assert names == ["upload_check", "decode", "stt", "translate", "db", "total"]
+
+
+def test_manual_timing_includes_cache_lookup(client, fake_translator):
+    body = {"text": "hello", "from_lang": "en", "to_lang": "es", "timing": True}
+    first = client.post("/api/manual/translate", json=body)
+    second = client.post("/api/manual/translate", json=body)
+
+    assert set(first.json()["stages"]) == {"translate_ms", "cache_lookup_ms", "translator_call_ms"}
+    # Served from the cache: no upstream call span.
+    assert set(second.json()["stages"]) == {"translate_ms", "cache_lookup_ms"}
+    assert "cache_lookup;dur=" in second.headers["Server-Timing"]
@@ -0,0 +1,59 @@
+import asyncio
+
+from app.services import translator_azure
+from app.services.translator_azure import azure_translate_batch, chunk_batch
+
+
+def test_chunk_batch_respects_array_limit():
+    chunks = chunk_batch(["x"] * 250)
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert [i for c in chunks for i in c] == list(range(250))
+
+
+def test_chunk_batch_counts_chars_per_target(monkeypatch):
+    monkeypatch.setattr(translator_azure, "MAX_BATCH_CHARS", 100)
+    # 30 chars * 2 targets = 60 per text, so only one text fits per chunk
+    assert chunk_batch(["a" * 30] * 3, n_targets=2) == [[0], [1], [2]]
+    assert chunk_batch(["a" * 30] * 3, n_targets=1) == [[0, 1, 2]]
+
+
+def test_batch_stub_keeps_order_and_targets():
+    out = asyncio.run(azure_translate_batch(["hi", "", "bye"], "en", ["es", "fr-FR"]))
+    assert out == [
+        {"es": "[es] hi", "fr": "[fr] hi"},
+        {"es": "", "fr": ""},
+        {"es": "[es] bye", "fr": "[fr] bye"},
+    ]
+
+
+def test_batch_packs_texts_into_few_requests(fake_translator, monkeypatch):
+    monkeypatch.setattr(translator_azure, "MAX_BATCH_TEXTS", 3)
+    texts = [f"line {i}" for i in range(7)]
+
+    out = asyncio.run(azure_translate_batch(texts, "en", ["es", "de"]))
+
+    assert len(fake_translator.requests) == 3
+    assert fake_translator.requests[0]["query"]["to"] == ["es", "de"]
+    assert out[6] == {"es": "[es] line 6", "de": "[de] line 6"}
+    assert [o["es"] for o in out] == [f"[es] {t}" for t in texts]
+
+
+def test_batch_skips_cached_texts(fake_translator):
+    asyncio.run(azure_translate_batch(["one", "two"], "en", ["es"]))
+    asyncio.run(azure_translate_batch(["one", "two", "three"], "en", ["es"]))
+    assert [r["texts"] for r in fake_translator.requests] == [["one", "two"], ["three"]]
+
+
+def test_batch_endpoint(client):
+    body = {"texts": ["hello", "world"], "from_lang": "en", "to_langs": ["es", "it"]}
+    resp = client.post("/api/manual/translate/batch", json=body)
+    assert resp.status_code == 200
+    assert resp.json()["translations"][1] == {
+        "text": "world",
+        "translations": {"es": "[es] world", "it": "[it] world"},
+    }
+
+
+def test_batch_endpoint_requires_texts(client):
+    body = {"texts": [], "from_lang": "en", "to_langs": ["es"]}
+    assert client.post("/api/manual/translate/batch", json=body).status_code == 422
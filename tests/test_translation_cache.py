@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services import translation_cache as tc
+from app.services import translator_azure
+
+
+def test_key_normalizes_text_and_pair():
+    assert tc.make_key("  hello  world ", "en", "es") == tc.make_key("hello world", "en", "es")
+    assert tc.make_key("hello", "en", "es") != tc.make_key("hello", "en", "fr")
+    assert tc.make_key("hello", None, "es").startswith("tr:auto:es:")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = tc.TranslationCache(max_entries=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "b" is now the oldest
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tc.time, "monotonic", lambda: now[0])
+    cache = tc.TranslationCache(max_entries=10, ttl=5)
+    cache.set("a", "1")
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_shared_backend_fills_local_tier():
+    backend = tc.InMemoryBackend()
+    replica_a = tc.TranslationCache(max_entries=10, ttl=60, backend=backend)
+    replica_b = tc.TranslationCache(max_entries=10, ttl=60, backend=backend)
+
+    replica_a.set("k", "v")
+    assert replica_b.get("k") == "v"
+    assert replica_b.stats()["backend_hits"] == 1
+    assert replica_b.stats()["size"] == 1
+
+
+def test_backend_errors_are_treated_as_misses():
+    class Broken(tc.CacheBackend):
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    cache = tc.TranslationCache(max_entries=10, ttl=60, backend=Broken())
+    assert cache.get("k") is None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+
+def test_async_access_keeps_network_backends_off_the_loop():
+    class Remote(tc.InMemoryBackend):
+        local = False
+
+        def __init__(self):
+            super().__init__()
+            self.threads = []
+
+        def get(self, key):
+            self.threads.append(threading.get_ident())
+            return super().get(key)
+
+        def set(self, key, value, ttl):
+            self.threads.append(threading.get_ident())
+            super().set(key, value, ttl)
+
+    backend = Remote()
+    writer = tc.TranslationCache(max_entries=10, ttl=60, backend=backend)
+    reader = tc.TranslationCache(max_entries=10, ttl=60, backend=backend)
+
+    async def main():
+        await writer.aset("k", "v")
+        return await reader.aget("k"), threading.get_ident()
+
+    value, loop_thread = asyncio.run(main())
+    assert value == "v"
+    assert len(backend.threads) == 2
+    assert loop_thread not in backend.threads
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def fake_post(request, text):
+        calls.append(text)
+        return f"<{text}>"
+
+    monkeypatch.setattr(translator_azure.settings, "azure_translator_key", "key")
+    monkeypatch.setattr(translator_azure.settings, "azure_translator_endpoint", "https://x")
+    monkeypatch.setattr(translator_azure, "_post_translation", fake_post)
+    tc.configure_translation_cache(max_entries=10, ttl=60)
+    yield calls
+    tc.configure_translation_cache()
+
+
+def test_async_translate_uses_cache(upstream):
+    async def main():
+        a = await translator_azure.azure_translate_async("hello", "en-US", "es")
+        b = await translator_azure.azure_translate_async(" hello ", "en", "es-ES")
+        c = await translator_azure.azure_translate_async("hello", "en", "es", use_cache=False)
+        return a, b, c
+
+    assert asyncio.run(main()) == ("<hello>", "<hello>", "<hello>")
+    assert upstream == ["hello", "hello"]
+    assert tc.get_translation_cache().stats()["hits"] == 1
+
+
+def test_manual_translate_bypass_cache(upstream, client):
+    body = {"text": "good morning", "from_lang": "en", "to_lang": "it"}
+    client.post("/api/manual/translate", json=body)
+    client.post("/api/manual/translate", json=body)
+    client.post("/api/manual/translate", json={**body, "bypass_cache": True})
+    assert upstream == ["good morning", "good morning"]
@@ -0,0 +1,53 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import http_client, translator_azure
+
+
+def test_async_translate_reuses_one_connection(fake_translator):
+    async def main():
+        first = await translator_azure.azure_translate_async("hello", "en-US", "fr")
+        second = await translator_azure.azure_translate_async("bye", "en", "de")
+        await http_client.close_http_clients()
+        return first, second
+
+    assert asyncio.run(main()) == ("[fr] hello", "[de] bye")
+
+    reqs = fake_translator.requests
+    assert [r["path"] for r in reqs] == ["/translate", "/translate"]
+    assert reqs[0]["query"]["from"] == ["en"]
+    # Keep-alive: both calls arrived over the same TCP connection.
+    assert reqs[0]["peer"] == reqs[1]["peer"]
+
+
+def test_client_is_shared_per_loop_and_closed():
+    async def main():
+        client = http_client.get_translator_client()
+        assert http_client.get_translator_client() is client
+        await http_client.close_http_clients()
+        return client
+
+    client = asyncio.run(main())
+    assert client.is_closed
+
+
+def test_client_honours_pool_settings(monkeypatch):
+    monkeypatch.setattr(http_client.settings, "translator_max_connections", 3)
+    monkeypatch.setattr(http_client.settings, "translator_timeout", 1.5)
+    client = http_client.build_translator_client()
+    pool = client._transport._pool
+    assert pool._max_connections == 3
+    assert client.timeout.read == 1.5
+
+
+def test_lifespan_closes_translator_client(fake_translator):
+    with TestClient(app) as test_client:
+        resp = test_client.post(
+            "/api/manual/translate", json={"text": "hi", "from_lang": "en", "to_lang": "it"}
+        )
+        assert resp.json()["translated_text"] == "[it] hi"
+        client = http_client._translator_client
+        assert client is not None and not client.is_closed
+    assert client.is_closed
@@ -0,0 +1,178 @@
+import asyncio
+import sys
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from unittest.mock import patch
+
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from app.services import stt_azure
+from app.utils.upload_limit import UploadLimitMiddleware
+
+
+def _limited_app(max_bytes):
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_bytes=max_bytes)
+
+    @app.post("/upload")
+    async def upload(audio: UploadFile):
+        return {"size": audio.size}
+
+    return app
+
+
+def test_declared_oversized_body_is_rejected_before_reading():
+    client = TestClient(_limited_app(100))
+    resp = client.post("/upload", files={"audio": ("a.webm", b"x" * 500, "audio/webm")})
+    assert resp.status_code == 413
+
+
+def test_streamed_body_is_cut_off_at_the_limit():
+    client = TestClient(_limited_app(1000))
+    chunks = iter([b"--b\r\n", b"x" * 600, b"x" * 600, b"x" * 600])
+    resp = client.post(
+        "/upload",
+        content=chunks,  # no Content-Length: chunked transfer
+        headers={"content-type": "multipart/form-data; boundary=b"},
+    )
+    assert resp.status_code == 413
+
+
+def test_body_under_the_limit_passes():
+    client = TestClient(_limited_app(10_000))
+    resp = client.post("/upload", files={"audio": ("a.webm", b"x" * 500, "audio/webm")})
+    assert resp.status_code == 200
+    assert resp.json() == {"size": 500}
+
+
+def test_only_upload_routes_get_the_large_cap():
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_bytes=100, uploads={"/upload": 10_000})
+
+    @app.post("/upload")
+    async def upload(audio: UploadFile):
+        return {"size": audio.size}
+
+    @app.post("/bulk")
+    async def bulk(rows: list[str]):
+        return {"rows": len(rows)}
+
+    client = TestClient(app)
+    resp = client.post("/upload", files={"audio": ("a.webm", b"x" * 500, "audio/webm")})
+    assert resp.status_code == 200
+    assert client.post("/bulk", json=["x" * 50] * 5).status_code == 413
+    assert client.post("/bulk", json=["x"]).json() == {"rows": 1}
+
+
+def test_non_audio_part_is_rejected_before_the_file_spools():
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_bytes=100, uploads={"/upload": 0})
+
+    @app.post("/upload")
+    async def upload(audio: UploadFile):
+        return {"size": audio.size}
+
+    chunks = [
+        b'--b\r\nContent-Disposition: form-data; name="audio"; filename="a.pdf"\r\n',
+        b"Content-Type: application/pdf\r\n\r\n",
+        *[b"x" * 1000] * 20,
+        b"\r\n--b--\r\n",
+    ]
+    read, sent = [], []
+
+    async def receive():
+        read.append(chunks[len(read)])
+        return {"type": "http.request", "body": read[-1], "more_body": len(read) < len(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=b")],
+        "query_string": b"",
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert sent[0]["status"] == 415
+    assert len(read) == 2  # stopped at the part headers; none of the file was read
+
+
+def _post_caption(client, body, content_type):
+    file = ("audio", BytesIO(body), content_type)
+    return client.post(
+        "/api/captions", files={"audio": file}, data={"from_lang": "en", "to_lang": "es"}
+    )
+
+
+@patch("app.routers.caption.azure_transcribe", return_value="hello")
+@patch("app.routers.caption.azure_translate_async", return_value="hola")
+def test_caption_rejects_non_audio_uploads(mock_translate, mock_transcribe, client):
+    assert _post_caption(client, b"%PDF-1.7 ...", "application/pdf").status_code == 415
+    assert _post_caption(client, b"plain text", "application/octet-stream").status_code == 415
+    assert not mock_transcribe.called
+
+    wav = b"RIFF\x24\x00\x00\x00WAVEfmt "
+    assert _post_caption(client, wav, "application/octet-stream").status_code == 200
+    mp4 = b"\x00\x00\x00\x18ftypM4A "
+    assert _post_caption(client, mp4, "").status_code == 200
+
+
+@patch("app.routers.caption.azure_translate_async", return_value="hola")
+def test_caption_hands_the_spooled_upload_to_stt(mock_translate, client):
+    seen = {}
+
+    def fake_transcribe(audio, from_lang, pcm=None):
+        seen["type"] = type(audio)
+        seen["body"] = audio.read()
+        return "hello"
+
+    with patch("app.routers.caption.azure_transcribe", side_effect=fake_transcribe):
+        resp = _post_caption(client, b"OggS" + b"\x00" * 2000, "audio/ogg")
+
+    assert resp.status_code == 200
+    assert seen["type"] is not bytes
+    assert len(seen["body"]) == 2004
+
+
+# stdin -> stdout copy standing in for ffmpeg reading from a pipe.
+_CAT = [
+    sys.executable,
+    "-c",
+    "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)",
+]
+
+
+def test_decode_file_to_pcm_streams_into_a_spooled_file(monkeypatch):
+    monkeypatch.setattr(stt_azure, "ffmpeg_pcm_cmd", lambda src: _CAT)
+    monkeypatch.setattr(stt_azure.settings, "stt_pcm_spool_bytes", 1024)
+    payload = bytes(range(256)) * 1024  # 256 KiB, several chunks
+
+    pcm = stt_azure.decode_file_to_pcm(BytesIO(payload))
+    try:
+        assert isinstance(pcm, SpooledTemporaryFile)
+        assert pcm._rolled  # spilled to disk past the spool size
+        assert pcm.read() == payload
+    finally:
+        pcm.close()
+
+
+def test_decode_file_to_pcm_falls_back_to_a_temp_file(monkeypatch):
+    def cmd(src):
+        if src == "pipe:0":
+            return [sys.executable, "-c", "import sys; sys.exit(1)"]
+        return [
+            sys.executable,
+            "-c",
+            f"import sys; sys.stdout.buffer.write(open({src!r}, 'rb').read())",
+        ]
+
+    monkeypatch.setattr(stt_azure, "ffmpeg_pcm_cmd", cmd)
+    pcm = stt_azure.decode_file_to_pcm(BytesIO(b"mp4 bytes"))
+    try:
+        assert pcm.read() == b"mp4 bytes"
+    finally:
+        pcm.close()
@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.db import db, write_behind
+from app.db.write_behind import WriteBehindQueue
+from app.utils.executors import StageSaturated
+
+
+def _row(n, user="wb-user"):
+    return {
+        "transcript": f"t{n}",
+        "translated_text": f"x{n}",
+        "from_lang": "en",
+        "to_lang": "fr",
+        "processing_ms": 1,
+        "user_id": user,
+    }
+
+
+def test_rows_are_written_in_batches():
+    batches = []
+    wb = WriteBehindQueue(writer=batches.append, batch_size=50, flush_interval=0.2)
+    try:
+        ids = [wb.submit(_row(n)) for n in range(120)]
+        wb.flush()
+    finally:
+        wb.close()
+
+    assert len(set(ids)) == 120
+    assert sum(len(b) for b in batches) == 120
+    assert len(batches) < 120 and max(len(b) for b in batches) <= 50
+    assert [r["client_id"] for b in batches for r in b] == ids
+    stats = wb.stats()
+    assert stats["written"] == 120 and stats["depth"] == 0 and stats["failed"] == 0
+
+
+def test_failed_batches_are_retried_then_dropped():
+    calls = []
+
+    def flaky(rows):
+        calls.append(len(rows))
+        if len(calls) < 3:
+            raise RuntimeError("db down")
+
+    wb = WriteBehindQueue(writer=flaky, max_retries=2, retry_backoff=0, flush_interval=0)
+    wb.submit(_row(1))
+    wb.flush()
+    assert wb.stats()["retries"] == 2 and wb.stats()["written"] == 1
+
+    def broken(rows):
+        raise RuntimeError("still down")
+
+    wb._writer = broken
+    wb.submit(_row(2))
+    wb.close()
+    assert wb.stats()["failed"] == 1
+
+
+class _UniqueClientIds:
+    """Atomic batch writer enforcing UX_Captions_ClientId, like the SQL insert."""
+
+    def __init__(self, bad=(), lose_first_ack=False):
+        self.stored = []
+        self.bad = set(bad)
+        self.lose_first_ack = lose_first_ack
+
+    def __call__(self, rows):
+        ids = [r["client_id"] for r in rows]
+        if any(r["transcript"] in self.bad for r in rows):
+            raise ValueError("row rejected by the database")
+        if set(ids) & set(self.stored):
+            raise sqlite3.IntegrityError("UNIQUE constraint failed: Captions.ClientId")
+        self.stored.extend(ids)
+        if self.lose_first_ack:
+            self.lose_first_ack = False
+            raise sqlite3.OperationalError("connection lost after commit")
+
+
+def test_bad_rows_are_isolated_from_the_rest_of_the_batch():
+    writer = _UniqueClientIds(bad={"t3", "t6"})
+    wb = WriteBehindQueue(writer=writer, batch_size=10, flush_interval=0.2, retry_backoff=0)
+    ids = [wb.submit(_row(n)) for n in range(10)]
+    wb.close()
+
+    assert sorted(writer.stored) == sorted(ids[:3] + ids[4:6] + ids[7:])
+    stats = wb.stats()
+    assert stats["written"] == 8 and stats["failed"] == 2
+
+
+def test_replayed_batch_counts_already_stored_rows_as_written():
+    writer = _UniqueClientIds(lose_first_ack=True)
+    wb = WriteBehindQueue(writer=writer, batch_size=10, flush_interval=0.2, retry_backoff=0)
+    ids = [wb.submit(_row(n)) for n in range(4)]
+    wb.close()
+
+    assert writer.stored == ids  # each row stored exactly once
+    stats = wb.stats()
+    assert stats["written"] == 4 and stats["failed"] == 0 and stats["retries"] == 1
+
+
+def test_full_queue_is_rejected():
+    gate = threading.Event()
+    wb = WriteBehindQueue(writer=lambda rows: gate.wait(), max_size=1, flush_interval=0)
+    try:
+        wb.submit(_row(1))  # taken by the worker, which then blocks
+        for _ in range(100):
+            if wb.stats()["depth"] == 0:
+                break
+            threading.Event().wait(0.01)
+        wb.submit(_row(2))  # fills the queue
+        with pytest.raises(StageSaturated):
+            wb.submit(_row(3))
+        assert wb.stats()["rejected"] == 1
+    finally:
+        gate.set()
+        wb.close()
+
+
+def test_close_drains_pending_rows():
+    written = []
+    wb = WriteBehindQueue(writer=written.extend, batch_size=10, flush_interval=5)
+    for n in range(25):
+        wb.submit(_row(n))
+    wb.close()
+    assert len(written) == 25
+
+
+def test_endpoints_queue_writes_when_enabled(client, monkeypatch):
+    monkeypatch.setattr(write_behind.settings, "caption_write_behind", True)
+    try:
+        resp = client.post(
+            "/api/manual/save",
+            json={
+                "transcript": "hi",
+                "translated_text": "salut",
+                "from_lang": "en",
+                "to_lang": "fr",
+            },
+        )
+        body = resp.json()
+        assert resp.status_code == 200
+        assert body["status"] == "queued" and body["id"] is None
+
+        write_behind.get_write_behind().flush()
+        rows = db.fetch_captions(user_id="testuser")
+        assert any(r["ClientId"] == body["client_id"] for r in rows)
+    finally:
+        write_behind.close_write_behind()